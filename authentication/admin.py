@@ -1,6 +1,7 @@
 from typing import List
 from django.contrib import admin
 from . import models
+from .claims import bump_claims_version
 
 # Constants for admin display fields
 USER_DISPLAY_FIELDS: List[str] = [
@@ -13,7 +14,7 @@ USER_DISPLAY_FIELDS: List[str] = [
 ]
 
 CODE_BASE_FIELDS: List[str] = ["user", "uid", "token"]
-CODE_WITH_TIMESTAMP: List[str] = CODE_BASE_FIELDS + ["created_at"]
+CODE_WITH_TIMESTAMP: List[str] = CODE_BASE_FIELDS + ["created_at", "expires_at"]
 
 
 @admin.register(models.User)
@@ -23,6 +24,13 @@ class UserAdmin(admin.ModelAdmin):
     list_display: List[str] = USER_DISPLAY_FIELDS
     search_fields: List[str] = ["email", "username"]
     list_filter: List[str] = ["is_active", "is_superuser"]
+    readonly_fields: List[str] = ["claims_version"]
+
+    def save_model(self, request, obj: models.User, form, change: bool) -> None:
+        """Save the user and invalidate the claims cached for token refresh."""
+        super().save_model(request, obj, form, change)
+        if change:
+            bump_claims_version(obj.username)
 
 
 @admin.register(models.ActivationCode)
@@ -39,7 +47,7 @@ class ActivationCodeAdmin(admin.ModelAdmin):
 class ResetPasswordCodeAdmin(admin.ModelAdmin):
     """Admin interface for ResetPasswordCode model."""
 
-    list_display: List[str] = CODE_BASE_FIELDS
+    list_display: List[str] = CODE_WITH_TIMESTAMP
     search_fields: List[str] = ["user__email", "uid"]
 
 
@@ -47,7 +55,7 @@ class ResetPasswordCodeAdmin(admin.ModelAdmin):
 class ResetEmailCodeAdmin(admin.ModelAdmin):
     """Admin interface for ResetEmailCode model."""
 
-    list_display: List[str] = CODE_BASE_FIELDS
+    list_display: List[str] = CODE_WITH_TIMESTAMP
     search_fields: List[str] = ["user__email", "uid"]
 
 
@@ -67,3 +75,74 @@ class ProfileAdmin(admin.ModelAdmin):
 
     list_display: List[str] = ["user"]
     search_fields: List[str] = ["user__email", "user__username"]
+
+
+@admin.register(models.OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Admin interface for the outbound email queue."""
+
+    list_display: List[str] = [
+        "to_email", "subject", "status", "attempts", "next_attempt_at", "sent_at"
+    ]
+    search_fields: List[str] = ["to_email", "subject"]
+    list_filter: List[str] = ["status"]
+    ordering: List[str] = ["-created_at"]
+
+
+@admin.register(models.RefreshSession)
+class RefreshSessionAdmin(admin.ModelAdmin):
+    """Admin interface for signed-in device sessions; deleting one logs the device out."""
+
+    list_display: List[str] = [
+        "user", "rotation", "created_at", "last_used_at", "expires_at"
+    ]
+    search_fields: List[str] = ["user__email", "user__username"]
+    readonly_fields: List[str] = ["current_jti", "legacy_jti", "rotation"]
+    ordering: List[str] = ["-last_used_at"]
+
+
+@admin.register(models.AccountDeletion)
+class AccountDeletionAdmin(admin.ModelAdmin):
+    """Admin interface for background account deletions and their progress."""
+
+    list_display: List[str] = [
+        "username", "status", "progress", "created_at", "updated_at", "finished_at"
+    ]
+    search_fields: List[str] = ["username"]
+    list_filter: List[str] = ["status"]
+    readonly_fields: List[str] = ["progress", "last_error", "finished_at"]
+    ordering: List[str] = ["-created_at"]
+
+
+@admin.register(models.DataExport)
+class DataExportAdmin(admin.ModelAdmin):
+    """Admin interface for personal data exports."""
+
+    list_display: List[str] = [
+        "user", "status", "rows", "size", "created_at", "finished_at", "expires_at"
+    ]
+    search_fields: List[str] = ["user__username", "user__email"]
+    list_filter: List[str] = ["status"]
+    readonly_fields: List[str] = [
+        "rows", "size", "attempts", "last_error", "started_at", "finished_at"
+    ]
+    raw_id_fields: List[str] = ["user"]
+    ordering: List[str] = ["-created_at"]
+
+
+@admin.register(models.AuditEvent)
+class AuditEventAdmin(admin.ModelAdmin):
+    """Read-only admin interface for the authentication audit log."""
+
+    list_display: List[str] = ["created_at", "event", "user", "ip", "user_agent"]
+    search_fields: List[str] = ["user__username"]
+    list_filter: List[str] = ["event"]
+    readonly_fields: List[str] = [
+        "event", "user", "ip", "user_agent", "data", "created_at"
+    ]
+    raw_id_fields: List[str] = ["user"]
+    ordering: List[str] = ["-id"]
+
+    def has_add_permission(self, request) -> bool:
+        """Events are only written by the application."""
+        return False
@@ -14,3 +14,9 @@ class AuthenticationConfig(AppConfig):
 
     # Application name identifier
     name: str = 'authentication'
+
+    def ready(self) -> None:
+        """Register signal handlers and compile the email templates."""
+        from . import signals  # noqa: F401
+        from .email import warm_email_templates
+        warm_email_templates()
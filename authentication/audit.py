@@ -0,0 +1,150 @@
+"""
+Buffered audit log of authentication events.
+
+Recording an event only appends an unsaved AuditEvent to an in-process
+buffer, so the login and sign-in views never wait on an INSERT. A daemon
+thread writes the buffer with one bulk_create whenever AUDIT_FLUSH_EVENTS
+events are waiting or AUDIT_FLUSH_INTERVAL_MS has passed, and once more when
+the process exits. The buffer is bounded by AUDIT_BUFFER_MAX: while the
+database is unreachable the oldest events are dropped rather than growing
+without limit. With AUDIT_BUFFERED off, events are written immediately.
+"""
+
+from collections import deque
+from logging import getLogger
+from typing import Any, Deque, List, Optional
+import atexit
+import os
+import threading
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_ipv46_address
+from django.db import DatabaseError, IntegrityError, close_old_connections
+from rest_framework.throttling import BaseThrottle
+from .models import AuditEvent
+
+logger = getLogger(__name__)
+
+
+class AuditBuffer:
+    """
+    Per-process event buffer with a background flusher.
+
+    The flusher thread is started on first use and again after a fork, as
+    threads do not survive into worker processes of a preloading server.
+    """
+
+    def __init__(self) -> None:
+        self._events: Deque[AuditEvent] = deque(maxlen=max(settings.AUDIT_BUFFER_MAX, 1))
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def append(self, event: AuditEvent) -> None:
+        """Queue an event, waking the flusher once a batch is full."""
+        self._ensure_thread()
+        with self._lock:
+            self._events.append(event)
+            full: bool = len(self._events) >= settings.AUDIT_FLUSH_EVENTS
+        if full:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write every queued event with one bulk_create; returns the count."""
+        with self._lock:
+            events: List[AuditEvent] = list(self._events)
+            self._events.clear()
+        if not events:
+            return 0
+
+        try:
+            AuditEvent.objects.bulk_create(events, batch_size=500)
+        except IntegrityError:
+            # A user was deleted since its event was recorded: keep the rest
+            return self._save_each(events)
+        except DatabaseError as e:
+            logger.error(f"Failed to write {len(events)} audit events: {str(e)}")
+            with self._lock:
+                # Put them back ahead of newer events; the bound drops the oldest
+                self._events.extendleft(reversed(events))
+            return 0
+        return len(events)
+
+    @staticmethod
+    def _save_each(events: List[AuditEvent]) -> int:
+        """Insert events one by one, skipping those that violate a constraint."""
+        saved: int = 0
+        for event in events:
+            try:
+                event.save()
+                saved += 1
+            except IntegrityError:
+                pass
+        return saved
+
+    def _ensure_thread(self) -> None:
+        """Start the flusher if this process does not have one yet."""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name="audit-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Flush every interval, or sooner when a batch fills up."""
+        interval: float = settings.AUDIT_FLUSH_INTERVAL_MS / 1000
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            self.flush()
+            close_old_connections()
+
+
+# Buffer of the current process
+buffer = AuditBuffer()
+atexit.register(buffer.flush)
+
+
+def client_ip(request: Any) -> Optional[str]:
+    """
+    Client address as the rate limits see it, or None if it is not a valid IP.
+
+    An invalid value would make the whole batch insert fail.
+    """
+    ident: str = (BaseThrottle().get_ident(request) or "").split(",")[0]
+    try:
+        validate_ipv46_address(ident)
+    except ValidationError:
+        return None
+    return ident
+
+
+def record(
+    event: str,
+    request: Any = None,
+    username: Optional[str] = None,
+    **data: Any,
+) -> None:
+    """
+    Record an authentication event without touching the database.
+
+    Args:
+        event: One of the AUDIT_EVENTS kinds
+        request: Request the client IP and user agent are taken from
+        username: Account the event belongs to, if any
+        **data: Extra JSON-serializable details, e.g. the attempted email
+    """
+    entry = AuditEvent(event=event, user_id=username, data=data)
+    if request is not None:
+        entry.ip = client_ip(request)
+        entry.user_agent = request.META.get("HTTP_USER_AGENT", "")[:255]
+
+    if settings.AUDIT_BUFFERED:
+        buffer.append(entry)
+    else:
+        entry.save()
@@ -0,0 +1,79 @@
+from typing import Any, Optional, Tuple
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+from . import revocation
+
+# Claims needed to build a user without reading the database
+USER_CLAIM_FIELDS: Tuple[str, ...] = (
+    "email",
+    "first_name",
+    "last_name",
+    "image",
+    "is_superuser",
+    "is_staff",
+)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the User lookup on read-only requests.
+
+    For safe methods the user is rebuilt from the token claims, so the request
+    costs no query. Unsafe methods still load the row, because views may save
+    the user and the claims do not carry every column. Tokens of users who
+    were deactivated, deleted, promoted or demoted after issue are rejected
+    through the revocation list in both cases, so the claims can be trusted.
+    """
+
+    def authenticate(self, request: Request) -> Optional[Tuple[Any, Token]]:
+        """Remember whether the request may be served from claims."""
+        self.use_claims: bool = request.method in SAFE_METHODS
+        return super().authenticate(request)
+
+    def get_user(self, validated_token: Token) -> Any:
+        """Return the user for a validated token, from claims when possible."""
+        username: Optional[str] = validated_token.get(api_settings.USER_ID_CLAIM)
+        if username is None:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        if revocation.is_revoked(username, validated_token.get("iat", 0)):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if not self.use_claims or any(
+            claim not in validated_token for claim in USER_CLAIM_FIELDS
+        ):
+            return super().get_user(validated_token)
+
+        return build_claims_user(validated_token)
+
+
+def build_claims_user(validated_token: Token) -> Any:
+    """
+    Build a persisted-looking User instance from token claims.
+
+    The instance can be compared, used in filters and assigned to foreign
+    keys, but must never be saved: columns missing from the claims (such as
+    the password) would be overwritten.
+    """
+    User = get_user_model()
+    user = User(
+        username=validated_token[api_settings.USER_ID_CLAIM],
+        email=validated_token["email"],
+        first_name=validated_token["first_name"],
+        last_name=validated_token["last_name"],
+        image=validated_token["image"],
+        is_superuser=validated_token["is_superuser"],
+        is_staff=validated_token["is_staff"],
+        # Deactivation revokes the token, so one that got this far is active
+        is_active=True,
+    )
+    # Mark the instance as loaded so relations treat it as an existing row
+    user._state.adding = False
+    user._state.db = "default"
+    return user
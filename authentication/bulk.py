@@ -0,0 +1,124 @@
+"""
+Bulk operations on users for the admin API.
+
+Targets are selected by an explicit username list or by the same filters
+as the admin user listing, then walked in username order with keyset
+pagination, BULK_USER_BATCH_SIZE users at a time. Each batch is a handful
+of set-based statements in one short transaction, so acting on a cohort of
+thousands of users takes a few dozen queries rather than one per user.
+Side effects that signals would normally trigger (token revocation, cached
+claims) are applied per batch, since QuerySet.update() sends no signals.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from course.models import Course
+from . import deletion, revocation
+from .claims import bump_claims_versions
+from .models import Profile, User
+
+
+@dataclass
+class BulkResult:
+    """Counters reported by a bulk operation."""
+    matched: int = 0
+    affected: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"matched": self.matched, "affected": self.affected}
+
+
+def batches(users: QuerySet, batch_size: int) -> Iterator[List[str]]:
+    """
+    Yield the usernames selected by `users` in keyset-paginated batches.
+    """
+    last_username: str = ""
+    while True:
+        usernames: List[str] = list(
+            users.filter(username__gt=last_username)
+            .order_by("username")
+            .values_list("username", flat=True)[:batch_size]
+        )
+        if not usernames:
+            return
+        yield usernames
+        last_username = usernames[-1]
+
+
+def _run(users: QuerySet, apply: Callable[[List[str]], int]) -> BulkResult:
+    """Apply an operation batch by batch and add up the counts."""
+    result = BulkResult()
+    for usernames in batches(users, settings.BULK_USER_BATCH_SIZE):
+        result.matched += len(usernames)
+        result.affected += apply(usernames)
+    return result
+
+
+def set_active(users: QuerySet, active: bool) -> BulkResult:
+    """
+    Activate or deactivate users; deactivated users lose their access tokens.
+
+    Accounts scheduled for deletion are never activated again.
+    """
+    def apply(usernames: List[str]) -> int:
+        with transaction.atomic():
+            targets: QuerySet = User.objects.filter(
+                username__in=usernames, is_active=not active)
+            if active:
+                targets = targets.filter(deleted_at__isnull=True)
+            changed: List[str] = list(targets.values_list("username", flat=True))
+            User.objects.filter(username__in=changed).update(is_active=active)
+        if changed:
+            if not active:
+                revocation.revoke_users(changed)
+            bump_claims_versions(changed)
+        return len(changed)
+
+    return _run(users, apply)
+
+
+def grant_courses(users: QuerySet, course_ids: List[str]) -> BulkResult:
+    """
+    Give users access to courses with one INSERT per batch.
+
+    Existing grants are left alone (ON CONFLICT DO NOTHING); `affected`
+    counts the grants actually added. Accounts scheduled for deletion are
+    skipped.
+    """
+    Grant = Profile.purchased_courses.through
+
+    def apply(usernames: List[str]) -> int:
+        with transaction.atomic():
+            profile_ids: List[int] = list(
+                Profile.objects.filter(
+                    user_id__in=usernames, user__deleted_at__isnull=True
+                ).values_list("id", flat=True))
+            grants = Grant.objects.filter(
+                profile_id__in=profile_ids, course_id__in=course_ids)
+            before: int = grants.count()
+            Grant.objects.bulk_create(
+                [
+                    Grant(profile_id=profile_id, course_id=course_id)
+                    for profile_id in profile_ids
+                    for course_id in course_ids
+                ],
+                ignore_conflicts=True,
+            )
+            return grants.count() - before
+
+    return _run(users, apply)
+
+
+def schedule_deletions(users: QuerySet) -> BulkResult:
+    """Soft-delete users and queue the removal of their data."""
+    return _run(
+        users, lambda usernames: len(deletion.schedule_account_deletions(usernames)))
+
+
+def unknown_courses(course_ids: List[str]) -> List[str]:
+    """Course ids from the list that do not exist."""
+    found = set(Course.objects.filter(id__in=course_ids).values_list("id", flat=True))
+    return [course_id for course_id in course_ids if course_id not in found]
@@ -0,0 +1,142 @@
+"""
+Cached user claims for token refresh.
+
+Each user row carries a `claims_version` counter. The CLAIMS_CACHE, shared
+by all workers, holds a pointer to the current version per user, plus the
+claims last loaded from the database tagged with the version they were
+read at. A cached entry is
+used only while its tag matches the pointer, so bumping the version (on
+profile, email or admin edits, deactivation) makes the next refresh reload
+the row, even if a concurrent refresh is still writing an older entry.
+"""
+
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+from django.core.cache import BaseCache, caches
+from django.db import transaction
+from django.db.models import F
+from .models import User
+
+# Columns read to build the claims
+CLAIM_SOURCE_FIELDS: tuple = (
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "image",
+    "is_superuser",
+    "is_staff",
+    "is_active",
+    "claims_version",
+)
+
+
+def get_user_claims(user: User) -> Dict[str, Any]:
+    """Build the user claims carried by every token"""
+    return {
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "image": user.image,
+        "is_superuser": user.is_superuser,
+        "is_staff": user.is_staff,
+    }
+
+
+def claims_cache() -> BaseCache:
+    """Cache holding the version pointers and cached claims."""
+    return caches[settings.CLAIMS_CACHE]
+
+
+def version_key(username: str) -> str:
+    """Cache key of the user's current claims version."""
+    return f"auth:claims-version:{username}"
+
+
+def claims_key(username: str) -> str:
+    """Cache key of the user's cached claims."""
+    return f"auth:claims:{username}"
+
+
+def get_cached_claims(username: str) -> Optional[Dict[str, Any]]:
+    """
+    Return {"is_active": bool, "claims": dict} for a user, from cache when current.
+
+    Costs one cache round trip on a hit; on a miss the row is read once and
+    cached for CLAIMS_CACHE_TIMEOUT seconds.
+
+    Returns:
+        Optional[Dict[str, Any]]: None if the user does not exist.
+    """
+    found: Dict[str, Any] = claims_cache().get_many(
+        [version_key(username), claims_key(username)])
+    version: Optional[int] = found.get(version_key(username))
+    entry: Optional[Dict[str, Any]] = found.get(claims_key(username))
+    if entry is not None and version is not None and entry["version"] == version:
+        return entry
+
+    user: Optional[User] = (
+        User.objects.filter(username=username).only(*CLAIM_SOURCE_FIELDS).first())
+    if user is None:
+        return None
+
+    entry = {
+        "version": user.claims_version,
+        "is_active": user.is_active,
+        "claims": get_user_claims(user),
+    }
+    # Never overwrite a pointer set by a concurrent bump
+    claims_cache().add(version_key(username), user.claims_version, timeout=None)
+    claims_cache().set(claims_key(username), entry, timeout=settings.CLAIMS_CACHE_TIMEOUT)
+    return entry
+
+
+def bump_claims_version(username: str) -> None:
+    """
+    Invalidate the user's cached claims by moving to a new version.
+
+    The row is locked while the pointer moves, so concurrent bumps leave the
+    pointer at the highest version.
+    """
+    with transaction.atomic():
+        version: Optional[int] = (
+            User.objects.select_for_update()
+            .filter(username=username)
+            .values_list("claims_version", flat=True)
+            .first()
+        )
+        if version is None:
+            return
+        User.objects.filter(username=username).update(claims_version=version + 1)
+        claims_cache().set(version_key(username), version + 1, timeout=None)
+
+
+def bump_claims_versions(usernames: List[str]) -> None:
+    """
+    Bump the claims version of many users with one UPDATE.
+
+    Rows are locked in username order, so concurrent bulk and single bumps
+    cannot deadlock and every pointer ends at its row's highest version.
+    """
+    with transaction.atomic():
+        list(
+            User.objects.select_for_update()
+            .filter(username__in=usernames)
+            .order_by("username")
+            .values_list("username", flat=True)
+        )
+        User.objects.filter(username__in=usernames).update(
+            claims_version=F("claims_version") + 1)
+        claims_cache().set_many(
+            {
+                version_key(username): version
+                for username, version in User.objects.filter(
+                    username__in=usernames).values_list("username", "claims_version")
+            },
+            timeout=None,
+        )
+
+
+def forget_claims(username: str) -> None:
+    """Drop everything cached for a deleted user."""
+    claims_cache().delete_many([version_key(username), claims_key(username)])
@@ -0,0 +1,206 @@
+"""
+Account deletion in two phases.
+
+Deleting an account in the request would make Django's collector cascade
+into every comment, like, purchase, feedback and created course inside one
+long transaction. Instead the request only soft-deletes the user (inactive,
+tokens revoked, sessions ended) and queues an AccountDeletion job. The
+process_account_deletions worker then removes the dependents table by table
+in bounded chunks, one short transaction each, keeps Blog.likes and
+Blog.comments in step, and records its progress on the job row. The steps
+are idempotent, so a failed job can be set back to pending and resumed.
+"""
+
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from django.db import transaction
+from django.db.models import Count, F, QuerySet, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from blogs.models import Blog, Comment
+from course.models import Course, Review
+from course.reviews import adjust_rating
+from feedback import rollups as feedback_rollups
+from feedback.models import Feedback
+from transactions.models import Purchase
+from . import export, revocation, sessions
+from .claims import bump_claims_versions
+from .models import AccountDeletion, ActivationCode, AuditEvent, Profile, User
+
+
+def schedule_account_deletion(user: User) -> Optional[AccountDeletion]:
+    """
+    Soft-delete the user and queue the removal of their data.
+
+    The account stops working immediately: it is deactivated, its access
+    tokens are revoked and every device session is ended.
+    """
+    jobs: List[AccountDeletion] = schedule_account_deletions([user.pk])
+    if jobs:
+        return jobs[0]
+    # Already scheduled: hand back the existing job
+    return AccountDeletion.objects.filter(username=user.pk).order_by("-created_at").first()
+
+
+def schedule_account_deletions(usernames: List[str]) -> List[AccountDeletion]:
+    """
+    Soft-delete many users with set-based statements and queue their removal.
+
+    Users already scheduled for deletion are skipped.
+
+    Returns:
+        List[AccountDeletion]: The jobs created, one per newly scheduled user
+    """
+    with transaction.atomic():
+        scheduled: List[str] = list(
+            User.objects.select_for_update()
+            .filter(username__in=usernames, deleted_at__isnull=True)
+            .order_by("username")
+            .values_list("username", flat=True)
+        )
+        if not scheduled:
+            return []
+        User.objects.filter(username__in=scheduled).update(
+            is_active=False, deleted_at=timezone.now())
+        # A pending activation code must not bring the account back
+        ActivationCode.objects.filter(user_id__in=scheduled).delete()
+        jobs: List[AccountDeletion] = AccountDeletion.objects.bulk_create(
+            [AccountDeletion(username=username) for username in scheduled])
+
+    revocation.revoke_users(scheduled)
+    sessions.end_sessions_for_users(scheduled)
+    bump_claims_versions(scheduled)
+    return jobs
+
+
+def _record(job: AccountDeletion, step: str, removed: int) -> None:
+    """Add removed rows to the job's progress and persist it."""
+    job.progress[step] = job.progress.get(step, 0) + removed
+    AccountDeletion.objects.filter(pk=job.pk).update(
+        progress=job.progress, updated_at=timezone.now())
+
+
+def _subtract_counts(field: str, counts: Counter) -> None:
+    """
+    Decrease a Blog counter by a per-blog amount, one UPDATE per distinct amount.
+    """
+    by_amount: Dict[int, List[str]] = defaultdict(list)
+    for blog_id, amount in counts.items():
+        by_amount[amount].append(blog_id)
+    for amount, blog_ids in by_amount.items():
+        Blog.objects.filter(id__in=blog_ids).update(
+            **{field: Greatest(F(field) - amount, Value(0))})
+
+
+def _delete_chunks(
+    job: AccountDeletion,
+    step: str,
+    queryset: QuerySet,
+    chunk_size: int,
+    before_delete: Optional[Callable[[List], None]] = None,
+) -> None:
+    """
+    Delete the rows of `queryset` `chunk_size` primary keys at a time.
+
+    Each chunk runs in its own transaction together with `before_delete`,
+    which receives the chunk's primary keys (used to adjust counters).
+    """
+    model = queryset.model
+    while True:
+        ids: List = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            if before_delete:
+                before_delete(ids)
+            removed, _ = model.objects.filter(pk__in=ids).delete()
+        _record(job, step, removed)
+
+
+def _unlike(like_ids: List[int]) -> None:
+    """Take the user's likes off the liked blogs' counters."""
+    Like = Blog.like.through
+    blog_ids: List[str] = list(
+        Like.objects.filter(id__in=like_ids).values_list("blog_id", flat=True))
+    _subtract_counts("likes", Counter(blog_ids))
+
+
+def _uncount_comments(comment_ids: List[str]) -> None:
+    """
+    Take the comments, and the replies their deletion cascades to, off the
+    blogs' comment counters.
+    """
+    counts: Counter = Counter()
+    seen: Set[str] = set()
+    frontier: Iterable[Tuple[str, str]] = Comment.objects.filter(
+        id__in=comment_ids).values_list("id", "blog_id")
+    while True:
+        level: List[Tuple[str, str]] = [
+            (comment_id, blog_id) for comment_id, blog_id in frontier
+            if comment_id not in seen
+        ]
+        if not level:
+            break
+        for comment_id, blog_id in level:
+            seen.add(comment_id)
+            counts[blog_id] += 1
+        frontier = Comment.objects.filter(
+            parent_id__in=[comment_id for comment_id, _ in level]
+        ).values_list("id", "blog_id")
+    _subtract_counts("comments", counts)
+
+
+def _uncount_feedback(feedback_ids: List[str]) -> None:
+    """Take the feedback off the weekly rating rollups."""
+    feedback_rollups.record_deleted(
+        Feedback.objects.filter(id__in=feedback_ids).only("created_at", "rating"))
+
+
+def _uncount_reviews(review_ids: List[str]) -> None:
+    """Take the reviews off the reviewed courses' rating counters."""
+    for course_id, rating_sum, count in (
+        Review.objects.filter(id__in=review_ids)
+        .values("course_id")
+        .annotate(rating_sum=Sum("rating"), count=Count("id"))
+        .values_list("course_id", "rating_sum", "count")
+        .order_by()
+    ):
+        adjust_rating(course_id, -rating_sum, -count)
+
+
+def run_account_deletion(job: AccountDeletion, chunk_size: int = 500) -> None:
+    """
+    Remove everything the job's user owns, then the user row itself.
+    """
+    username: str = job.username
+    Like = Blog.like.through
+    Grant = Profile.purchased_courses.through
+
+    _delete_chunks(job, "blog_likes", Like.objects.filter(user_id=username),
+                   chunk_size, _unlike)
+    _delete_chunks(job, "comments", Comment.objects.filter(user_id=username),
+                   chunk_size, _uncount_comments)
+    _delete_chunks(job, "feedback", Feedback.objects.filter(user_id=username),
+                   chunk_size, _uncount_feedback)
+    _delete_chunks(job, "purchases", Purchase.objects.filter(user_id=username), chunk_size)
+    _delete_chunks(job, "reviews", Review.objects.filter(user_id=username),
+                   chunk_size, _uncount_reviews)
+
+    # Courses the user created, emptied of their purchases and grants first
+    _delete_chunks(job, "course_purchases",
+                   Purchase.objects.filter(course__created_by_id=username), chunk_size)
+    _delete_chunks(job, "course_grants",
+                   Grant.objects.filter(course__created_by_id=username), chunk_size)
+    _delete_chunks(job, "courses", Course.objects.filter(created_by_id=username),
+                   max(chunk_size // 50, 1))
+
+    _delete_chunks(job, "purchased_courses",
+                   Grant.objects.filter(profile__user_id=username), chunk_size)
+
+    _record(job, "data_exports", export.delete_user_exports(username))
+    _delete_chunks(job, "audit_events", AuditEvent.objects.filter(user_id=username),
+                   chunk_size)
+
+    # What is left (profile, codes, sessions) is a handful of rows
+    removed, _ = User.objects.filter(pk=username).delete()
+    _record(job, "user", removed)
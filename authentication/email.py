@@ -1,9 +1,13 @@
-from typing import Dict, Optional
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.template import Context, Template, engines
+from django.utils import timezone
 from smtplib import SMTPException
 from logging import getLogger
+from .models import OutboundEmail
 
 # Initialize logger for email operations
 logger = getLogger(__name__)
@@ -14,6 +18,84 @@ TEMPLATE_CONTEXT = {
     "host_email": settings.EMAIL_HOST_USER,
 }
 
+# Templates used for transactional emails
+EMAIL_TEMPLATES: Tuple[str, ...] = (
+    "activation.html",
+    "login_confirmation.html",
+    "reset_password_confirmation.html",
+    "reset_email_confirmation.html",
+)
+
+# Compiled email templates, keyed by template name
+_compiled_templates: Dict[str, Template] = {}
+
+
+def get_email_template(template_name: str) -> Template:
+    """
+    Return the compiled template, parsing it only on first use.
+
+    The static text of the template is parsed into nodes once; rendering
+    then only resolves the per-recipient variables. In DEBUG the template is
+    reloaded on every call so edits show up without a restart.
+    """
+    template: Optional[Template] = _compiled_templates.get(template_name)
+    if template is None or settings.DEBUG:
+        template = engines["django"].engine.get_template(template_name)
+        _compiled_templates[template_name] = template
+    return template
+
+
+def warm_email_templates() -> None:
+    """Compile every email template ahead of the first send."""
+    for template_name in EMAIL_TEMPLATES:
+        get_email_template(template_name)
+
+
+def render_email(template_name: str, context: Dict[str, str]) -> str:
+    """Render one email body on top of the shared template context."""
+    return render_many(template_name, [context])[0]
+
+
+def render_many(template_name: str, contexts: Iterable[Dict[str, str]]) -> List[str]:
+    """
+    Render one email body per recipient context in a single pass.
+
+    The template is looked up once and the shared context layer is built
+    once; each recipient's values are pushed on top of it and popped again.
+
+    Args:
+        template_name: HTML template file name
+        contexts: Per-recipient template contexts
+
+    Returns:
+        List[str]: Rendered bodies, in the order of `contexts`
+    """
+    template: Template = get_email_template(template_name)
+    shared = Context(TEMPLATE_CONTEXT)
+
+    bodies: List[str] = []
+    for context in contexts:
+        with shared.push(context):
+            bodies.append(template.render(shared))
+    return bodies
+
+
+def build_message(
+    subject: str,
+    html_body: str,
+    to_email: str,
+    connection=None,
+) -> EmailMultiAlternatives:
+    """Build an HTML email message."""
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        from_email=settings.EMAIL_HOST_USER,
+        to=[to_email],
+        connection=connection,
+    )
+    msg.attach_alternative(html_body, "text/html")
+    return msg
+
 
 def send_email(
     subject: str,
@@ -24,6 +106,10 @@ def send_email(
     """
     Generic email sending function with error handling.
 
+    The body is rendered immediately. With EMAIL_USE_QUEUE it is then stored
+    in the outbox for the send_queued_emails worker, so the request never
+    waits on SMTP; otherwise it is sent right away.
+
     Args:
         subject: Email subject line
         template_name: HTML template file name
@@ -31,24 +117,145 @@ def send_email(
         to_email: Recipient email address
 
     Returns:
-        bool: True if email sent successfully, False otherwise
+        bool: True if email was queued or sent successfully, False otherwise
     """
-    try:
-        html_body = render_to_string(
-            template_name, {**TEMPLATE_CONTEXT, **context})
-        msg = EmailMultiAlternatives(
+    html_body = render_email(template_name, context)
+
+    if settings.EMAIL_USE_QUEUE:
+        OutboundEmail.objects.create(
+            to_email=to_email,
             subject=subject,
-            from_email=settings.EMAIL_HOST_USER,
-            to=[to_email]
+            html_body=html_body,
         )
-        msg.attach_alternative(html_body, "text/html")
-        msg.send()
+        return True
+
+    try:
+        build_message(subject, html_body, to_email).send()
         return True
     except SMTPException as e:
         logger.error(f"Failed to send email to {to_email}: {str(e)}")
         return False
 
 
+def queue_bulk_email(
+    subject: str,
+    template_name: str,
+    recipients: Sequence[Tuple[str, Dict[str, str]]],
+) -> int:
+    """
+    Render and queue the same email for many recipients, e.g. a re-activation campaign.
+
+    Args:
+        subject: Email subject line
+        template_name: HTML template file name
+        recipients: Pairs of recipient address and template context
+
+    Returns:
+        int: Number of emails queued
+    """
+    bodies: List[str] = render_many(
+        template_name, [context for _, context in recipients])
+    OutboundEmail.objects.bulk_create([
+        OutboundEmail(to_email=to_email, subject=subject, html_body=html_body)
+        for (to_email, _), html_body in zip(recipients, bodies)
+    ])
+    return len(bodies)
+
+
+def record_failure(outbound: OutboundEmail, error: Exception) -> None:
+    """Schedule a retry with exponential backoff, or give up after the last attempt."""
+    outbound.attempts += 1
+    outbound.last_error = str(error)
+    if outbound.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        outbound.status = "failed"
+        # The body holds verification codes; keep nothing that will not be sent
+        outbound.html_body = ""
+    else:
+        delay: int = settings.EMAIL_QUEUE_RETRY_SECONDS * 2 ** (outbound.attempts - 1)
+        outbound.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+    logger.error(f"Failed to send email to {outbound.to_email}: {str(error)}")
+
+
+def claim_queued_emails(batch_size: int) -> List[OutboundEmail]:
+    """
+    Claim a batch of due emails for this worker.
+
+    Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED only long enough
+    to push their next attempt EMAIL_QUEUE_LEASE_SECONDS into the future, so
+    other workers skip them while they are sent outside any transaction. If
+    the worker dies mid-batch, the lease runs out and they are sent again.
+    """
+    with transaction.atomic():
+        batch: List[OutboundEmail] = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(status="pending", next_attempt_at__lte=timezone.now())
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if batch:
+            OutboundEmail.objects.filter(pk__in=[outbound.pk for outbound in batch]).update(
+                next_attempt_at=timezone.now()
+                + timedelta(seconds=settings.EMAIL_QUEUE_LEASE_SECONDS))
+    return batch
+
+
+def deliver_queued_emails(batch_size: int = 50) -> Tuple[int, int]:
+    """
+    Deliver one batch of due emails over a single backend connection.
+
+    Several workers can drain the outbox in parallel (see
+    claim_queued_emails); no transaction or row lock is held while SMTP
+    runs. Sent emails keep their metadata but lose their body, which holds
+    verification codes. Failed emails are retried with exponential backoff
+    until EMAIL_QUEUE_MAX_ATTEMPTS is reached.
+
+    Args:
+        batch_size: Maximum number of emails delivered in this batch
+
+    Returns:
+        Tuple[int, int]: Number of emails sent and number of failed attempts
+    """
+    sent: int = 0
+    failed: int = 0
+
+    batch: List[OutboundEmail] = claim_queued_emails(batch_size)
+    if not batch:
+        return sent, failed
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # Nothing can be delivered without a connection
+        for outbound in batch:
+            record_failure(outbound, e)
+        failed = len(batch)
+    else:
+        try:
+            for outbound in batch:
+                message = build_message(
+                    outbound.subject, outbound.html_body, outbound.to_email, connection)
+                try:
+                    if not connection.send_messages([message]):
+                        raise SMTPException("Message was not accepted")
+                except Exception as e:
+                    record_failure(outbound, e)
+                    failed += 1
+                    continue
+                outbound.status = "sent"
+                outbound.sent_at = timezone.now()
+                outbound.html_body = ""
+                sent += 1
+        finally:
+            connection.close()
+
+    OutboundEmail.objects.bulk_update(
+        batch,
+        ["status", "attempts", "next_attempt_at", "last_error", "sent_at", "html_body"],
+    )
+
+    return sent, failed
+
+
 def ActivationEmail(uid: str, token: str, email: str, username: str) -> Optional[bool]:
     """Send email verification link to user."""
     if not settings.SEND_ACTIVATION_EMAIL:
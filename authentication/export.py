@@ -0,0 +1,290 @@
+"""
+Personal data exports.
+
+An export is a ZIP archive with one JSON Lines file per kind of data the
+user owns. Rows are read through server-side cursors (QuerySet.iterator)
+and compressed into a zipfile writing to a non-seekable pipe, which is
+drained between rows, so memory use does not depend on how much the user
+has written. Exports up to DATA_EXPORT_INLINE_MAX_ROWS rows are streamed in
+the response; larger ones are written to DATA_EXPORT_ROOT by the
+process_data_exports worker and downloaded once ready.
+
+A background archive is written under a per-attempt part name and renamed
+once complete. Jobs still running after DATA_EXPORT_TIMEOUT_MINUTES are
+assumed to belong to a dead worker and are claimed again, up to
+DATA_EXPORT_MAX_ATTEMPTS times. Failed jobs leave no file behind and expire
+like finished ones.
+"""
+
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import json
+import os
+import zipfile
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from blogs.models import Blog, Comment
+from course.models import Review
+from feedback.models import Feedback
+from transactions.models import Purchase
+from .models import DataExport, User
+
+# Pending bytes after which the archive is handed to the consumer
+FLUSH_BYTES: int = 64 * 1024
+
+# Storage holding archives built in the background
+storage = FileSystemStorage(location=settings.DATA_EXPORT_ROOT)
+
+
+def _profile(username: str) -> QuerySet:
+    """Account and profile fields, one row."""
+    return User.objects.filter(username=username).values(
+        "username", "email", "first_name", "last_name", "image", "method",
+        "is_active", "profile__country", "profile__city",
+        "profile__address", "profile__phone",
+    )
+
+
+def _purchases(username: str) -> QuerySet:
+    """Purchases with the course name and applied coupon."""
+    return Purchase.objects.filter(user_id=username).order_by("id").values(
+        "id", "course_id", "course__name", "amount", "is_paid",
+        "coupon__code", "created_at",
+    )
+
+
+def _feedback(username: str) -> QuerySet:
+    """Feedback the user left."""
+    return Feedback.objects.filter(user_id=username).order_by("id").values(
+        "id", "feedback", "rating", "created_at",
+    )
+
+
+def _comments(username: str) -> QuerySet:
+    """Comments with the blog they were left on."""
+    return Comment.objects.filter(user_id=username).order_by("id").values(
+        "id", "blog_id", "blog__title", "parent_id", "content", "created_at",
+    )
+
+
+def _reviews(username: str) -> QuerySet:
+    """Course reviews with the course they rate."""
+    return Review.objects.filter(user_id=username).order_by("id").values(
+        "course_id", "course__name", "rating", "comment", "created_at",
+    )
+
+
+def _liked_blogs(username: str) -> QuerySet:
+    """Blogs the user liked."""
+    return Blog.like.through.objects.filter(user_id=username).order_by("id").values(
+        "blog_id", "blog__title",
+    )
+
+
+# Archive members and the queries producing their rows
+EXPORT_SECTIONS: List[Tuple[str, Callable[[str], QuerySet]]] = [
+    ("profile.jsonl", _profile),
+    ("purchases.jsonl", _purchases),
+    ("feedback.jsonl", _feedback),
+    ("comments.jsonl", _comments),
+    ("reviews.jsonl", _reviews),
+    ("liked_blogs.jsonl", _liked_blogs),
+]
+
+
+def count_rows(username: str, limit: int) -> int:
+    """
+    Count the rows of an export, stopping at `limit` per section.
+
+    The sliced counts keep the size check cheap for prolific users, who are
+    exported in the background anyway.
+    """
+    return sum(query(username)[:limit].count() for _, query in EXPORT_SECTIONS)
+
+
+def is_inline(username: str) -> bool:
+    """Whether the export is small enough to stream in the response."""
+    limit: int = settings.DATA_EXPORT_INLINE_MAX_ROWS
+    return count_rows(username, limit + 1) <= limit
+
+
+class _Pipe:
+    """
+    Write-only sink for zipfile.
+
+    Without seek/tell zipfile writes each member's sizes in a trailing data
+    descriptor, so the archive can be produced front to back.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: List[bytes] = []
+        self.pending: int = 0
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        self.pending += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data: bytes = b"".join(self.chunks)
+        self.chunks.clear()
+        self.pending = 0
+        return data
+
+
+def stream_export(
+    username: str,
+    stats: Optional[Dict[str, int]] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the user's export archive in chunks of roughly FLUSH_BYTES.
+
+    Args:
+        username: Owner of the exported data
+        stats: Optional dict receiving the number of exported "rows"
+    """
+    stats = stats if stats is not None else {}
+    stats["rows"] = 0
+    pipe = _Pipe()
+    with zipfile.ZipFile(pipe, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, query in EXPORT_SECTIONS:
+            with archive.open(name, "w", force_zip64=True) as member:
+                rows = query(username).iterator(
+                    chunk_size=settings.DATA_EXPORT_CHUNK_SIZE)
+                for row in rows:
+                    member.write(json.dumps(
+                        row, cls=DjangoJSONEncoder, ensure_ascii=False
+                    ).encode() + b"\n")
+                    stats["rows"] += 1
+                    if pipe.pending >= FLUSH_BYTES:
+                        yield pipe.drain()
+            yield pipe.drain()
+    yield pipe.drain()
+
+
+def _expiry() -> datetime:
+    """Expiry of an export finishing now."""
+    return timezone.now() + timedelta(hours=settings.DATA_EXPORT_TTL_HOURS)
+
+
+def delete_files(job: DataExport) -> None:
+    """Remove the archive of a job and whatever its attempts left behind."""
+    storage.delete(job.file_name)
+    for attempt in range(1, job.attempts + 1):
+        storage.delete(job.part_name(attempt))
+
+
+def claim_export() -> Optional[DataExport]:
+    """
+    Mark the oldest due job as running for this worker, or return None.
+
+    Due jobs are pending ones and running ones whose worker has not finished
+    within DATA_EXPORT_TIMEOUT_MINUTES. Jobs other workers hold a lock on are
+    skipped; a stale job out of attempts is failed instead of claimed.
+    """
+    stale = timezone.now() - timedelta(minutes=settings.DATA_EXPORT_TIMEOUT_MINUTES)
+    while True:
+        with transaction.atomic():
+            job: Optional[DataExport] = (
+                DataExport.objects.select_for_update(skip_locked=True)
+                .filter(Q(status="pending") | Q(status="running", started_at__lte=stale))
+                .order_by("created_at")
+                .first()
+            )
+            if job is None:
+                return None
+            if job.attempts >= settings.DATA_EXPORT_MAX_ATTEMPTS:
+                fail_export(job, "Export did not finish in time.")
+                continue
+            job.status = "running"
+            job.attempts += 1
+            job.started_at = timezone.now()
+            job.save(update_fields=["status", "attempts", "started_at"])
+        return job
+
+
+def build_export(job: DataExport) -> bool:
+    """
+    Write the archive of a claimed export to storage and mark it done.
+
+    Returns:
+        bool: False if the job was taken over by another worker meanwhile, in
+        which case the archive written here is discarded.
+    """
+    os.makedirs(storage.location, exist_ok=True)
+    part: str = job.part_name(job.attempts)
+    size: int = 0
+    stats: Dict[str, int] = {}
+    try:
+        with storage.open(part, "wb") as fh:
+            for chunk in stream_export(job.user_id, stats):
+                fh.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        storage.delete(part)
+        raise
+
+    with transaction.atomic():
+        # Only the attempt that holds the job may complete it
+        owned: int = DataExport.objects.filter(
+            pk=job.pk, status="running", attempts=job.attempts
+        ).update(
+            status="done",
+            rows=stats["rows"],
+            size=size,
+            finished_at=timezone.now(),
+            expires_at=_expiry(),
+        )
+        if owned:
+            os.replace(storage.path(part), storage.path(job.file_name))
+    if not owned:
+        storage.delete(part)
+        return False
+
+    # Leftovers of attempts whose worker died
+    for attempt in range(1, job.attempts):
+        storage.delete(job.part_name(attempt))
+    return True
+
+
+def fail_export(job: DataExport, error: str) -> None:
+    """
+    Mark an export failed, remove its files and let it expire like a finished one.
+
+    Does nothing if another worker has claimed the job since `job` was read.
+    """
+    failed: int = DataExport.objects.filter(pk=job.pk, attempts=job.attempts).update(
+        status="failed",
+        last_error=error,
+        finished_at=timezone.now(),
+        expires_at=_expiry(),
+    )
+    if failed:
+        delete_files(job)
+
+
+def purge_expired_exports() -> int:
+    """Remove archives past their expiry, with their rows; returns the count."""
+    expired: QuerySet = DataExport.objects.filter(expires_at__lte=timezone.now())
+    removed: int = 0
+    for job in expired.only("id", "attempts"):
+        delete_files(job)
+        removed += 1
+    expired.delete()
+    return removed
+
+
+def delete_user_exports(username: str) -> int:
+    """Remove every archive of a user, e.g. before the account is deleted."""
+    jobs: QuerySet = DataExport.objects.filter(user_id=username)
+    for job in jobs.only("id", "attempts"):
+        delete_files(job)
+    removed, _ = jobs.delete()
+    return removed
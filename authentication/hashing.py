@@ -0,0 +1,94 @@
+"""
+Password verification on a bounded executor.
+
+Hash checks run on a small per-process thread pool (the hashers release the
+GIL while hashing), so at most PASSWORD_HASH_WORKERS hashes compete for the
+cores per process. The request thread still waits for its result; what keeps
+other endpoints responsive is that at most PASSWORD_HASH_MAX_PENDING checks
+may be queued or running at once. Further logins are turned away immediately
+with HashingBusy, so a login storm ties up at most that many request threads.
+
+This only helps with several request threads per process: the production
+entrypoint runs gunicorn's gthread workers, and PASSWORD_HASH_MAX_PENDING
+defaults to half of GUNICORN_THREADS. Under a single-threaded sync worker the
+limit could never be reached.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import List, Optional, Tuple
+import threading
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from .models import User
+
+# Pool running the hash computations
+_executor = ThreadPoolExecutor(
+    max_workers=max(settings.PASSWORD_HASH_WORKERS, 1),
+    thread_name_prefix="password-hash",
+)
+
+# Slots for checks that are queued or running
+_slots = threading.BoundedSemaphore(max(settings.PASSWORD_HASH_MAX_PENDING, 1))
+
+
+class HashingBusy(Exception):
+    """Raised when too many password checks are already in flight."""
+
+
+def _verify(raw_password: str, encoded: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password and, if its hash is outdated, compute the upgraded one.
+
+    Returns:
+        Tuple[bool, Optional[str]]: Whether the password matched, and the new
+        hash when the stored one uses a non-preferred hasher or parameters.
+    """
+    outdated: List[bool] = []
+    matched: bool = check_password(
+        raw_password, encoded, setter=lambda _: outdated.append(True))
+    if matched and outdated:
+        return True, make_password(raw_password)
+    return matched, None
+
+
+def submit(raw_password: str, encoded: str) -> Future:
+    """
+    Queue a password check, or raise HashingBusy if no slot is free.
+    """
+    if not _slots.acquire(blocking=False):
+        raise HashingBusy("Too many logins in progress. Please try again shortly.")
+
+    try:
+        future: Future = _executor.submit(_verify, raw_password, encoded)
+    except BaseException:
+        _slots.release()
+        raise
+    # Free the slot when the hash finishes, even if the caller gave up waiting
+    future.add_done_callback(lambda _: _slots.release())
+    return future
+
+
+def check_user_password(user: User, raw_password: str) -> bool:
+    """
+    Verify a user's password on the hashing pool, rehashing it transparently.
+
+    When the stored hash was made with another hasher or weaker parameters
+    than PASSWORD_HASHERS now prefers, the new hash is saved on success.
+
+    Raises:
+        HashingBusy: If the pool is saturated, or the check did not finish
+            within PASSWORD_HASH_TIMEOUT_SECONDS.
+    """
+    if not user.has_usable_password():
+        return False
+
+    try:
+        matched, new_hash = submit(raw_password, user.password).result(
+            timeout=settings.PASSWORD_HASH_TIMEOUT_SECONDS)
+    except FuturesTimeout:
+        raise HashingBusy("Login is taking too long. Please try again shortly.")
+
+    if new_hash:
+        user.password = new_hash
+        User.objects.filter(pk=user.pk).update(password=new_hash)
+    return matched
@@ -0,0 +1,47 @@
+import time
+from typing import Callable, Dict, List
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from authentication.email import EMAIL_TEMPLATES, TEMPLATE_CONTEXT, render_email, render_many
+
+
+class Command(BaseCommand):
+    """Compare email rendering throughput with and without the compiled templates."""
+
+    help = "Render an email template for N recipients and print emails per second."
+
+    def add_arguments(self, parser) -> None:
+        """Register command line options."""
+        parser.add_argument(
+            "--count", type=int, default=1000,
+            help="Number of recipients to render.")
+        parser.add_argument(
+            "--template", default=EMAIL_TEMPLATES[0], choices=EMAIL_TEMPLATES,
+            help="Email template to render.")
+
+    def handle(self, *args, **options) -> None:
+        """Time each rendering strategy over the same recipient contexts."""
+        count: int = max(options["count"], 1)
+        template_name: str = options["template"]
+        contexts: List[Dict[str, str]] = [
+            {"username": f"user{i}", "uid": str(i), "token": f"{i:06d}"}
+            for i in range(count)
+        ]
+
+        strategies: Dict[str, Callable[[], object]] = {
+            "render_to_string": lambda: [
+                render_to_string(template_name, {**TEMPLATE_CONTEXT, **context})
+                for context in contexts
+            ],
+            "render_email": lambda: [
+                render_email(template_name, context) for context in contexts
+            ],
+            "render_many": lambda: render_many(template_name, contexts),
+        }
+
+        for name, render in strategies.items():
+            started: float = time.perf_counter()
+            render()
+            elapsed: float = time.perf_counter() - started
+            self.stdout.write(
+                f"{name:<18} {count / elapsed:>10.0f} emails/sec ({elapsed:.3f}s)")
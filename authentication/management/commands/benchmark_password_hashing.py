@@ -0,0 +1,61 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+# Password hashed and verified by the benchmark
+SAMPLE_PASSWORD: str = "correct horse battery staple"
+
+
+class Command(BaseCommand):
+    """Measure password-login throughput for each configured hasher."""
+
+    help = "Report password verifications (logins) per second, per core, for each hasher."
+
+    def add_arguments(self, parser) -> None:
+        """Register command line options."""
+        parser.add_argument(
+            "--seconds", type=float, default=2.0,
+            help="How long to run each measurement.")
+        parser.add_argument(
+            "--workers", type=int, default=settings.PASSWORD_HASH_WORKERS,
+            help="Threads used for the parallel measurement.")
+
+    @staticmethod
+    def measure(encoded: str, seconds: float, workers: int) -> int:
+        """Count successful verifications completed by `workers` threads in `seconds`."""
+        deadline: float = time.perf_counter() + seconds
+
+        def run() -> int:
+            done: int = 0
+            while time.perf_counter() < deadline:
+                check_password(SAMPLE_PASSWORD, encoded)
+                done += 1
+            return done
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return sum(pool.map(lambda _: run(), range(workers)))
+
+    def handle(self, *args, **options) -> None:
+        """Hash a sample password with each hasher and time its verification."""
+        seconds: float = options["seconds"]
+        workers: int = max(options["workers"], 1)
+        cores: int = min(workers, os.cpu_count() or 1)
+
+        self.stdout.write(f"{'hasher':<12} {'1 thread/s':>12} {f'{workers} threads/s':>14} {'per core/s':>12}")
+        for path in settings.PASSWORD_HASHERS:
+            algorithm: str = import_string(path).algorithm
+            try:
+                # Fails when Python's hashlib was built without scrypt
+                encoded: str = make_password(SAMPLE_PASSWORD, hasher=algorithm)
+            except (ValueError, ImportError) as e:
+                self.stdout.write(f"{algorithm:<12} skipped: {e}")
+                continue
+
+            single: float = self.measure(encoded, seconds, 1) / seconds
+            parallel: float = self.measure(encoded, seconds, workers) / seconds
+            self.stdout.write(
+                f"{algorithm:<12} {single:>12.1f} {parallel:>14.1f} {parallel / cores:>12.1f}")
@@ -0,0 +1,92 @@
+"""
+Management command to store every user email in its normalized form.
+
+The authentication app ships without migrations (they are generated at
+deploy time), so this one-off data fix is a command. Run it, and resolve the
+conflicts it reports, before migrating to the case-insensitive unique
+constraint on email, which cannot be created while such duplicates exist.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower, Trim
+from authentication.manager import normalize_email_address
+from authentication.models import User
+
+
+class Command(BaseCommand):
+    """
+    Lowercase and trim stored emails in keyset-paginated batches, skipping
+    and reporting addresses that would collide with another account.
+    """
+    help = "Normalize stored user emails in batches and report conflicts."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of users read and updated per batch.")
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="Report what would change without writing.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Normalize until every stored email is checked.
+        """
+        batch_size: int = max(options["batch_size"], 1)
+        unnormalized = User.objects.filter(email__isnull=False).filter(
+            ~Q(email=Lower(Trim("email"))))
+
+        # Normalized addresses claimed by rows fixed earlier in this run
+        claimed: Set[str] = set()
+        conflicts: Dict[str, List[str]] = defaultdict(list)
+        updated: int = 0
+        last_username: str = ""
+
+        while True:
+            rows: List[Tuple[str, str]] = list(
+                unnormalized.filter(username__gt=last_username)
+                .order_by("username")
+                .values_list("username", "email")[:batch_size]
+            )
+            if not rows:
+                break
+            last_username = rows[-1][0]
+
+            wanted: Dict[str, List[str]] = defaultdict(list)
+            for username, email in rows:
+                wanted[normalize_email_address(email)].append(username)
+            owners: Dict[str, str] = dict(
+                User.objects.filter(email__in=list(wanted))
+                .values_list("email", "username")
+            )
+
+            changes: List[User] = []
+            for email, usernames in wanted.items():
+                if len(usernames) > 1 or email in owners or email in claimed:
+                    existing: List[str] = [owners[email]] if email in owners else []
+                    conflicts[email].extend(existing + usernames)
+                    continue
+                claimed.add(email)
+                changes.append(User(username=usernames[0], email=email))
+
+            if changes and not options["dry_run"]:
+                with transaction.atomic():
+                    User.objects.bulk_update(changes, ["email"])
+            updated += len(changes)
+
+        verb: str = "Would normalize" if options["dry_run"] else "Normalized"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {updated} emails."))
+        for email, usernames in sorted(conflicts.items()):
+            self.stderr.write(
+                f"Conflict on {email}: {', '.join(sorted(set(usernames)))}")
+        if conflicts:
+            self.stderr.write(
+                f"{len(conflicts)} addresses are shared by several accounts "
+                "and were left unchanged.")
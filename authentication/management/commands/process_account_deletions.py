@@ -0,0 +1,67 @@
+import time
+from typing import Optional
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from authentication.deletion import run_account_deletion
+from authentication.models import AccountDeletion
+
+
+class Command(BaseCommand):
+    """Run queued account deletions, removing each user's data in bounded chunks."""
+
+    help = "Process pending account deletions and report their progress."
+
+    def add_arguments(self, parser) -> None:
+        """Register command line options."""
+        parser.add_argument(
+            "--chunk-size", type=int, default=500,
+            help="Maximum number of rows removed per transaction.")
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for new jobs instead of exiting once none are left.")
+        parser.add_argument(
+            "--interval", type=float, default=10.0,
+            help="Seconds to wait between polls when no job is pending.")
+
+    @staticmethod
+    def claim_job() -> Optional[AccountDeletion]:
+        """Mark the oldest pending job as running, skipping jobs other workers hold."""
+        with transaction.atomic():
+            job: Optional[AccountDeletion] = (
+                AccountDeletion.objects.select_for_update(skip_locked=True)
+                .filter(status="pending")
+                .order_by("created_at")
+                .first()
+            )
+            if job is not None:
+                job.status = "running"
+                job.save(update_fields=["status", "updated_at"])
+        return job
+
+    def handle(self, *args, **options) -> None:
+        """Run jobs until none are pending (or forever with --loop)."""
+        chunk_size: int = max(options["chunk_size"], 1)
+
+        while True:
+            job: Optional[AccountDeletion] = self.claim_job()
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+                continue
+
+            try:
+                run_account_deletion(job, chunk_size)
+            except Exception as e:
+                AccountDeletion.objects.filter(pk=job.pk).update(
+                    status="failed", last_error=str(e), updated_at=timezone.now())
+                self.stderr.write(f"Deletion of {job.username} failed: {e}")
+                continue
+
+            AccountDeletion.objects.filter(pk=job.pk).update(
+                status="done", finished_at=timezone.now(), updated_at=timezone.now())
+            removed: str = ", ".join(
+                f"{step}={count}" for step, count in job.progress.items())
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {job.username}: {removed or 'nothing else to remove'}."))
@@ -0,0 +1,54 @@
+"""
+Management command to build personal data exports queued by the export endpoint.
+"""
+
+import time
+from typing import Optional
+from django.core.management.base import BaseCommand
+from authentication.export import (
+    build_export, claim_export, fail_export, purge_expired_exports)
+from authentication.models import DataExport
+
+
+class Command(BaseCommand):
+    """Write queued export archives to DATA_EXPORT_ROOT and remove expired ones."""
+
+    help = "Build pending personal data exports and purge expired archives."
+
+    def add_arguments(self, parser) -> None:
+        """Register command line options."""
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for new jobs instead of exiting once none are left.")
+        parser.add_argument(
+            "--interval", type=float, default=10.0,
+            help="Seconds to wait between polls when no job is pending.")
+
+    def handle(self, *args, **options) -> None:
+        """Run jobs until none are pending (or forever with --loop)."""
+        purged: int = purge_expired_exports()
+        if purged:
+            self.stdout.write(f"Removed {purged} expired exports.")
+
+        while True:
+            job: Optional[DataExport] = claim_export()
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["interval"])
+                purge_expired_exports()
+                continue
+
+            try:
+                finished: bool = build_export(job)
+            except Exception as e:
+                fail_export(job, str(e))
+                self.stderr.write(f"Export of {job.user_id} failed: {e}")
+                continue
+            if not finished:
+                self.stderr.write(f"Export of {job.user_id} was taken over by another worker.")
+                continue
+
+            job.refresh_from_db(fields=["rows", "size"])
+            self.stdout.write(self.style.SUCCESS(
+                f"Exported {job.user_id}: {job.rows} rows, {job.size} bytes."))
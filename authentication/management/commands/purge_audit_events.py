@@ -0,0 +1,58 @@
+"""
+Management command to remove audit events older than the retention period.
+"""
+
+import time
+from datetime import datetime, timedelta
+from typing import List
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from authentication.models import AuditEvent
+
+
+class Command(BaseCommand):
+    """
+    Delete audit events past AUDIT_RETENTION_DAYS in bounded batches,
+    selected through the BRIN index on created_at.
+    """
+    help = "Remove audit events older than the retention period in bounded batches."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--days", type=int, default=settings.AUDIT_RETENTION_DAYS,
+            help="Keep events from this many recent days.")
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Number of rows removed per statement.")
+        parser.add_argument(
+            "--sleep", type=float, default=0.0,
+            help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Purge until no expired events are left.
+        """
+        cutoff: datetime = timezone.now() - timedelta(days=options["days"])
+        batch_size: int = max(options["batch_size"], 1)
+        removed: int = 0
+
+        while True:
+            ids: List[int] = list(
+                AuditEvent.objects.filter(created_at__lt=cutoff)
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted, _ = AuditEvent.objects.filter(id__in=ids).delete()
+            removed += deleted
+            if len(ids) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} audit events older than {options['days']} days."))
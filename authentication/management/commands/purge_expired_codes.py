@@ -0,0 +1,70 @@
+"""
+Management command to remove expired verification codes.
+"""
+
+import time
+from datetime import datetime
+from typing import List, Type
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from authentication.models import (
+    ActivationCode,
+    BaseCode,
+    LoginCode,
+    ResetEmailCode,
+    ResetPasswordCode,
+)
+
+# Code tables swept by the purge
+CODE_MODELS: List[Type[BaseCode]] = [
+    ActivationCode,
+    LoginCode,
+    ResetEmailCode,
+    ResetPasswordCode,
+]
+
+
+class Command(BaseCommand):
+    """
+    Delete expired activation, login and reset codes in bounded batches.
+    Each batch is selected through the expires_at index and deleted by
+    primary key, so no statement touches more than --batch-size rows.
+    """
+    help = "Remove expired verification codes in bounded batches."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of rows removed per statement.")
+        parser.add_argument(
+            "--sleep", type=float, default=0.0,
+            help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Purge every code table until no expired rows are left.
+        """
+        cutoff: datetime = timezone.now()
+        batch_size: int = max(options["batch_size"], 1)
+
+        for model in CODE_MODELS:
+            removed: int = 0
+            while True:
+                ids: List[int] = list(
+                    model.objects.filter(expires_at__lte=cutoff)
+                    .values_list("id", flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                deleted, _ = model.objects.filter(id__in=ids).delete()
+                removed += deleted
+                if len(ids) < batch_size:
+                    break
+                if options["sleep"]:
+                    time.sleep(options["sleep"])
+
+            self.stdout.write(self.style.SUCCESS(
+                f"Removed {removed} expired {model._meta.verbose_name_plural.lower()}."))
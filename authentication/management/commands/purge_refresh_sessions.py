@@ -0,0 +1,54 @@
+"""
+Management command to remove expired refresh sessions.
+"""
+
+import time
+from datetime import datetime
+from typing import List
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from authentication.models import RefreshSession
+
+
+class Command(BaseCommand):
+    """
+    Delete sessions whose refresh token has expired, in bounded batches
+    selected through the expires_at index.
+    """
+    help = "Remove expired refresh sessions in bounded batches."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Number of rows removed per statement.")
+        parser.add_argument(
+            "--sleep", type=float, default=0.0,
+            help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Purge until no expired sessions are left.
+        """
+        cutoff: datetime = timezone.now()
+        batch_size: int = max(options["batch_size"], 1)
+        removed: int = 0
+
+        while True:
+            ids: List[str] = list(
+                RefreshSession.objects.filter(expires_at__lte=cutoff)
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted, _ = RefreshSession.objects.filter(id__in=ids).delete()
+            removed += deleted
+            if len(ids) < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {removed} expired refresh sessions."))
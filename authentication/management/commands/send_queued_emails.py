@@ -0,0 +1,40 @@
+import time
+from django.core.management.base import BaseCommand
+from authentication.email import deliver_queued_emails
+
+
+class Command(BaseCommand):
+    """Drain the outbound email queue, one backend connection per batch."""
+
+    help = "Deliver queued emails, retrying failures with exponential backoff."
+
+    def add_arguments(self, parser) -> None:
+        """Register command line options."""
+        parser.add_argument(
+            "--batch-size", type=int, default=50,
+            help="Maximum number of emails sent over one connection.")
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling the queue instead of exiting once it is empty.")
+        parser.add_argument(
+            "--interval", type=float, default=5.0,
+            help="Seconds to wait between polls when the queue is empty.")
+
+    def handle(self, *args, **options) -> None:
+        """Deliver batches until the queue is drained (or forever with --loop)."""
+        total_sent: int = 0
+        total_failed: int = 0
+
+        while True:
+            sent, failed = deliver_queued_emails(max(options["batch_size"], 1))
+            total_sent += sent
+            total_failed += failed
+
+            if sent or failed:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sent {total_sent} emails, {total_failed} attempts failed."))
@@ -1,7 +1,25 @@
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, Sequence
+import re
 from django.contrib.auth.models import BaseUserManager
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, IntegerField, Max, Q, QuerySet, Value
+from django.db.models.functions import Cast, NullIf, Substr
+
+# Attempts made when concurrent signups race for the same username
+USERNAME_ALLOCATION_ATTEMPTS: int = 5
+
+
+def normalize_email_address(email: Optional[str]) -> Optional[str]:
+    """
+    Return the stored form of an email address: trimmed and lowercased.
+
+    Every write stores this form, so lookups compare it with a plain equality
+    that the unique index on email serves.
+    """
+    if not email or not email.strip():
+        return None
+    return email.strip().lower()
 
 
 class UserManager(BaseUserManager):
@@ -35,28 +53,146 @@ class UserManager(BaseUserManager):
         if not username:
             raise ValueError("Username must be provided")
 
-        # Normalize email if provided
-        normalized_email = (
-            None if not email
-            else self.normalize_email(email).lower()
-        )
-
-        # Create user instance
+        # Create user instance; User.save() normalizes the email
         user = self.model(
             username=username,
-            email=normalized_email,
+            email=email,
             **extra_fields
         )
 
         user.set_password(password)
 
         try:
-            user.save(using=self._db)
+            # Insert only: an existing username must fail, not be overwritten
+            user.save(using=self._db, force_insert=True)
+        except IntegrityError:
+            # Let callers tell unique-constraint races apart
+            raise
         except Exception as e:
             raise ValueError(f"Failed to create user: {str(e)}")
 
         return user
 
+    def by_email(self, email: Optional[str]) -> QuerySet:
+        """
+        Users with this email address, matched case-insensitively.
+
+        The single entry point for email lookups: the address is normalized
+        the way it was stored, so the query is an index lookup rather than
+        a scan over UPPER(email).
+        """
+        normalized: Optional[str] = normalize_email_address(email)
+        if normalized is None:
+            return self.none()
+        return self.filter(email=normalized)
+
+    def allocate_username(self, base: str) -> str:
+        """
+        Return `base`, or `base_N` with the next free suffix, in a single query.
+
+        Only `base` and names matching `base_<digits>` are read; the prefix
+        match is served by the username pattern index, so the cost does not
+        grow with the number of namesakes.
+
+        Args:
+            base: Preferred username, e.g. the local part of an email
+
+        Returns:
+            str: A username that was free when the query ran
+        """
+        suffix_start: int = len(base) + 2
+        taken = self.filter(
+            Q(username=base)
+            | Q(username__startswith=f"{base}_",
+                username__regex=rf"^{re.escape(base)}_[0-9]{{1,9}}$")
+        ).aggregate(
+            base_taken=Count("pk", filter=Q(username=base)),
+            # The bare base yields an empty suffix, which becomes NULL
+            last_suffix=Max(Cast(
+                NullIf(Substr("username", suffix_start), Value("")),
+                IntegerField(),
+            )),
+        )
+
+        if not taken["base_taken"]:
+            return base
+        return f"{base}_{(taken['last_suffix'] or 0) + 1}"
+
+    def create_user_from_email(
+        self,
+        email: str,
+        password: Optional[str] = None,
+        **extra_fields: Dict[str, Any]
+    ) -> models.Model:
+        """
+        Create a user whose username is derived from the email's local part.
+
+        If a concurrent signup claims the same username first, the insert
+        fails on the primary key and a fresh name is allocated.
+
+        Args:
+            email: Email address of the user
+            password: Optional password for the user
+            **extra_fields: Additional fields for the user model
+
+        Returns:
+            User: Created user instance
+
+        Raises:
+            IntegrityError: If the email is already taken
+            ValueError: If no free username was found after several attempts
+        """
+        base: str = email.split("@")[0]
+        for _ in range(USERNAME_ALLOCATION_ATTEMPTS):
+            try:
+                with transaction.atomic(using=self._db):
+                    return self.create_user(
+                        username=self.allocate_username(base),
+                        email=email,
+                        password=password,
+                        **extra_fields
+                    )
+            except IntegrityError:
+                # Another unique field (such as email) is taken: retrying won't help
+                if self.by_email(email).exists():
+                    raise
+
+        raise ValueError("Failed to allocate a unique username")
+
+    def bulk_create_users(
+        self,
+        users: Sequence[models.Model],
+        batch_size: Optional[int] = None,
+    ) -> List[models.Model]:
+        """
+        Insert many users and their profiles with two bulk_create calls.
+
+        Meant for admin imports and test-data seeding. Passwords are stored
+        as given, so hash them beforehand (set_password) or leave them
+        unusable; save() and post_save are not run.
+
+        Args:
+            users: Unsaved user instances
+            batch_size: Maximum rows per INSERT statement
+
+        Returns:
+            List[User]: The created users
+        """
+        # Imported here to avoid a circular import with models
+        from .models import Profile
+
+        for user in users:
+            user.email = normalize_email_address(user.email)
+            if not user.password:
+                user.set_unusable_password()
+
+        with transaction.atomic(using=self._db):
+            created: List[models.Model] = self.bulk_create(users, batch_size=batch_size)
+            Profile.objects.using(self._db).bulk_create(
+                [Profile(user=user) for user in created], batch_size=batch_size)
+
+        return created
+
     def create_superuser(
         self,
         username: str,
@@ -96,7 +232,7 @@ class UserManager(BaseUserManager):
         # Create superuser instance
         user = self.model(
             username=username,
-            email=self.normalize_email(email).lower(),
+            email=email,
             **extra_fields
         )
 
@@ -1,5 +1,11 @@
+from datetime import timedelta
 from typing import Any, List, Optional, Tuple
-from django.db import models
+import secrets
+import uuid
+from django.contrib.postgres.indexes import BrinIndex, OpClass
+from django.db import IntegrityError, models
+from django.db.models.functions import Lower, Upper
+from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from . import manager as self_manager
 
@@ -10,10 +16,53 @@ AUTH_METHOD: Tuple[Tuple[str, str], ...] = (
     ("Github", "Github"),
 )
 
+# Delivery states of queued emails
+EMAIL_STATUS: Tuple[Tuple[str, str], ...] = (
+    ("pending", "Pending"),
+    ("sent", "Sent"),
+    ("failed", "Failed"),
+)
+
+# States of background account deletions
+DELETION_STATUS: Tuple[Tuple[str, str], ...] = (
+    ("pending", "Pending"),
+    ("running", "Running"),
+    ("done", "Done"),
+    ("failed", "Failed"),
+)
+
+# States of personal data exports
+EXPORT_STATUS: Tuple[Tuple[str, str], ...] = (
+    ("pending", "Pending"),
+    ("running", "Running"),
+    ("done", "Done"),
+    ("failed", "Failed"),
+)
+
+# Kinds of recorded audit events
+AUDIT_EVENTS: Tuple[Tuple[str, str], ...] = (
+    ("login", "Login"),
+    ("login_failed", "Failed login"),
+    ("otp_sent", "Login code sent"),
+    ("activation", "Account activated"),
+    ("oauth_github", "GitHub sign-in"),
+    ("oauth_google", "Google sign-in"),
+    ("logout", "Logout"),
+)
+
 # Maximum field lengths
 MAX_NAME_LENGTH: int = 1000
 MAX_EMAIL_LENGTH: int = 254
-TOKEN_LENGTH: int = 4
+
+# Verification codes: uppercase letters and digits without look-alikes
+# (0/O, 1/I), 5 bits per character, so uid + token carry 80 random bits
+CODE_ALPHABET: str = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+CODE_LENGTH: int = 8
+
+
+def generate_code(length: int = CODE_LENGTH) -> str:
+    """Generate a random verification code from a cryptographic source."""
+    return "".join(secrets.choice(CODE_ALPHABET) for _ in range(length))
 
 
 class User(AbstractBaseUser, PermissionsMixin):
@@ -48,6 +97,15 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_staff = models.BooleanField(default=True)
     is_active = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
+    claims_version = models.PositiveIntegerField(
+        default=0,
+        help_text="Bumped whenever token claims change, invalidating cached claims"
+    )
+    deleted_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="Set when the account is scheduled for deletion"
+    )
 
     # Explicitly disable unused fields
     groups = None
@@ -63,17 +121,76 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = "User"
         verbose_name_plural = "Users"
         ordering = ["first_name"]
+        constraints = [
+            # Emails are stored lowercased; this also rejects rows that bypass save()
+            models.UniqueConstraint(
+                Lower("email"),
+                name="user_email_lower_uniq"
+            ),
+        ]
+        indexes = [
+            # Serves prefix matches (LIKE 'john_%') on usernames
+            models.Index(
+                fields=["username"],
+                name="user_username_pattern_idx",
+                opclasses=["varchar_pattern_ops"]
+            ),
+            # Serve case-insensitive prefix search (istartswith) in the admin listing
+            models.Index(
+                OpClass(Upper("email"), name="text_pattern_ops"),
+                name="user_email_prefix_idx"
+            ),
+            models.Index(
+                OpClass(Upper("first_name"), name="text_pattern_ops"),
+                name="user_first_name_prefix_idx"
+            ),
+            models.Index(
+                OpClass(Upper("last_name"), name="text_pattern_ops"),
+                name="user_last_name_prefix_idx"
+            ),
+        ]
+
+    # Columns carried in access tokens that grant privileges
+    PRIVILEGE_FIELDS: Tuple[str, ...] = ("is_staff", "is_superuser")
 
     def __str__(self) -> str:
         return self.username
 
+    @classmethod
+    def from_db(cls, db: str, field_names: List[str], values: List[Any]) -> 'User':
+        """Remember the loaded access columns so a save can tell they changed."""
+        instance = super().from_db(db, field_names, values)
+        instance.remember_saved_state()
+        return instance
+
+    def remember_saved_state(self) -> None:
+        """Record is_active and the privileges as they are in the row now."""
+        deferred: set = self.get_deferred_fields()
+        self._loaded_is_active = None if "is_active" in deferred else self.is_active
+        self._loaded_privileges = {
+            name: getattr(self, name)
+            for name in self.PRIVILEGE_FIELDS if name not in deferred
+        }
+
+    def deactivated(self) -> bool:
+        """Whether the user was active in the stored row and no longer is."""
+        # An instance with no recorded state may have been active
+        return not self.is_active and getattr(self, "_loaded_is_active", None) is not False
+
+    def privileges_changed(self) -> bool:
+        """Whether is_staff or is_superuser differ from the stored row."""
+        loaded: dict = getattr(self, "_loaded_privileges", {})
+        return any(getattr(self, name) != value for name, value in loaded.items())
+
     def save(self, *args: Any, **kwargs: Any) -> 'User':
-        """Save user and create associated profile if it doesn't exist."""
+        """Save user; the profile is created by the post_save signal on insert."""
+        self.email = self_manager.normalize_email_address(self.email)
         try:
             super().save(*args, **kwargs)
-            if not Profile.objects.filter(user=self).exists():
-                Profile.objects.create(user=self)
             return self
+        except IntegrityError:
+            # Let callers tell unique-constraint races apart
+            raise
         except Exception as e:
             raise ValueError(f"Failed to save user: {str(e)}")
 
@@ -87,39 +204,72 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 
 class BaseCode(models.Model):
-    """Base abstract model for all code-based models."""
+    """
+    Base abstract model for all code-based models.
+
+    The uid and token are drawn at random when the instance is built, so
+    issuing a code needs no uniqueness query; the unique (uid, token)
+    constraint guards against the negligible chance of a repeat and makes
+    lookups an index hit.
+    """
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    uid = models.CharField(default="", max_length=TOKEN_LENGTH)
-    token = models.CharField(default="", max_length=TOKEN_LENGTH)
+    uid = models.CharField(default=generate_code, max_length=CODE_LENGTH)
+    token = models.CharField(default=generate_code, max_length=CODE_LENGTH)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(
+        blank=True,
+        db_index=True,
+        help_text="Time after which the code is rejected and purged"
+    )
+
+    # How long a freshly issued code stays valid
+    lifetime: timedelta = timedelta(hours=1)
 
     class Meta:
         abstract = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["uid", "token"],
+                name="%(app_label)s_%(class)s_uid_token_uniq"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.user.username
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Set the expiry of new codes from the model's lifetime."""
+        if self.expires_at is None:
+            self.expires_at = timezone.now() + self.lifetime
+        super().save(*args, **kwargs)
+
+    @property
+    def is_expired(self) -> bool:
+        """Whether the code can no longer be used."""
+        return self.expires_at <= timezone.now()
+
 
 class LoginCode(BaseCode):
     """Model for storing login verification codes."""
-    created_at = models.DateTimeField(auto_now_add=True)
+    lifetime: timedelta = timedelta(minutes=10)
 
-    class Meta:
+    class Meta(BaseCode.Meta):
         verbose_name = "Login Code"
         verbose_name_plural = "Login Codes"
 
 
 class ActivationCode(BaseCode):
     """Model for storing account activation codes."""
-    created_at = models.DateTimeField(auto_now_add=True)
+    lifetime: timedelta = timedelta(days=7)
 
-    class Meta:
+    class Meta(BaseCode.Meta):
         verbose_name = "Activation Code"
         verbose_name_plural = "Activation Codes"
 
 
 class ResetPasswordCode(BaseCode):
     """Model for storing password reset codes."""
-    class Meta:
+    class Meta(BaseCode.Meta):
         verbose_name = "Reset Password Code"
         verbose_name_plural = "Reset Password Codes"
 
@@ -132,7 +282,7 @@ class ResetEmailCode(BaseCode):
         help_text="New email address to be verified"
     )
 
-    class Meta:
+    class Meta(BaseCode.Meta):
         verbose_name = "Reset Email Code"
         verbose_name_plural = "Reset Email Codes"
 
@@ -162,3 +312,208 @@ class Profile(models.Model):
 
     def __str__(self) -> str:
         return self.user.username
+
+
+class RefreshSession(models.Model):
+    """
+    One signed-in device: the refresh token family it holds.
+
+    Only the JTI of the latest refresh token is stored, so the table grows
+    with active devices rather than with issued tokens.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="refresh_sessions"
+    )
+    current_jti = models.CharField(
+        max_length=64,
+        help_text="JTI of the only refresh token of this session that is still accepted"
+    )
+    rotation = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of times the refresh token was rotated"
+    )
+    legacy_jti = models.CharField(
+        max_length=64,
+        unique=True,
+        blank=True,
+        null=True,
+        help_text="JTI of the pre-session refresh token this session was adopted from"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = "Refresh Session"
+        verbose_name_plural = "Refresh Sessions"
+
+    def __str__(self) -> str:
+        return f"{self.user_id} ({self.id})"
+
+
+class OutboundEmail(models.Model):
+    """Email waiting to be delivered by the send_queued_emails worker."""
+    to_email = models.EmailField(max_length=MAX_EMAIL_LENGTH)
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    status = models.CharField(
+        max_length=10,
+        default="pending",
+        choices=EMAIL_STATUS,
+        help_text="Delivery state"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Earliest time the next delivery attempt may run"
+    )
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="outbound_email_due_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} -> {self.to_email}"
+
+
+class AccountDeletion(models.Model):
+    """Background removal of a soft-deleted user and everything they own."""
+    username = models.CharField(
+        max_length=MAX_NAME_LENGTH,
+        help_text="Plain copy of the username, the user row is removed last"
+    )
+    status = models.CharField(
+        max_length=10,
+        default="pending",
+        choices=DELETION_STATUS,
+        help_text="Progress of the deletion job"
+    )
+    progress = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Rows removed so far, per table"
+    )
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        verbose_name = "Account Deletion"
+        verbose_name_plural = "Account Deletions"
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                name="account_deletion_due_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.username} ({self.status})"
+
+
+class DataExport(models.Model):
+    """Personal data export too large to stream, built by process_data_exports."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="data_exports"
+    )
+    status = models.CharField(
+        max_length=10,
+        default="pending",
+        choices=EXPORT_STATUS,
+        help_text="Progress of the export job"
+    )
+    rows = models.PositiveIntegerField(default=0)
+    size = models.PositiveBigIntegerField(default=0, help_text="Archive size in bytes")
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="When a worker last claimed the job"
+    )
+    finished_at = models.DateTimeField(blank=True, null=True)
+    expires_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        db_index=True,
+        help_text="When the archive or failed job is removed; set once it finishes"
+    )
+
+    class Meta:
+        verbose_name = "Data Export"
+        verbose_name_plural = "Data Exports"
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                name="data_export_due_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} ({self.status})"
+
+    @property
+    def file_name(self) -> str:
+        """Name of the archive in the export storage."""
+        return f"{self.id}.zip"
+
+    def part_name(self, attempt: int) -> str:
+        """Name of the archive while the given attempt is writing it."""
+        return f"{self.id}.{attempt}.part"
+
+
+class AuditEvent(models.Model):
+    """
+    Authentication event, written in batches by the audit buffer.
+
+    Rows are only ever appended, in created_at order, so a BRIN index keeps
+    retention range scans cheap at a fraction of a B-tree's size.
+    """
+    event = models.CharField(max_length=20, choices=AUDIT_EVENTS)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="audit_events",
+        blank=True,
+        null=True,
+        db_index=False,
+        help_text="Empty when the attempt did not match an account"
+    )
+    ip = models.GenericIPAddressField(blank=True, null=True)
+    user_agent = models.CharField(max_length=255, blank=True, default="")
+    data = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="When the event happened, not when it was flushed"
+    )
+
+    class Meta:
+        verbose_name = "Audit Event"
+        verbose_name_plural = "Audit Events"
+        indexes = [
+            models.Index(
+                fields=["user", "created_at"],
+                name="audit_event_user_created_idx"
+            ),
+            BrinIndex(fields=["created_at"], name="audit_event_created_brin"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event} {self.user_id or '-'} {self.created_at:%Y-%m-%d %H:%M:%S}"
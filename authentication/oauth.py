@@ -0,0 +1,204 @@
+"""
+HTTP clients for the OAuth sign-in providers.
+
+Each provider keeps one pooled requests.Session per process, so repeated
+logins reuse warm TCP/TLS connections instead of handshaking for every call.
+Requests use bounded (connect, read) timeouts and retry connection failures;
+idempotent GETs are also retried on gateway errors. The views only talk to
+the small `exchange_code` / `fetch_user` interface, so OAUTH_CLIENTS can
+point at StubOAuthClient for offline tests and benchmarks.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import time
+from django.conf import settings
+from django.utils.module_loading import import_string
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Pool for provider calls that do not depend on each other
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="oauth")
+
+
+def build_session(pool_size: int, retries: int) -> requests.Session:
+    """
+    Create a session with a connection pool and retry policy.
+
+    POSTs (the code exchange) are only retried when the connection could not
+    be made, since an authorization code is single-use.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.headers["Accept"] = "application/json"
+    return session
+
+
+class OAuthClient:
+    """
+    Base client holding the provider's pooled session.
+    """
+
+    def __init__(self) -> None:
+        self.session: requests.Session = build_session(
+            settings.OAUTH_POOL_SIZE, settings.OAUTH_RETRIES)
+        self.timeout: tuple = (
+            settings.OAUTH_CONNECT_TIMEOUT, settings.OAUTH_READ_TIMEOUT)
+
+    def get_json(self, url: str, access_token: str) -> Any:
+        """
+        GET a provider API resource with the user's access token.
+        """
+        resp = self.session.get(
+            url,
+            headers={"Authorization": f"Bearer {access_token}"},
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    def post_token(self, url: str, data: Dict[str, str]) -> Optional[str]:
+        """
+        Exchange an authorization code at the provider's token endpoint.
+        """
+        resp = self.session.post(url, data=data, timeout=self.timeout)
+        resp.raise_for_status()
+        return resp.json().get("access_token")
+
+
+class GithubClient(OAuthClient):
+    """
+    GitHub sign-in: code exchange, profile and primary email.
+    """
+
+    def exchange_code(self, code: str, redirect_uri: str) -> Optional[str]:
+        """
+        Return the access token for an authorization code.
+        """
+        return self.post_token(
+            "https://github.com/login/oauth/access_token",
+            {
+                "client_id": settings.GITHUB_CLIENT_ID,
+                "client_secret": settings.GITHUB_CLIENT_SECRET,
+                "code": code,
+                "redirect_uri": redirect_uri,
+            },
+        )
+
+    def fetch_user(self, access_token: str) -> Dict[str, Any]:
+        """
+        Fetch the profile and the email list concurrently.
+
+        GitHub leaves `email` empty on the profile when the user keeps it
+        private, so it is filled from the primary verified address.
+        """
+        profile = _executor.submit(
+            self.get_json, "https://api.github.com/user", access_token)
+        emails = _executor.submit(
+            self.get_json, "https://api.github.com/user/emails", access_token)
+
+        user_data: Dict[str, Any] = profile.result()
+        try:
+            addresses: List[Dict[str, Any]] = emails.result()
+        except requests.RequestException:
+            # The profile alone is enough when the email list is unavailable
+            addresses = []
+
+        primary: Optional[str] = next(
+            (entry["email"] for entry in addresses
+             if entry.get("primary") and entry.get("verified")),
+            None,
+        )
+        if primary:
+            user_data["email"] = primary
+        return user_data
+
+
+class GoogleClient(OAuthClient):
+    """
+    Google sign-in: code exchange and userinfo.
+    """
+
+    def exchange_code(self, code: str, redirect_uri: str) -> Optional[str]:
+        """
+        Return the access token for an authorization code.
+        """
+        return self.post_token(
+            "https://oauth2.googleapis.com/token",
+            {
+                "code": code,
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "redirect_uri": redirect_uri,
+                "grant_type": "authorization_code",
+            },
+        )
+
+    def fetch_user(self, access_token: str) -> Dict[str, Any]:
+        """
+        Fetch the userinfo document.
+        """
+        return self.get_json(
+            "https://www.googleapis.com/oauth2/v2/userinfo", access_token)
+
+
+class StubOAuthClient:
+    """
+    Offline provider for local runs, tests and benchmarks.
+
+    The authorization code determines the returned identity, so a code of
+    "alice" always signs in the same stub user. The payload carries both
+    GitHub and Google field names.
+
+    Args:
+        latency: Seconds each call sleeps, to mimic network round trips.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency: float = latency
+
+    def exchange_code(self, code: str, redirect_uri: str) -> Optional[str]:
+        """
+        Return a fake access token derived from the code.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        return f"stub-{code}"
+
+    def fetch_user(self, access_token: str) -> Dict[str, Any]:
+        """
+        Return a deterministic profile for the fake access token.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        name: str = access_token.removeprefix("stub-")
+        return {
+            "id": name,
+            "node_id": name,
+            "login": f"stub_{name}",
+            "name": f"Stub {name.title()}",
+            "given_name": "Stub",
+            "family_name": name.title(),
+            "email": f"{name}@example.com",
+            "avatar_url": None,
+            "picture": None,
+        }
+
+
+@lru_cache(maxsize=None)
+def get_client(provider: str):
+    """
+    Return the process-wide client configured for a provider in OAUTH_CLIENTS.
+    """
+    return import_string(settings.OAUTH_CLIENTS[provider])()
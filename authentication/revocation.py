@@ -0,0 +1,96 @@
+"""
+Revocation list for access tokens of deactivated, deleted or demoted users.
+
+Each revoked user has their own key in the REVOCATION_CACHE, which every
+worker shares, holding the time of revocation, so concurrent revocations
+from different workers never overwrite each other. Keys expire once every
+access token issued before them has expired. Each worker memoizes lookups for JWT_REVOCATION_REFRESH_SECONDS, so
+checking a user costs no I/O on most requests.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+
+# Prefix of the per-user cache keys
+CACHE_KEY_PREFIX: str = "auth:revoked:"
+
+# Users memoized per worker before expired lookups are dropped
+MEMO_MAX_USERS: int = 10000
+
+# Worker-local memo of {username: (looked up at, revoked_at or None)}
+_memo: Dict[str, Tuple[float, Optional[float]]] = {}
+_lock = threading.Lock()
+
+
+def cache_key(username: str) -> str:
+    """Cache key holding the user's revocation time."""
+    return f"{CACHE_KEY_PREFIX}{username}"
+
+
+def _retention_seconds() -> int:
+    """
+    How long an entry matters: the lifetime of an access token.
+    """
+    return int(settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds()) + 1
+
+
+def _remember(entries: Dict[str, Optional[float]]) -> None:
+    """
+    Store lookups in the worker-local memo, keeping it bounded.
+    """
+    now: float = time.monotonic()
+    with _lock:
+        if len(_memo) + len(entries) > MEMO_MAX_USERS:
+            ttl: int = settings.JWT_REVOCATION_REFRESH_SECONDS
+            for username in [name for name, (at, _) in _memo.items() if now - at > ttl]:
+                del _memo[username]
+            if len(_memo) + len(entries) > MEMO_MAX_USERS:
+                _memo.clear()
+        for username, revoked_at in entries.items():
+            _memo[username] = (now, revoked_at)
+
+
+def revoke_user(username: str) -> None:
+    """
+    Reject every access token issued to the user up to now.
+    """
+    revoke_users([username])
+
+
+def revoke_users(usernames: Iterable[str]) -> None:
+    """
+    Reject every access token issued to these users, with one cache write.
+    """
+    names: List[str] = list(usernames)
+    if not names:
+        return
+    now: float = time.time()
+    caches[settings.REVOCATION_CACHE].set_many(
+        {cache_key(username): now for username in names},
+        timeout=_retention_seconds(),
+    )
+    _remember(dict.fromkeys(names, now))
+
+
+def revoked_at(username: str) -> Optional[float]:
+    """
+    Time (epoch seconds) the user's tokens were last revoked, if still relevant.
+    """
+    memo: Optional[Tuple[float, Optional[float]]] = _memo.get(username)
+    if memo is not None and time.monotonic() - memo[0] <= settings.JWT_REVOCATION_REFRESH_SECONDS:
+        return memo[1]
+
+    value: Optional[float] = caches[settings.REVOCATION_CACHE].get(cache_key(username))
+    _remember({username: value})
+    return value
+
+
+def is_revoked(username: str, issued_at: float) -> bool:
+    """
+    Check whether a token issued to the user at `issued_at` (epoch seconds) is revoked.
+    """
+    revoked: Optional[float] = revoked_at(username)
+    return revoked is not None and issued_at <= revoked
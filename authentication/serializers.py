@@ -1,7 +1,8 @@
 from typing import Dict, Any, List, Type
-from rest_framework.validators import UniqueValidator
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError
 from rest_framework import serializers
+from .manager import normalize_email_address
 from django.conf import settings
 
 # Get the user model at module level
@@ -16,6 +17,13 @@ USER_BASE_FIELDS: List[str] = [
 ]
 
 
+class NormalizedEmailField(serializers.EmailField):
+    """Email field yielding the stored (trimmed, lowercased) form of the address."""
+
+    def to_internal_value(self, data: Any) -> str:
+        return normalize_email_address(super().to_internal_value(data)) or ""
+
+
 class UserSerializer(serializers.ModelSerializer):
     """
     Serializer for general user data representation.
@@ -40,20 +48,11 @@ class UserCreateSerializer(serializers.ModelSerializer):
         style={'input_type': 'password'},
         min_length=8
     )
-    email = serializers.EmailField(
-        required=True,
-        validators=[UniqueValidator(
-            queryset=User.objects.all(),
-            message="This email is already registered."
-        )]
-    )
-    username = serializers.CharField(
-        required=True,
-        validators=[UniqueValidator(
-            queryset=User.objects.all(),
-            message="This username is already taken."
-        )]
-    )
+    # Uniqueness of email and username is left to the database constraints:
+    # create() raises IntegrityError instead of pre-checking with queries
+    email = NormalizedEmailField(required=True)
+    # Derived from the email when omitted
+    username = serializers.CharField(required=False)
 
     class Meta:
         model = User
@@ -74,11 +73,16 @@ class UserCreateSerializer(serializers.ModelSerializer):
             User: Created user instance
 
         Raises:
+            IntegrityError: If the email or username is already taken
             serializers.ValidationError: If user creation fails
         """
         try:
+            if "username" not in validated_data:
+                return User.objects.create_user_from_email(**validated_data)
             user = User.objects.create_user(**validated_data)
             return user
+        except IntegrityError:
+            raise
         except Exception as e:
             raise serializers.ValidationError(
                 f"Failed to create user: {str(e)}")
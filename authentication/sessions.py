@@ -0,0 +1,127 @@
+"""
+Server-side refresh token sessions.
+
+Every login starts a RefreshSession whose id travels in the refresh token as
+the `sid` claim. Refreshing rotates the token with one conditional UPDATE
+that only matches while the presented JTI is the session's current one. A
+refresh token that no longer matches was either already rotated (reuse of a
+stolen or replayed token) or belongs to a logged-out session, so the whole
+session is revoked and the device has to sign in again.
+
+Refresh tokens issued before sessions existed carry no `sid`. Each is
+adopted into a session once, recorded by its JTI; presenting it again is
+treated as reuse like any other rotated token.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import RefreshSession, User
+
+# Claim carrying the session id
+SESSION_CLAIM: str = "sid"
+
+
+def _expiry() -> datetime:
+    """Expiry of a session whose refresh token was issued now."""
+    return timezone.now() + api_settings.REFRESH_TOKEN_LIFETIME
+
+
+def start_session(
+    user: User,
+    refresh: RefreshToken,
+    legacy_jti: Optional[str] = None,
+) -> RefreshSession:
+    """
+    Record a new device session and tag the refresh token with its id.
+
+    Args:
+        user: Owner of the session
+        refresh: Freshly issued refresh token
+        legacy_jti: JTI of the pre-session token being adopted, if any
+
+    Raises:
+        IntegrityError: If a session was already adopted from `legacy_jti`
+    """
+    session: RefreshSession = RefreshSession.objects.create(
+        user=user,
+        current_jti=refresh[api_settings.JTI_CLAIM],
+        legacy_jti=legacy_jti,
+        expires_at=_expiry(),
+    )
+    refresh[SESSION_CLAIM] = str(session.id)
+    return session
+
+
+def rotate(refresh: RefreshToken) -> bool:
+    """
+    Give a validated refresh token a new JTI and expiry, in place.
+
+    Returns:
+        bool: False if the token was reused or its session is gone, in which
+        case the session has been revoked and the token must be rejected.
+    """
+    session_id: Optional[str] = refresh.get(SESSION_CLAIM)
+    presented_jti: str = refresh[api_settings.JTI_CLAIM]
+
+    if session_id is None:
+        # Token issued before sessions existed: adopt it into a session, once
+        user: Optional[User] = User.objects.filter(
+            username=refresh[api_settings.USER_ID_CLAIM]).first()
+        if user is None:
+            return False
+        refresh.set_jti()
+        refresh.set_exp()
+        refresh.set_iat()
+        try:
+            with transaction.atomic():
+                start_session(user, refresh, legacy_jti=presented_jti)
+        except IntegrityError:
+            # Already adopted: this is a replay, end the session it became
+            RefreshSession.objects.filter(legacy_jti=presented_jti).delete()
+            return False
+        return True
+
+    refresh.set_jti()
+    refresh.set_exp()
+    refresh.set_iat()
+    now: datetime = timezone.now()
+    rotated: int = RefreshSession.objects.filter(
+        id=session_id,
+        current_jti=presented_jti,
+        expires_at__gt=now,
+    ).update(
+        current_jti=refresh[api_settings.JTI_CLAIM],
+        rotation=F("rotation") + 1,
+        last_used_at=now,
+        expires_at=_expiry(),
+    )
+    if rotated:
+        return True
+
+    # Reused or revoked token: end the whole session
+    RefreshSession.objects.filter(id=session_id).delete()
+    return False
+
+
+def end_session(refresh: RefreshToken) -> None:
+    """Log out the device holding this refresh token."""
+    session_id: Optional[str] = refresh.get(SESSION_CLAIM)
+    if session_id is not None:
+        RefreshSession.objects.filter(id=session_id).delete()
+
+
+def end_all_sessions(username: str) -> int:
+    """Log out every device of a user; returns the number of sessions ended."""
+    deleted, _ = RefreshSession.objects.filter(user_id=username).delete()
+    return deleted
+
+
+def end_sessions_for_users(usernames: Iterable[str]) -> int:
+    """Log out every device of many users with one DELETE."""
+    deleted, _ = RefreshSession.objects.filter(user_id__in=list(usernames)).delete()
+    return deleted
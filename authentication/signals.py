@@ -0,0 +1,35 @@
+from typing import Any
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from . import revocation
+from .claims import bump_claims_version, forget_claims
+from .models import Profile, User
+
+
+@receiver(post_save, sender=User)
+def create_profile(sender: type, instance: User, created: bool, **kwargs: Any) -> None:
+    """Create the profile of a newly inserted user; updates cost no extra query."""
+    if created:
+        Profile.objects.create(user=instance)
+
+
+@receiver(post_save, sender=User)
+def revoke_deactivated_user(sender: type, instance: User, created: bool, **kwargs: Any) -> None:
+    """
+    Revoke outstanding access tokens when an active user is deactivated or
+    loses or gains privileges, as read requests trust the token's claims.
+    Saving an already inactive user revokes nothing again.
+    """
+    if not created and (instance.deactivated() or instance.privileges_changed()):
+        revocation.revoke_user(instance.username)
+        # Refresh must see the change without waiting for the cache
+        bump_claims_version(instance.username)
+    # Later saves of this instance compare against what was just written
+    instance.remember_saved_state()
+
+
+@receiver(post_delete, sender=User)
+def revoke_deleted_user(sender: type, instance: User, **kwargs: Any) -> None:
+    """Revoke outstanding access tokens when a user is deleted."""
+    revocation.revoke_user(instance.username)
+    forget_claims(instance.username)
@@ -1,3 +1,469 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from typing import List
+import threading
+from smtplib import SMTPException
+from unittest import mock
+from django.core.cache import caches
+from django.conf import settings
+from django.core import mail
+from django.core.management import call_command
+from django.db import IntegrityError, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import email, revocation
+from .deletion import schedule_account_deletions
+from .models import (
+    CODE_ALPHABET, CODE_LENGTH, AccountDeletion, ActivationCode, LoginCode,
+    OutboundEmail, RefreshSession, User, generate_code,
+)
+from .views import get_tokens_for_user
 
-# Create your tests here.
+
+class SignupQueryCountTests(TestCase):
+    """Signup must not re-read the user table beyond what it needs."""
+
+    def signup(self, email: str):
+        """Register a user through the API."""
+        return self.client.post(
+            reverse("user_profile"),
+            {
+                "email": email,
+                "password": "correct-horse-battery",
+                "first_name": "Jane",
+                "last_name": "Doe",
+            },
+            content_type="application/json",
+        )
+
+    @staticmethod
+    def reads(ctx: CaptureQueriesContext) -> List[str]:
+        """SQL of the SELECT statements run in the context."""
+        return [
+            query["sql"] for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith("SELECT")
+        ]
+
+    def test_signup_reads_twice(self) -> None:
+        """One email lookup and one username allocation, no validator queries."""
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.signup("Jane@Example.com")
+
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(len(self.reads(ctx)), 2, self.reads(ctx))
+        self.assertTrue(User.objects.filter(email="jane@example.com").exists())
+
+    def test_existing_email_is_one_read(self) -> None:
+        """A taken email is answered from the single projected lookup."""
+        User.objects.create_user(username="jane", email="jane@example.com")
+
+        with self.assertNumQueries(1):
+            resp = self.signup("JANE@example.com")
+
+        self.assertEqual(resp.status_code, 406)
+
+
+class BulkUserActionTests(TestCase):
+    """The bulk endpoint is for superusers and never acts on an implicit selection."""
+
+    def setUp(self) -> None:
+        self.root = User.objects.create_user(
+            username="root", email="root@example.com", is_active=True, is_superuser=True)
+        self.bob = User.objects.create_user(
+            username="bob", email="bob@example.com", is_active=True)
+        self.eve = User.objects.create_user(
+            username="eve", email="eve@example.com", is_active=False)
+
+    def bulk(self, user: User, payload: dict):
+        """POST a bulk action as the given user."""
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post(reverse("user_bulk_action"), payload, format="json")
+
+    def test_regular_user_is_forbidden(self) -> None:
+        """is_staff is on by default, so it must not be what grants access."""
+        self.assertTrue(self.bob.is_staff)
+
+        resp = self.bulk(self.bob, {"action": "schedule_deletion", "usernames": ["root"]})
+
+        self.assertEqual(resp.status_code, 403)
+        self.assertFalse(AccountDeletion.objects.exists())
+
+    def test_deactivate_by_filter(self) -> None:
+        """A recognised filter selects users; the caller is never included."""
+        resp = self.bulk(self.root, {"action": "deactivate", "filter": {"is_active": "true"}})
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual((resp.data["matched"], resp.data["affected"]), (1, 1))
+        self.assertFalse(User.objects.get(username="bob").is_active)
+        self.assertTrue(User.objects.get(username="root").is_active)
+
+    def test_unrecognised_selection_is_rejected(self) -> None:
+        """Misspelled, blank or missing filters do not fall back to every user."""
+        for payload in (
+            {"filter": {"serach": "b"}},
+            {"filter": {"search": ""}},
+            {"filter": {}},
+            {"usernames": "bob"},
+            {},
+        ):
+            with self.subTest(payload=payload):
+                resp = self.bulk(self.root, {"action": "deactivate", **payload})
+                self.assertEqual(resp.status_code, 400)
+
+        self.assertEqual(User.objects.filter(is_active=True).count(), 2)
+
+    def test_activate_skips_accounts_scheduled_for_deletion(self) -> None:
+        """A soft-deleted account stays inactive until its deletion job runs."""
+        schedule_account_deletions(["bob"])
+
+        resp = self.bulk(self.root, {"action": "activate", "usernames": ["bob", "eve"]})
+
+        self.assertEqual(resp.data["affected"], 1)
+        self.assertFalse(User.objects.get(username="bob").is_active)
+        self.assertTrue(User.objects.get(username="eve").is_active)
+
+
+class RevocationTests(TestCase):
+    """Saving a user revokes their tokens only when their access changes."""
+
+    def setUp(self) -> None:
+        caches[settings.REVOCATION_CACHE].clear()
+        revocation._memo.clear()
+        User.objects.create_user(username="jane", email="jane@example.com", is_active=True)
+
+    def test_deactivation_revokes_once(self) -> None:
+        """Only the save that deactivates the user revokes their tokens."""
+        user = User.objects.get(username="jane")
+        user.is_active = False
+        user.save()
+        self.assertIsNotNone(revocation.revoked_at("jane"))
+
+        with mock.patch.object(revocation, "revoke_user") as revoke_user:
+            user.first_name = "Jane"
+            user.save()
+            User.objects.get(username="jane").save()
+
+        revoke_user.assert_not_called()
+
+    def test_privilege_change_revokes(self) -> None:
+        """Granting superuser rejects tokens issued with the old claims."""
+        user = User.objects.get(username="jane")
+        user.save()
+        self.assertIsNone(revocation.revoked_at("jane"))
+
+        user.is_superuser = True
+        user.save()
+
+        self.assertIsNotNone(revocation.revoked_at("jane"))
+
+
+@override_settings(
+    EMAIL_USE_QUEUE=True,
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+class EmailQueueTests(TestCase):
+    """Queued emails are delivered by the worker and settled as sent or failed."""
+
+    def queue(self, to_email: str = "jane@example.com") -> OutboundEmail:
+        """Queue an activation email the way a request does."""
+        self.assertTrue(email.send_email(
+            "Verify", "activation.html",
+            {"username": "jane", "uid": "uid", "token": "token"}, to_email))
+        return OutboundEmail.objects.get(to_email=to_email)
+
+    def test_request_only_enqueues(self) -> None:
+        """Sending from a request stores the rendered body and sends nothing."""
+        outbound = self.queue()
+
+        self.assertEqual(outbound.status, "pending")
+        self.assertIn("token", outbound.html_body)
+        self.assertEqual(mail.outbox, [])
+
+    def test_delivery_marks_sent(self) -> None:
+        """Delivered emails are marked sent and lose their body."""
+        self.queue()
+        self.queue("bob@example.com")
+
+        self.assertEqual(email.deliver_queued_emails(), (2, 0))
+
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ["bob@example.com", "jane@example.com"])
+        self.assertEqual(
+            list(OutboundEmail.objects.values_list("status", "html_body").distinct()),
+            [("sent", "")])
+        self.assertEqual(email.deliver_queued_emails(), (0, 0))
+
+    def test_claimed_emails_are_leased(self) -> None:
+        """A claimed email is not claimed again until its lease runs out."""
+        outbound = self.queue()
+
+        self.assertEqual([row.pk for row in email.claim_queued_emails(10)], [outbound.pk])
+        self.assertEqual(email.claim_queued_emails(10), [])
+
+    def test_failures_back_off_then_fail(self) -> None:
+        """Failed sends are retried later and given up after the last attempt."""
+        outbound = self.queue()
+        send = "django.core.mail.backends.locmem.EmailBackend.send_messages"
+
+        with mock.patch(send, side_effect=SMTPException("refused")), \
+                self.assertLogs("authentication.email", "ERROR"):
+            self.assertEqual(email.deliver_queued_emails(), (0, 1))
+            outbound.refresh_from_db()
+            self.assertEqual((outbound.status, outbound.attempts), ("pending", 1))
+            self.assertEqual(email.deliver_queued_emails(), (0, 0))
+
+            for _ in range(outbound.attempts, settings.EMAIL_QUEUE_MAX_ATTEMPTS):
+                OutboundEmail.objects.update(next_attempt_at=outbound.created_at)
+                email.deliver_queued_emails()
+
+        outbound.refresh_from_db()
+        self.assertEqual((outbound.status, outbound.html_body), ("failed", ""))
+        self.assertEqual(outbound.last_error, "refused")
+
+
+class EmailQueueLockingTests(TransactionTestCase):
+    """Workers draining the queue in parallel never claim the same row."""
+
+    def test_claim_skips_locked_rows(self) -> None:
+        """Rows locked by another worker are skipped rather than waited on."""
+        locked = OutboundEmail.objects.create(to_email="jane@example.com", subject="a", html_body="a")
+        free = OutboundEmail.objects.create(to_email="bob@example.com", subject="b", html_body="b")
+        holding, release = threading.Event(), threading.Event()
+
+        def other_worker() -> None:
+            try:
+                with transaction.atomic():
+                    OutboundEmail.objects.select_for_update().get(pk=locked.pk)
+                    holding.set()
+                    release.wait(10)
+            finally:
+                connections.close_all()
+
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        try:
+            self.assertTrue(holding.wait(10))
+            claimed = email.claim_queued_emails(10)
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual([row.pk for row in claimed], [free.pk])
+
+
+THROTTLED_REST_FRAMEWORK: dict = {
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {
+        **settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+        "login": "2/min",
+        "email_check": "2/min",
+    },
+}
+
+
+@override_settings(REST_FRAMEWORK=THROTTLED_REST_FRAMEWORK)
+class ThrottleTests(TestCase):
+    """Rate-limited views answer 429 once any of their keys is over the limit."""
+
+    def setUp(self) -> None:
+        caches[settings.THROTTLE_CACHE].clear()
+
+    def post(self, name: str, data: dict, ip: str = "10.0.0.1"):
+        """POST to a named view from the given client address."""
+        return self.client.post(
+            reverse(name), data, content_type="application/json", REMOTE_ADDR=ip)
+
+    def test_email_check_is_limited_per_ip(self) -> None:
+        """The third check within a minute is rejected with Retry-After."""
+        for _ in range(2):
+            self.assertEqual(self.post("check_email", {"email": "a@example.com"}).status_code, 200)
+
+        resp = self.post("check_email", {"email": "a@example.com"})
+
+        self.assertEqual(resp.status_code, 429)
+        self.assertGreater(int(resp["Retry-After"]), 0)
+        self.assertEqual(
+            self.post("check_email", {"email": "a@example.com"}, ip="10.0.0.2").status_code, 200)
+
+    def test_login_is_limited_per_account(self) -> None:
+        """Guessing one account's password from new addresses stays blocked."""
+        data: dict = {"email": "jane@example.com", "password": "wrong"}
+        for n in range(2):
+            self.assertNotEqual(self.post("token_create", data, ip=f"10.0.1.{n}").status_code, 429)
+
+        self.assertEqual(self.post("token_create", data, ip="10.0.1.9").status_code, 429)
+
+
+class VerificationCodeTests(TestCase):
+    """Codes are unguessable and stop working once their lifetime is over."""
+
+    def setUp(self) -> None:
+        caches[settings.THROTTLE_CACHE].clear()
+        self.user = User.objects.create_user(username="jane", email="jane@example.com")
+
+    def test_codes_are_random_over_the_alphabet(self) -> None:
+        """Codes use the whole alphabet and do not repeat."""
+        codes: List[str] = [generate_code() for _ in range(1000)]
+
+        self.assertTrue(all(len(code) == CODE_LENGTH for code in codes))
+        self.assertEqual(set("".join(codes)), set(CODE_ALPHABET))
+        self.assertEqual(len(set(codes)), len(codes))
+
+    def test_expiry_follows_the_model_lifetime(self) -> None:
+        """New codes expire after their model's lifetime."""
+        before = timezone.now()
+        login = LoginCode.objects.create(user=self.user)
+        activation = ActivationCode.objects.create(user=self.user)
+
+        self.assertAlmostEqual(
+            login.expires_at, before + LoginCode.lifetime, delta=timedelta(seconds=5))
+        self.assertAlmostEqual(
+            activation.expires_at, before + ActivationCode.lifetime, delta=timedelta(seconds=5))
+        self.assertFalse(login.is_expired)
+        login.expires_at = timezone.now()
+        self.assertTrue(login.is_expired)
+
+    def test_expired_activation_code_is_rejected(self) -> None:
+        """An expired activation code no longer activates the account."""
+        code = ActivationCode.objects.create(
+            user=self.user, expires_at=timezone.now() - timedelta(seconds=1))
+        data: dict = {"uid": code.uid, "token": code.token}
+
+        resp = self.client.post(reverse("user_activate"), data, content_type="application/json")
+
+        self.assertNotEqual(resp.status_code, 200)
+        self.assertFalse(User.objects.get(username="jane").is_active)
+        ActivationCode.objects.filter(id=code.id).update(expires_at=timezone.now() + timedelta(hours=1))
+        resp = self.client.post(reverse("user_activate"), data, content_type="application/json")
+        self.assertEqual(resp.status_code, 200)
+
+    def test_purge_removes_only_expired_codes(self) -> None:
+        """The purge command deletes expired codes and keeps live ones."""
+        bob = User.objects.create_user(username="bob", email="bob@example.com")
+        LoginCode.objects.create(user=self.user, expires_at=timezone.now() - timedelta(minutes=1))
+        live = LoginCode.objects.create(user=bob)
+
+        call_command("purge_expired_codes", "--batch-size", "1", stdout=StringIO())
+
+        self.assertEqual(list(LoginCode.objects.values_list("id", flat=True)), [live.id])
+
+
+class UsernameAllocationTests(TestCase):
+    """Usernames come from the email's local part with the next free suffix."""
+
+    def create(self, username: str) -> None:
+        """Insert a user holding the given username."""
+        User.objects.create_user(username=username, email=f"{username}@example.org")
+
+    def test_next_suffix_skips_lookalikes(self) -> None:
+        """Only base and base_<digits> count; the highest suffix is bumped."""
+        self.assertEqual(User.objects.allocate_username("jane"), "jane")
+        for username in ("jane", "jane_1", "jane_7", "jane_x", "jane_2_3", "janet"):
+            self.create(username)
+
+        self.assertEqual(User.objects.allocate_username("jane"), "jane_8")
+
+    def test_base_is_matched_literally(self) -> None:
+        """Regex characters in the base do not match other names."""
+        self.create("aXb")
+
+        self.assertEqual(User.objects.allocate_username("a.b"), "a.b")
+
+    def test_namesakes_get_suffixes(self) -> None:
+        """Signups sharing a local part get distinct usernames."""
+        names: List[str] = [
+            User.objects.create_user_from_email(f"jane@{domain}").username
+            for domain in ("example.com", "example.org", "example.net")
+        ]
+
+        self.assertEqual(names, ["jane", "jane_1", "jane_2"])
+
+    def test_concurrent_claim_is_retried(self) -> None:
+        """A name taken between allocation and insert is allocated again."""
+        self.create("jane")
+        manager = type(User.objects)
+
+        with mock.patch.object(manager, "allocate_username", side_effect=["jane", "jane_1"]) as allocate:
+            user = User.objects.create_user_from_email("jane@example.com")
+
+        self.assertEqual(user.username, "jane_1")
+        self.assertEqual(allocate.call_count, 2)
+
+    def test_taken_email_is_not_retried(self) -> None:
+        """A duplicate email fails at once instead of trying more names."""
+        User.objects.create_user_from_email("jane@example.com")
+        manager = type(User.objects)
+
+        with mock.patch.object(manager, "allocate_username", wraps=User.objects.allocate_username) as allocate:
+            with self.assertRaises(IntegrityError):
+                User.objects.create_user_from_email("Jane@Example.com")
+
+        self.assertEqual(allocate.call_count, 1)
+
+
+class RefreshSessionTests(TestCase):
+    """Refresh tokens rotate per device, and a replayed token ends its session."""
+
+    def setUp(self) -> None:
+        caches[settings.CLAIMS_CACHE].clear()
+        self.user = User.objects.create_user(
+            username="jane", email="jane@example.com", is_active=True)
+
+    def refresh(self, token: str):
+        """Exchange a refresh token for new tokens."""
+        return self.client.post(
+            reverse("token_refresh"), {"refresh": token}, content_type="application/json")
+
+    def logout(self, token: str, **extra: object):
+        """Log out the device holding the refresh token."""
+        return self.client.post(
+            reverse("logout"), {"refresh": token, **extra}, content_type="application/json")
+
+    def test_refresh_rotates_the_token(self) -> None:
+        """Each refresh returns a new token that the session now expects."""
+        first: str = get_tokens_for_user(self.user)["refresh"]
+
+        resp = self.refresh(first)
+        self.assertEqual(resp.status_code, 200)
+        second: str = resp.json()["refresh"]
+        self.assertNotEqual(second, first)
+        self.assertEqual(self.refresh(second).status_code, 200)
+
+        self.assertEqual(RefreshSession.objects.get().rotation, 2)
+
+    def test_reuse_revokes_the_session(self) -> None:
+        """Presenting a rotated token ends the session for every holder."""
+        first: str = get_tokens_for_user(self.user)["refresh"]
+        second: str = self.refresh(first).json()["refresh"]
+
+        self.assertEqual(self.refresh(first).status_code, 401)
+
+        self.assertFalse(RefreshSession.objects.exists())
+        self.assertEqual(self.refresh(second).status_code, 401)
+
+    def test_logout_ends_one_or_all_sessions(self) -> None:
+        """Logout ends the token's own session, or every session with all."""
+        phone: str = get_tokens_for_user(self.user)["refresh"]
+        laptop: str = get_tokens_for_user(self.user)["refresh"]
+        tablet: str = get_tokens_for_user(self.user)["refresh"]
+
+        self.assertEqual(self.logout(phone).status_code, 200)
+        self.assertEqual(self.refresh(phone).status_code, 401)
+        self.assertEqual(self.refresh(laptop).status_code, 200)
+
+        self.logout(tablet, all=True)
+        self.assertFalse(RefreshSession.objects.exists())
+
+    def test_legacy_token_is_adopted_once(self) -> None:
+        """A pre-session token becomes a session once; a replay ends it."""
+        legacy: str = str(RefreshToken.for_user(self.user))
+
+        self.assertEqual(self.refresh(legacy).status_code, 200)
+        self.assertEqual(RefreshSession.objects.count(), 1)
+
+        self.assertEqual(self.refresh(legacy).status_code, 401)
+        self.assertFalse(RefreshSession.objects.exists())
@@ -8,6 +8,13 @@ from . import views
 USER_MANAGEMENT_PATTERNS: List[URLPattern] = [
     path("users/me/", views.UserViews.as_view(), name="user_profile"),
     path("users/alluser/", views.ListAllUser.as_view(), name="user_list"),
+    path("users/bulk/", views.BulkUserActionView.as_view(), name="user_bulk_action"),
+    path("users/me/export/", views.DataExportView.as_view(), name="data_export"),
+    path(
+        "users/me/export/<uuid:export_id>/",
+        views.DataExportDownloadView.as_view(),
+        name="data_export_download"
+    ),
 ]
 
 # URL patterns for user activation
@@ -34,6 +41,7 @@ AUTH_PATTERNS: List[URLPattern] = [
 JWT_PATTERNS: List[URLPattern] = [
     path("users/jwt/create/", views.CreateJWTView.as_view(), name="token_create"),
     path("users/jwt/refresh/", views.TokenRefreshView.as_view(), name="token_refresh"),
+    path("users/logout/", views.LogoutView.as_view(), name="logout"),
     path("users/jwt/verify/", TokenVerifyView.as_view(), name="token_verify"),
 ]
 
@@ -1,22 +1,46 @@
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, TypedDict, List
-from django.contrib.auth import get_user_model, authenticate
-from django.utils.timezone import localtime, now
+from typing import Dict, Any, Mapping, Optional, TypedDict, List
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.db.models import Q, QuerySet
+from django.http import FileResponse, HttpResponseBase, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.timezone import now
 from rest_framework import views, response, status, permissions
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.conf import settings
-import random
-import string
 import uuid
 import requests
-from . import serializers, email, models
+from . import audit, bulk, deletion, export, serializers, email, hashing, models, oauth, sessions
+from .claims import bump_claims_version, get_cached_claims, get_user_claims
 from server.message import Message
 from server.decorators import catch_exception
-from server.utils import redirect_uri_builder
+from server.permissions import IsSuperUser
+from server.utils import keyset_next_url_builder, redirect_uri_builder
 
-# Constants
-TOKEN_LENGTH: int = 4
-OTP_EXPIRY_MINUTES: int = 10
+# Columns returned by the admin user listing
+USER_LIST_FIELDS: List[str] = [
+    "username",
+    "email",
+    "first_name",
+    "last_name",
+    "image",
+    "method",
+    "is_active",
+    "is_superuser",
+]
+
+# Page sizes of the admin user listing
+USER_PAGE_SIZE: int = 50
+MAX_USER_PAGE_SIZE: int = 200
+
+# Query string values read as True by boolean filters
+TRUTHY_VALUES: tuple = ("1", "true", "yes")
+
+# Actions of the bulk user endpoint
+BULK_USER_ACTIONS: tuple = ("activate", "deactivate", "grant_courses", "schedule_deletion")
+
+# Keys understood by filter_users
+USER_FILTER_KEYS: tuple = ("is_active", "is_superuser", "method", "search")
 
 
 class TokenDict(TypedDict):
@@ -29,25 +53,13 @@ class TokenDict(TypedDict):
 User = get_user_model()
 
 
-def generate_random_code(length: int = TOKEN_LENGTH) -> str:
-    """Generate a random alphanumeric code of specified length"""
-    characters: str = string.ascii_letters + string.digits
-    return "".join(random.choices(characters, k=length))
-
-
 def get_tokens_for_user(user: models.User) -> TokenDict:
-    """Generate JWT tokens with user information"""
+    """Generate JWT tokens with user information, starting a new device session"""
     refresh = RefreshToken.for_user(user)
+    sessions.start_session(user, refresh)
 
     # Add user claims to token
-    user_claims = {
-        "email": user.email,
-        "first_name": user.first_name,
-        "last_name": user.last_name,
-        "image": user.image,
-        "is_superuser": user.is_superuser
-    }
-    refresh.payload.update(user_claims)
+    refresh.payload.update(get_user_claims(user))
 
     return {
         "refresh": str(refresh),
@@ -55,10 +67,21 @@ def get_tokens_for_user(user: models.User) -> TokenDict:
     }
 
 
+def refuse_oauth_sign_in(request, user: models.User, method: str) -> Optional[response.Response]:
+    """Return the refusal for accounts that may not sign in, or None if the user may"""
+    if user.deleted_at is not None:
+        audit.record("login_failed", request, user.username, reason="deleted", method=method)
+        return Message.error(msg="This account has been deleted.")
+    if not user.is_active:
+        audit.record("login_failed", request, user.username, reason="inactive", method=method)
+        return Message.warn(msg="Account not verified. Please verify your email first.")
+    return None
+
+
 def check_email_exists(email: str) -> bool:
     """Check if email exists in database"""
     try:
-        return User.objects.filter(email=email).exists()
+        return User.objects.by_email(email).exists()
     except Exception:
         return False
 
@@ -66,40 +89,63 @@ def check_email_exists(email: str) -> bool:
 def check_user_active(email: str) -> bool:
     """Check if user account is active"""
     try:
-        user = User.objects.get(email=email)
+        user = User.objects.by_email(email).get()
         return user.is_active
     except User.DoesNotExist:
         return False
 
 
-def check_time_difference(recorded_time: datetime) -> bool:
-    """Check if time difference is greater than OTP expiry time"""
-    current_time: datetime = localtime(now())
-    parsed_recorded_time: datetime = localtime(recorded_time)
-    time_difference: timedelta = current_time - parsed_recorded_time
-    return time_difference > timedelta(minutes=OTP_EXPIRY_MINUTES)
+def filter_users(params: Mapping[str, Any]) -> QuerySet:
+    """
+    Apply the status, method and search filters of the admin user listing.
+
+    Args:
+        params: Query string, or the filter object of a bulk request
+    """
+    users = User.objects.all()
+
+    is_active: Any = params.get("is_active")
+    is_superuser: Any = params.get("is_superuser")
+    method: Optional[str] = params.get("method")
+    search: str = str(params.get("search", "")).strip()
+
+    if is_active is not None:
+        users = users.filter(is_active=str(is_active).lower() in TRUTHY_VALUES)
+    if is_superuser is not None:
+        users = users.filter(
+            is_superuser=str(is_superuser).lower() in TRUTHY_VALUES)
+    if method:
+        users = users.filter(method=method)
+    if search:
+        # Prefix matches, each served by its own pattern index
+        users = users.filter(
+            Q(username__startswith=search)
+            | Q(email__istartswith=search)
+            | Q(first_name__istartswith=search)
+            | Q(last_name__istartswith=search)
+        )
+
+    return users
 
 
 class BaseCodeMixin:
     """Mixin for common code generation methods"""
 
     def create_uid(self) -> str:
-        """Generate unique UID"""
-        max_attempts: int = 3
-        for _ in range(max_attempts):
-            uid: str = generate_random_code()
-            if not self.model.objects.filter(uid=uid).exists():
-                return uid
-        raise ValueError("Failed to generate unique UID")
+        """Generate a random UID; its entropy makes a uniqueness check unnecessary"""
+        return models.generate_code()
 
     def create_token(self) -> str:
-        """Generate unique token"""
-        max_attempts: int = 3
-        for _ in range(max_attempts):
-            token: str = generate_random_code()
-            if not self.model.objects.filter(token=token).exists():
-                return token
-        raise ValueError("Failed to generate unique token")
+        """Generate a random token"""
+        return models.generate_code()
+
+    def get_active_code(self, user: models.User) -> Optional[models.BaseCode]:
+        """Return the user's unexpired code, deleting an expired one so a new code can be issued"""
+        code: Optional[models.BaseCode] = self.model.objects.filter(user=user).first()
+        if code and code.is_expired:
+            code.delete()
+            return None
+        return code
 
 
 class UserViews(BaseCodeMixin, views.APIView):
@@ -114,19 +160,6 @@ class UserViews(BaseCodeMixin, views.APIView):
         """Verify user authentication status"""
         return user.is_authenticated
 
-    @staticmethod
-    def generate_unique_username(email: str) -> str:
-        """Generate username from email"""
-        base_username: str = email.split("@")[0]
-        username: str = base_username
-        counter: int = 1
-
-        while User.objects.filter(username=username).exists():
-            username = f"{base_username}_{counter}"
-            counter += 1
-
-        return username
-
     @catch_exception
     def get(self, request) -> response.Response:
         """Get user profile with caching"""
@@ -149,20 +182,25 @@ class UserViews(BaseCodeMixin, views.APIView):
         """
         email_address: str = request.data.get("email", "")
 
-        # Check if email already exists
-        if check_email_exists(email_address):
-            if not check_user_active(email_address):
+        # One projected read tells whether the email is taken and verified
+        is_active: Optional[bool] = (
+            User.objects.by_email(email_address)
+            .values_list("is_active", flat=True)
+            .first()
+        )
+        if is_active is not None:
+            if not is_active:
                 return Message.warn(
                     msg="You have already registered. But not verified you email yet. Please verify it first."
                 )
             return Message.warn(msg="You have already registered.")
 
-        # Create user with generated username
+        # Create user; the username is allocated from the email
         try:
             serialized_data = serializers.UserCreateSerializer(
                 data={
-                    **request.data,
-                    "username": self.generate_unique_username(email_address),
+                    key: value for key, value in request.data.items()
+                    if key != "username"
                 }
             )
 
@@ -171,7 +209,11 @@ class UserViews(BaseCodeMixin, views.APIView):
                     msg=f"Validation error: {serialized_data.errors}"
                 )
 
-            user = serialized_data.save()
+            try:
+                user = serialized_data.save()
+            except IntegrityError:
+                # A concurrent signup took the email after the check above
+                return Message.warn(msg="You have already registered.")
 
             # Generate activation codes
             uid: str = self.create_uid()
@@ -227,6 +269,7 @@ class UserViews(BaseCodeMixin, views.APIView):
                 )
 
             updated_user = serialized_data.save()
+            bump_claims_version(updated_user.username)
             return response.Response(
                 serializers.UserSerializer(updated_user).data,
                 status=status.HTTP_200_OK
@@ -250,12 +293,101 @@ class UserViews(BaseCodeMixin, views.APIView):
             return Message.error(msg="You are not authenticated yet. Try again.")
 
         try:
-            request.user.delete()
-            return Message.success(msg="Your account has been deleted.")
+            # Deactivate now; the data is removed by process_account_deletions
+            deletion.schedule_account_deletion(request.user)
+            return Message.success(msg="Your account has been scheduled for deletion.")
         except Exception as e:
             return Message.error(msg=f"Failed to delete account: {str(e)}")
 
 
+class DataExportView(views.APIView):
+    """Export everything the signed-in user has stored with us."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_scope: str = "data_export"
+    throttle_keys: tuple = ("user",)
+
+    @catch_exception
+    def get(self, request) -> HttpResponseBase:
+        """
+        Stream the export archive, or queue it when it is too large.
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            The ZIP archive, or 202 with the link the finished export can be
+            downloaded from
+        """
+        username: str = request.user.username
+
+        try:
+            if export.is_inline(username):
+                archive = StreamingHttpResponse(
+                    export.stream_export(username), content_type="application/zip")
+                archive["Content-Disposition"] = (
+                    f'attachment; filename="{username}-export.zip"')
+                return archive
+
+            job: Optional[models.DataExport] = models.DataExport.objects.filter(
+                user=request.user, status__in=("pending", "running")).first()
+            if job is None:
+                job = models.DataExport.objects.create(user=request.user)
+
+            return response.Response(
+                {
+                    "id": str(job.id),
+                    "status": job.status,
+                    "download_url": request.build_absolute_uri(
+                        reverse("data_export_download", args=[job.id])),
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+
+        except Exception as e:
+            return Message.error(msg=f"Failed to export your data: {str(e)}")
+
+
+class DataExportDownloadView(views.APIView):
+    """Download an export built in the background."""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    @catch_exception
+    def get(self, request, export_id: uuid.UUID) -> HttpResponseBase:
+        """
+        Return the archive once ready, otherwise the job's status.
+
+        Args:
+            request: HTTP request object
+            export_id: Id of the export job
+
+        Returns:
+            The ZIP archive, or the status of an unfinished export
+        """
+        job: Optional[models.DataExport] = models.DataExport.objects.filter(
+            id=export_id, user=request.user).first()
+
+        if job is None or (job.expires_at and job.expires_at <= now()):
+            return response.Response(
+                {"error": "Export not found."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        if job.status != "done":
+            return response.Response(
+                {"id": str(job.id), "status": job.status},
+                status=status.HTTP_202_ACCEPTED
+            )
+
+        return FileResponse(
+            export.storage.open(job.file_name, "rb"),
+            as_attachment=True,
+            filename=f"{job.user_id}-export.zip",
+            content_type="application/zip",
+        )
+
+
 class ActivateUserViews(views.APIView):
     """Handle user account activation process."""
 
@@ -277,7 +409,9 @@ class ActivateUserViews(views.APIView):
             # Get activation code and associated user
             activation = models.ActivationCode.objects.filter(
                 uid=uid,
-                token=token
+                token=token,
+                expires_at__gt=now(),
+                user__deleted_at__isnull=True,
             ).select_related('user').first()
 
             if not activation:
@@ -289,6 +423,7 @@ class ActivateUserViews(views.APIView):
 
             # Clean up activation code
             activation.delete()
+            audit.record("activation", request, user.username)
 
             # Generate and return JWT tokens
             return response.Response(
@@ -308,6 +443,10 @@ class ResendActivateUserViews(BaseCodeMixin, views.APIView):
 
     model = models.ActivationCode
 
+    # Rate limit per client IP and per target email
+    throttle_scope: str = "activation"
+    throttle_keys: tuple = ("ip", "email")
+
     @catch_exception
     def post(self, request) -> response.Response:
         """
@@ -326,7 +465,11 @@ class ResendActivateUserViews(BaseCodeMixin, views.APIView):
             return Message.error(msg="No such user exists. Please try again.")
 
         try:
-            user: models.User = User.objects.get(email=user_email)
+            user: models.User = User.objects.by_email(user_email).get()
+
+            # Accounts scheduled for deletion cannot be activated again
+            if user.deleted_at is not None:
+                return Message.error(msg="No such user exists. Please try again.")
 
             # Check user activation status
             if check_user_active(user_email):
@@ -335,9 +478,7 @@ class ResendActivateUserViews(BaseCodeMixin, views.APIView):
                 )
 
             # Handle existing activation code
-            activation_code: Optional[models.ActivationCode] = (
-                models.ActivationCode.objects.filter(user=user).first()
-            )
+            activation_code: Optional[models.ActivationCode] = self.get_active_code(user)
 
             if activation_code:
                 # Resend existing code
@@ -383,6 +524,10 @@ class SendLoginOTPView(BaseCodeMixin, views.APIView):
 
     model = models.LoginCode
 
+    # Rate limit per client IP and per target email
+    throttle_scope: str = "otp"
+    throttle_keys: tuple = ("ip", "email")
+
     @catch_exception
     def post(self, request) -> response.Response:
         """
@@ -398,7 +543,7 @@ class SendLoginOTPView(BaseCodeMixin, views.APIView):
 
         try:
             # Validate user existence
-            user: models.User = User.objects.filter(email=user_email).first()
+            user: models.User = User.objects.by_email(user_email).first()
             if not user:
                 return Message.error(msg="No such user exists. Please try again.")
 
@@ -409,9 +554,7 @@ class SendLoginOTPView(BaseCodeMixin, views.APIView):
                 )
 
             # Handle existing login code
-            login_code: Optional[models.LoginCode] = (
-                models.LoginCode.objects.filter(user=user).first()
-            )
+            login_code: Optional[models.LoginCode] = self.get_active_code(user)
 
             if login_code:
                 # Resend existing code
@@ -443,6 +586,7 @@ class SendLoginOTPView(BaseCodeMixin, views.APIView):
                         msg=f"Failed to send login code: {str(e)}"
                     )
 
+            audit.record("otp_sent", request, user.username)
             return Message.success(msg="Login code has been sent to your email.")
 
         except Exception as e:
@@ -461,6 +605,10 @@ class ResendLoginOTPView(BaseCodeMixin, views.APIView):
 class CreateJWTView(views.APIView):
     """Handle JWT token creation for both password and OTP-based authentication."""
 
+    # Rate limit per client IP, per account and per OTP code
+    throttle_scope: str = "login"
+    throttle_keys: tuple = ("ip", "email", "uid")
+
     @catch_exception
     def post(self, request) -> response.Response:
         """
@@ -479,30 +627,38 @@ class CreateJWTView(views.APIView):
 
             try:
                 # Validate user existence and status
-                user: Optional[models.User] = User.objects.filter(
-                    email=email).first()
+                user: Optional[models.User] = User.objects.by_email(email).first()
                 if not user:
+                    audit.record("login_failed", request, email=email, reason="unknown_email")
                     return Message.error(msg="No such user exists. Please try again.")
 
                 if not user.is_active:
+                    audit.record("login_failed", request, user.username, reason="inactive")
                     return Message.warn(
                         msg="Account not verified. Please verify your email first."
                     )
 
-                # Authenticate user
-                authenticated_user: Optional[models.User] = authenticate(
-                    username=user.username,
-                    password=password
-                )
+                # Verify the password on the bounded hashing pool
+                try:
+                    password_ok: bool = hashing.check_user_password(user, password)
+                except hashing.HashingBusy as e:
+                    return response.Response(
+                        {"error": str(e)},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                        headers={"Retry-After": "1"},
+                    )
 
-                if authenticated_user is None:
+                if not password_ok:
+                    audit.record("login_failed", request, user.username, reason="password")
                     return Message.error(
                         msg="Invalid email or password. Please try again."
                     )
 
+                audit.record("login", request, user.username, method="password")
+
                 # Generate and return tokens
                 return response.Response(
-                    get_tokens_for_user(authenticated_user),
+                    get_tokens_for_user(user),
                     status=status.HTTP_200_OK,
                 )
 
@@ -523,11 +679,14 @@ class CreateJWTView(views.APIView):
                 )
 
                 if not login_code:
+                    audit.record("login_failed", request, reason="invalid_code")
                     return Message.error(msg="Invalid login code. Please try again.")
 
                 # Check OTP expiration
-                if check_time_difference(login_code.created_at):
+                if login_code.is_expired:
                     login_code.delete()
+                    audit.record(
+                        "login_failed", request, login_code.user_id, reason="expired_code")
                     return Message.error(msg="Login code has expired. Please try again.")
 
                 user: models.User = login_code.user
@@ -540,6 +699,7 @@ class CreateJWTView(views.APIView):
 
                 # Clean up used OTP
                 login_code.delete()
+                audit.record("login", request, user.username, method="otp")
 
                 # Generate and return tokens
                 return response.Response(
@@ -574,19 +734,25 @@ class TokenRefreshView(views.APIView):
             # Create refresh token instance
             token: RefreshToken = RefreshToken(refresh_token)
 
-            # Get associated user
-            user: models.User = User.objects.get(username=token["username"])
+            # Get the user's claims, normally without touching the database
+            cached: Optional[Dict[str, Any]] = get_cached_claims(token["username"])
+            if cached is None:
+                return Message.error(msg="User does not exist.")
+
+            # Deactivated users must not mint fresh access tokens
+            if not cached["is_active"]:
+                return Message.error(msg="Account is inactive.")
+
+            # Rotate the refresh token; a reused token revokes its session
+            if not sessions.rotate(token):
+                return response.Response(
+                    {"error": "Session has ended. Please log in again."},
+                    status=status.HTTP_401_UNAUTHORIZED,
+                )
 
             # Update access token claims
             access_token = token.access_token
-            user_claims: Dict[str, Any] = {
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "image": user.image,
-                "is_superuser": user.is_superuser
-            }
-            access_token.update(user_claims)
+            access_token.payload.update(cached["claims"])
 
             # Return new tokens
             return response.Response(
@@ -601,6 +767,42 @@ class TokenRefreshView(views.APIView):
             return Message.error(msg=f"Token refresh failed: {str(e)}")
 
 
+class LogoutView(views.APIView):
+    """Handle logging out one device, or every device of the user."""
+
+    @catch_exception
+    def post(self, request) -> response.Response:
+        """
+        End the session of a refresh token.
+
+        Args:
+            request: HTTP request containing the refresh token, and
+                optionally "all": true to end every session of its user
+
+        Returns:
+            Response with success/error message
+        """
+        refresh_token: Optional[str] = request.data.get("refresh")
+
+        if not refresh_token:
+            return Message.error(msg="Refresh token not provided.")
+
+        try:
+            token: RefreshToken = RefreshToken(refresh_token)
+
+            if request.data.get("all") in (True, "true", "1"):
+                sessions.end_all_sessions(token["username"])
+                audit.record("logout", request, token["username"], all=True)
+                return Message.success(msg="Logged out from all devices.")
+
+            sessions.end_session(token)
+            audit.record("logout", request, token["username"])
+            return Message.success(msg="Logged out.")
+
+        except Exception as e:
+            return Message.error(msg=f"Logout failed: {str(e)}")
+
+
 class ResetUserPassword(BaseCodeMixin, views.APIView):
     """Handle password reset operations."""
 
@@ -621,8 +823,7 @@ class ResetUserPassword(BaseCodeMixin, views.APIView):
         try:
             # Check for existing reset code
             reset_code: Optional[models.ResetPasswordCode] = (
-                models.ResetPasswordCode.objects.filter(
-                    user=request.user).first()
+                self.get_active_code(request.user)
             )
 
             if reset_code:
@@ -685,7 +886,7 @@ class ResetUserEmail(BaseCodeMixin, views.APIView):
         try:
             # Check for existing reset code
             reset_code: Optional[models.ResetEmailCode] = (
-                models.ResetEmailCode.objects.filter(user=request.user).first()
+                self.get_active_code(request.user)
             )
 
             if reset_code:
@@ -745,7 +946,8 @@ class UpdateEmailView(views.APIView):
         try:
             # Validate reset code
             reset_code: Optional[models.ResetEmailCode] = (
-                models.ResetEmailCode.objects.filter(uid=uid, token=token)
+                models.ResetEmailCode.objects.filter(
+                    uid=uid, token=token, expires_at__gt=now())
                 .select_related('user')
                 .first()
             )
@@ -760,6 +962,7 @@ class UpdateEmailView(views.APIView):
             user: models.User = request.user
             user.email = reset_code.new_email
             user.save()
+            bump_claims_version(user.username)
 
             # Clean up reset code
             reset_code.delete()
@@ -773,6 +976,9 @@ class UpdateEmailView(views.APIView):
 class CheckEmailView(views.APIView):
     """Handle email availability checks."""
 
+    # Rate limit per client IP to stop account enumeration
+    throttle_scope: str = "email_check"
+
     @catch_exception
     def post(self, request) -> response.Response:
         """
@@ -789,8 +995,8 @@ class CheckEmailView(views.APIView):
             return Message.error(msg="Email is required.")
 
         try:
-            # Case-insensitive email check
-            is_taken: bool = User.objects.filter(email__iexact=email).exists()
+            # Case-insensitive email check, served by the email index
+            is_taken: bool = User.objects.by_email(email).exists()
             if is_taken:
                 return Message.error(msg="Email is already taken. Please try another.")
 
@@ -801,35 +1007,148 @@ class CheckEmailView(views.APIView):
 
 
 class ListAllUser(views.APIView):
-    """Handle user listing for admin users."""
+    """
+    Handle user listing for superusers.
 
-    permission_classes = [permissions.IsAdminUser]
+    Users are returned in username order with keyset pagination (`after` is
+    the last username of the previous page), so every page is an index range
+    scan regardless of how many users exist.
+    """
+
+    permission_classes = [IsSuperUser]
 
     @catch_exception
     def get(self, request) -> response.Response:
         """
-        List all users with caching.
+        List one page of users.
 
         Args:
             request: HTTP request from admin user
 
         Returns:
-            Response with serialized user data
+            Response with the page of users and the next page URL
         """
         try:
-            # Get and serialize all users
-            users: List[models.User] = User.objects.all().order_by(
-                '-date_joined')
-            serialized_data: List[Dict[str, Any]] = (
-                serializers.UserSerializer(users, many=True).data
+            page_size: int = min(
+                max(int(request.GET.get("page_size", USER_PAGE_SIZE)), 1),
+                MAX_USER_PAGE_SIZE,
             )
+            after: Optional[str] = request.GET.get("after")
+
+            users = filter_users(request.GET)
+            if after:
+                users = users.filter(username__gt=after)
 
-            return response.Response(serialized_data, status=status.HTTP_200_OK)
+            # Fetch one extra row to learn whether another page exists
+            rows: List[Dict[str, Any]] = list(
+                users.order_by("username").values(*USER_LIST_FIELDS)[:page_size + 1])
+            has_next: bool = len(rows) > page_size
+            rows = rows[:page_size]
+
+            return response.Response(
+                {
+                    "results": rows,
+                    "next": keyset_next_url_builder(
+                        request.path,
+                        request.GET,
+                        rows[-1]["username"] if has_next else None,
+                    ),
+                },
+                status=status.HTTP_200_OK,
+            )
 
         except Exception as e:
             return Message.error(msg=f"Failed to fetch users: {str(e)}")
 
 
+class BulkUserActionView(views.APIView):
+    """
+    Apply one action to many users at once.
+
+    Users are picked by a `usernames` list or a `filter` object with the
+    keys of the user listing (is_active, is_superuser, method, search).
+    Actions: "activate", "deactivate", "grant_courses" (with `courses`, a
+    list of course ids) and "schedule_deletion". The requesting superuser
+    is never deactivated or deleted by their own bulk request, and accounts
+    scheduled for deletion are neither activated nor granted courses.
+    """
+
+    permission_classes = [IsSuperUser]
+
+    @staticmethod
+    def select_users(
+        usernames: Any,
+        user_filter: Any,
+    ) -> Optional[QuerySet]:
+        """
+        Build the target queryset, or None if the selection is not explicit.
+
+        An empty, misspelled or blank filter would otherwise match every user.
+        """
+        if usernames:
+            if not isinstance(usernames, list):
+                return None
+            return User.objects.filter(username__in=usernames)
+        if not isinstance(user_filter, dict) or not user_filter:
+            return None
+        if any(key not in USER_FILTER_KEYS for key in user_filter):
+            return None
+        if all(value is None or str(value).strip() == "" for value in user_filter.values()):
+            return None
+        return filter_users(user_filter)
+
+    @catch_exception
+    def post(self, request) -> response.Response:
+        """
+        Run a bulk action.
+
+        Args:
+            request: HTTP request from a superuser with action and target users
+
+        Returns:
+            Response with the matched and affected user counts
+        """
+        action: Optional[str] = request.data.get("action")
+
+        if action not in BULK_USER_ACTIONS:
+            return Message.error(
+                msg=f"Unknown action. Choose one of: {', '.join(BULK_USER_ACTIONS)}.")
+
+        # An empty or unrecognised selection must never fall back to every user
+        users: Optional[QuerySet] = self.select_users(
+            request.data.get("usernames"), request.data.get("filter"))
+        if users is None:
+            return Message.error(
+                msg="Provide a non-empty usernames list or a filter using "
+                    f"{', '.join(USER_FILTER_KEYS)}.")
+
+        try:
+            if action == "activate":
+                result = bulk.set_active(users, True)
+            elif action == "deactivate":
+                result = bulk.set_active(
+                    users.exclude(username=request.user.username), False)
+            elif action == "grant_courses":
+                course_ids: List[str] = request.data.get("courses") or []
+                if not course_ids:
+                    return Message.error(msg="Provide the courses to grant.")
+                unknown: List[str] = bulk.unknown_courses(course_ids)
+                if unknown:
+                    return Message.error(msg=f"Unknown courses: {', '.join(unknown)}")
+                result = bulk.grant_courses(users, course_ids)
+            else:
+                result = bulk.schedule_deletions(
+                    users.exclude(username=request.user.username))
+
+            return response.Response(
+                {"action": action, **result.as_dict()},
+                status=status.HTTP_200_OK,
+            )
+
+        except Exception as e:
+            return Message.error(msg=f"Bulk action failed: {str(e)}")
+
+
 class GithubAuthRedirect(views.APIView):
     """Handle GitHub OAuth2 authentication redirect."""
 
@@ -892,35 +1211,16 @@ class GithubAuthenticate(views.APIView):
             return Message.error(msg="State parameter is missing")
 
         try:
-            # Exchange code for access token
-            token_data: Dict[str, str] = {
-                "client_id": settings.GITHUB_CLIENT_ID,
-                "client_secret": settings.GITHUB_CLIENT_SECRET,
-                "code": code,
-                "redirect_uri": redirect_uri_builder("github"),
-            }
-
-            token_response = requests.post(
-                "https://github.com/login/oauth/access_token",
-                data=token_data,
-                headers={"Accept": "application/json"},
-                timeout=10  # Add timeout
-            )
-            token_response.raise_for_status()  # Raise exception for bad responses
+            client = oauth.get_client("github")
 
-            access_token: Optional[str] = token_response.json().get(
-                "access_token")
+            # Exchange code for access token
+            access_token: Optional[str] = client.exchange_code(
+                code, redirect_uri_builder("github"))
             if not access_token:
                 return Message.error(msg="Failed to obtain access token")
 
-            # Fetch user data from GitHub
-            user_response = requests.get(
-                "https://api.github.com/user",
-                headers={"Authorization": f"Bearer {access_token}"},
-                timeout=10
-            )
-            user_response.raise_for_status()
-            user_data: Dict[str, Any] = user_response.json()
+            # Fetch profile and primary email from GitHub
+            user_data: Dict[str, Any] = client.fetch_user(access_token)
 
             # Extract GitHub username
             github_username: str = user_data.get("login", "")
@@ -930,6 +1230,11 @@ class GithubAuthenticate(views.APIView):
             try:
                 # Check if user exists
                 user: models.User = User.objects.get(username=github_username)
+                refusal: Optional[response.Response] = refuse_oauth_sign_in(
+                    request, user, "github")
+                if refusal:
+                    return refusal
+                audit.record("oauth_github", request, user.username)
                 tokens: TokenDict = get_tokens_for_user(user)
                 return response.Response(tokens, status=status.HTTP_200_OK)
 
@@ -949,6 +1254,7 @@ class GithubAuthenticate(views.APIView):
                 user = User.objects.create_user(**user_info)
                 user.set_password(user_data.get("node_id", uuid.uuid4().hex))
                 user.save()
+                audit.record("oauth_github", request, user.username, created=True)
 
                 # Generate tokens
                 tokens: TokenDict = get_tokens_for_user(user)
@@ -1021,36 +1327,16 @@ class GoogleAuthenticate(views.APIView):
             return Message.error(msg="Authorization code not provided")
 
         try:
-            # Exchange code for access token
-            token_data: Dict[str, str] = {
-                "code": code,
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "redirect_uri": redirect_uri_builder("google"),
-                "grant_type": "authorization_code",
-            }
-
-            # Request access token
-            token_response = requests.post(
-                "https://oauth2.googleapis.com/token",
-                data=token_data,
-                timeout=10
-            )
-            token_response.raise_for_status()
+            client = oauth.get_client("google")
 
-            access_token: Optional[str] = token_response.json().get(
-                "access_token")
+            # Exchange code for access token
+            access_token: Optional[str] = client.exchange_code(
+                code, redirect_uri_builder("google"))
             if not access_token:
                 return Message.error(msg="Failed to obtain access token")
 
             # Fetch user data from Google
-            user_response = requests.get(
-                "https://www.googleapis.com/oauth2/v2/userinfo",
-                headers={"Authorization": f"Bearer {access_token}"},
-                timeout=10
-            )
-            user_response.raise_for_status()
-            user_data: Dict[str, Any] = user_response.json()
+            user_data: Dict[str, Any] = client.fetch_user(access_token)
 
             # Extract email (required field)
             google_email: Optional[str] = user_data.get("email")
@@ -1059,7 +1345,12 @@ class GoogleAuthenticate(views.APIView):
 
             try:
                 # Check if user exists
-                user: models.User = User.objects.get(email=google_email)
+                user: models.User = User.objects.by_email(google_email).get()
+                refusal: Optional[response.Response] = refuse_oauth_sign_in(
+                    request, user, "google")
+                if refusal:
+                    return refusal
+                audit.record("oauth_google", request, user.username)
                 tokens: TokenDict = get_tokens_for_user(user)
                 return response.Response(tokens, status=status.HTTP_200_OK)
 
@@ -1067,7 +1358,6 @@ class GoogleAuthenticate(views.APIView):
                 # Create new user
                 user_info: Dict[str, Any] = {
                     "email": google_email,
-                    "username": google_email.split("@")[0],
                     "first_name": user_data.get("given_name", ""),
                     "last_name": user_data.get("family_name", ""),
                     "image": user_data.get("picture"),
@@ -1075,10 +1365,11 @@ class GoogleAuthenticate(views.APIView):
                     "is_active": True,
                 }
 
-                # Create and save user
-                user = User.objects.create_user(**user_info)
+                # Create and save user with a username allocated from the email
+                user = User.objects.create_user_from_email(**user_info)
                 user.set_password(user_data.get("id", uuid.uuid4().hex))
                 user.save()
+                audit.record("oauth_google", request, user.username, created=True)
 
                 # Generate tokens
                 tokens: TokenDict = get_tokens_for_user(user)
@@ -1,5 +1,6 @@
 from django.contrib import admin  # Importing admin module to register models
-from .models import Course  # Importing the Course model for admin registration
+from .models import Course, Review  # Importing the course models for admin registration
+from .reviews import remove_review
 
 
 @admin.register(Course)
@@ -15,3 +16,30 @@ class CourseAdmin(admin.ModelAdmin):
         "price",  # Display the price of the course
         "duration",  # Display the duration of the course
     )
+    # Maintained by the course reviews; shown but never written from the form
+    readonly_fields: tuple[str, ...] = ("rating", "rating_sum", "rating_count")
+
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for course reviews.
+    Reviews are moderated by deletion only, which keeps the course ratings current.
+    """
+    list_display: tuple[str, ...] = ("course", "user", "rating", "created_at")
+    readonly_fields: tuple[str, ...] = ("course", "user", "rating", "comment", "created_at")
+    raw_id_fields: tuple[str, ...] = ("course", "user")
+
+    def has_add_permission(self, request) -> bool:
+        """Reviews are written by learners only."""
+        return False
+
+    def delete_model(self, request, obj: Review) -> None:
+        """Delete the review and uncount it."""
+        remove_review(obj)
+
+    def delete_queryset(self, request, queryset) -> None:
+        """Delete the selected reviews one by one so each is uncounted."""
+        for review in queryset:
+            remove_review(review)
@@ -0,0 +1,48 @@
+"""
+Management command to rebuild the course rating counters from the reviews table.
+"""
+
+from typing import List
+from django.core.management.base import BaseCommand
+from course.models import Course
+from course.reviews import recompute_ratings
+
+
+class Command(BaseCommand):
+    """
+    Recount every course's reviews in keyset-ordered batches, each locked
+    and corrected in its own short transaction.
+    """
+    help = "Recompute Course.rating, rating_sum and rating_count from the reviews."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Number of courses recounted per transaction.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the recompute.
+        """
+        batch_size: int = max(options["batch_size"], 1)
+        last_id: str = ""
+        checked: int = 0
+        fixed: int = 0
+
+        while True:
+            course_ids: List[str] = list(
+                Course.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not course_ids:
+                break
+            last_id = course_ids[-1]
+            checked += len(course_ids)
+            fixed += recompute_ratings(course_ids)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {checked} courses, corrected {fixed}."))
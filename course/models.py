@@ -51,7 +51,12 @@ class Course(models.Model):
         blank=True,
     )  # Supported languages for the course
 
-    rating: float = models.FloatField(default=0.0)  # Course rating
+    rating: float = models.FloatField(
+        default=0.0, editable=False)  # Average review rating, kept in step with the sum and count
+    rating_sum: int = models.IntegerField(
+        default=0, editable=False)  # Sum of all review ratings
+    rating_count: int = models.IntegerField(
+        default=0, editable=False)  # Number of reviews
     learners: int = models.IntegerField(
         default=0)  # Number of learners enrolled
 
@@ -116,6 +121,9 @@ class Course(models.Model):
         blank=True,
     )  # Requirements for taking the course
 
+    # Written only by course.reviews, with UPDATEs relative to the stored values
+    RATING_FIELDS: tuple[str, ...] = ("rating", "rating_sum", "rating_count")
+
     def __str__(self) -> str:
         """
         Returns the string representation of the course.
@@ -125,9 +133,16 @@ class Course(models.Model):
     def save(self, *args, **kwargs) -> None:
         """
         Overrides the save method to auto-generate a UUID for the course ID if not provided.
+        Updates never write the rating counters back, as the values loaded with
+        the instance may be stale by the time it is saved.
         """
         if not self.id:  # Check if the ID is not already set
             self.id = str(uuid.uuid4())  # Generate a new UUID
+        elif not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in self.RATING_FIELDS
+            ]
 
         try:
             # Call the parent save method
@@ -135,3 +150,56 @@ class Course(models.Model):
         except Exception as e:
             # Handle runtime errors
             raise RuntimeError(f"Error saving Course: {e}")
+
+
+class Review(models.Model):
+    """
+    A learner's review of a course they purchased, one per user and course.
+    Creating, editing and deleting reviews keeps the course's rating counters
+    current (see course.reviews).
+    """
+
+    # Primary key for the review, auto-generated as a UUID
+    id: str = models.CharField(
+        primary_key=True, unique=True, max_length=120, editable=False
+    )
+    course: Course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="reviews"
+    )  # Reviewed course
+    user: User = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="course_reviews"
+    )  # Author of the review
+    rating: int = models.IntegerField()  # Rating from 1 to 5
+    comment: str = models.TextField(
+        default="", blank=True
+    )  # Optional written review
+    created_at: models.DateTimeField = models.DateTimeField(
+        auto_now_add=True
+    )  # Auto-generated creation time
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "user"], name="unique_review_per_user_course"
+            ),
+        ]
+        indexes = [
+            # Serves the newest-first review listing of a course
+            models.Index(
+                fields=["course", "created_at"], name="review_course_created_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the review.
+        """
+        return f"{self.user_id} on {self.course_id}: {self.rating}"
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Overrides the save method to auto-generate a UUID for the review ID if not provided.
+        """
+        if not self.id:  # Check if the ID is not already set
+            self.id = str(uuid.uuid4())  # Generate a new UUID
+        super().save(*args, **kwargs)
@@ -0,0 +1,130 @@
+"""
+Course reviews and the rating counters they maintain.
+
+Each course stores the running sum and count of its review ratings, and
+`rating` is recomputed from them in the same UPDATE. The new values are
+computed by the database from the row's current ones, so concurrent reviews
+of a course never lose an update and the catalog never needs an AVG() over
+the reviews table. Every function runs inside the caller's transaction
+together with the review write it accounts for.
+"""
+
+from typing import List
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from authentication.models import Profile
+from .models import Course, Review
+
+
+def has_purchased(user, course_id: str) -> bool:
+    """
+    Whether the user owns the course, read from the purchased courses grants.
+    """
+    return Profile.purchased_courses.through.objects.filter(
+        profile__user=user, course_id=course_id).exists()
+
+
+def adjust_rating(course_id: str, sum_delta: int, count_delta: int) -> None:
+    """
+    Move a course's rating counters and average by the given deltas in one UPDATE.
+    """
+    new_sum = F("rating_sum") + sum_delta
+    new_count = F("rating_count") + count_delta
+    Course.objects.filter(id=course_id).update(
+        rating_sum=new_sum,
+        rating_count=new_count,
+        # SET expressions read the row's old values, so this is the new average
+        rating=Coalesce(
+            Cast(new_sum, FloatField()) / Cast(NullIf(new_count, 0), FloatField()),
+            Value(0.0),
+        ),
+    )
+
+
+def add_review(review: Review) -> Review:
+    """
+    Insert a review and count it.
+
+    Raises:
+        IntegrityError: If the user already reviewed the course
+    """
+    with transaction.atomic():
+        review.save(force_insert=True)
+        adjust_rating(review.course_id, review.rating, 1)
+    return review
+
+
+def update_review(review: Review, rating: int) -> Review:
+    """
+    Save an edited review and move the course's sum by the rating difference.
+    """
+    with transaction.atomic():
+        old_rating: int = (
+            Review.objects.select_for_update()
+            .values_list("rating", flat=True)
+            .get(id=review.id)
+        )
+        review.rating = rating
+        review.save(update_fields=["rating", "comment"])
+        adjust_rating(review.course_id, rating - old_rating, 0)
+    return review
+
+
+def remove_review(review: Review) -> None:
+    """
+    Delete a review and uncount the rating stored for it.
+
+    The instance's own rating may be stale (a concurrent edit, or an admin
+    queryset read earlier), so the row is locked and its rating read first.
+    """
+    with transaction.atomic():
+        stored = (
+            Review.objects.select_for_update()
+            .filter(id=review.id)
+            .values_list("course_id", "rating")
+            .first()
+        )
+        if stored is None:
+            return
+        course_id, rating = stored
+        Review.objects.filter(id=review.id).delete()
+        adjust_rating(course_id, -rating, -1)
+
+
+def recompute_ratings(course_ids: List[str]) -> int:
+    """
+    Rebuild the rating counters of the given courses from their reviews.
+
+    The course rows are locked before the reviews are counted, so a review
+    written meanwhile is either counted here or applies its delta afterwards.
+
+    Returns:
+        int: Number of courses whose counters were wrong
+    """
+    with transaction.atomic():
+        courses: List[Course] = list(
+            Course.objects.select_for_update()
+            .filter(id__in=course_ids)
+            .order_by("id")
+            .only("id", *Course.RATING_FIELDS)
+        )
+        totals: dict = {
+            row["course_id"]: (row["total"], row["reviews"])
+            for row in Review.objects.filter(course_id__in=course_ids)
+            .values("course_id")
+            .annotate(total=Sum("rating"), reviews=Count("id"))
+            .order_by()
+        }
+
+        fixed: int = 0
+        for course in courses:
+            rating_sum, rating_count = totals.get(course.id, (0, 0))
+            rating: float = rating_sum / rating_count if rating_count else 0.0
+            if (course.rating_sum, course.rating_count) == (rating_sum, rating_count) \
+                    and abs(course.rating - rating) < 1e-9:
+                continue
+            adjust_rating(
+                course.id, rating_sum - course.rating_sum, rating_count - course.rating_count)
+            fixed += 1
+    return fixed
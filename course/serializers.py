@@ -3,6 +3,7 @@ Serializers for the Course app.
 This module contains serializers for creating, updating, and retrieving course data.
 """
 
+from decimal import Decimal  # For price values
 from typing import Any, Dict, Optional  # For type hints
 # Import Profile model for user-related operations
 from authentication.models import Profile
@@ -29,6 +30,8 @@ class CreateCourseSerializer(BaseCourseSerializer):
 
     class Meta(BaseCourseSerializer.Meta):
         fields: str = "__all__"  # Include all fields from the Course model
+        # Maintained by the course reviews
+        read_only_fields: list[str] = ["rating", "rating_sum", "rating_count"]
 
     def create(self, validated_data: Dict[str, Any]) -> models.Course:
         """
@@ -136,9 +139,10 @@ class ListCoursesAdminDashboardSerializer(BaseCourseSerializer):
 class ListCoursesSerializer(BaseCourseSerializer):
     """
     Serializer for listing courses with limited details.
-    Includes custom field for enrolled status.
+    Includes custom fields for enrolled status and the final price.
     """
     enrolled: serializers.SerializerMethodField = serializers.SerializerMethodField()
+    final_price: serializers.SerializerMethodField = serializers.SerializerMethodField()
 
     class Meta(BaseCourseSerializer.Meta):
         exclude: list[str] = [
@@ -165,3 +169,35 @@ class ListCoursesSerializer(BaseCourseSerializer):
             return obj in profile.purchased_courses.all()  # Check if the course is purchased
         except Profile.DoesNotExist:
             return False  # Handle case where profile does not exist
+
+    def get_final_price(self, obj: models.Course) -> Optional[Decimal]:
+        """
+        Get the price after tax and offer, precomputed for the whole page.
+        """
+        prices: Dict[str, Any] = self.context.get("prices", {})
+        breakdown = prices.get(obj.id)
+        return breakdown.total if breakdown is not None else None
+
+
+class ReviewSerializer(serializers.ModelSerializer):
+    """
+    Serializer for course reviews.
+    The course and author are taken from the request, not the payload.
+    """
+    rating: serializers.IntegerField = serializers.IntegerField(
+        min_value=1, max_value=5)
+    name: serializers.SerializerMethodField = serializers.SerializerMethodField()
+    created_at: serializers.DateTimeField = serializers.DateTimeField(
+        format="%b %d %Y", read_only=True  # Format date for readability
+    )
+
+    class Meta:
+        model = models.Review
+        fields: list[str] = ["id", "user", "name", "rating", "comment", "created_at"]
+        read_only_fields: list[str] = ["id", "user"]
+
+    def get_name(self, obj: models.Review) -> str:
+        """
+        Get the full name of the reviewer.
+        """
+        return f"{obj.user.first_name} {obj.user.last_name}".strip()
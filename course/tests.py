@@ -1,3 +1,108 @@
+from io import BytesIO, StringIO
+import json
+import zipfile
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from authentication.export import stream_export
+from authentication.models import Profile, User
+from .models import Course, Review
+from . import reviews
 
-# Create your tests here.
+
+class CourseReviewTests(TestCase):
+    """Reviews are purchase-gated and keep the course's rating counters exact."""
+
+    def setUp(self) -> None:
+        self.jane = User.objects.create_user(username="jane", email="jane@example.com")
+        self.bob = User.objects.create_user(username="bob", email="bob@example.com")
+        self.course = Course.objects.create(name="Django", created_by=self.jane)
+        for user in (self.jane, self.bob):
+            Profile.objects.get(user=user).purchased_courses.add(self.course)
+
+    def client_for(self, user: User) -> APIClient:
+        """API client signed in as the given user."""
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def review_url(self) -> str:
+        """URL of the signed-in user's review of the course."""
+        return reverse("my-course-review", args=[self.course.id])
+
+    def assertCounters(self, rating_sum: int, rating_count: int) -> None:
+        """Check the stored counters and the average derived from them."""
+        course = Course.objects.get(id=self.course.id)
+        self.assertEqual((course.rating_sum, course.rating_count), (rating_sum, rating_count))
+        self.assertAlmostEqual(course.rating, rating_sum / rating_count if rating_count else 0.0)
+
+    def test_review_lifecycle_keeps_counters(self) -> None:
+        """Create, edit and delete move the sum, count and average."""
+        jane = self.client_for(self.jane)
+
+        self.assertEqual(jane.post(self.review_url(), {"rating": 4}, format="json").status_code, 201)
+        self.client_for(self.bob).post(self.review_url(), {"rating": 1}, format="json")
+        self.assertCounters(5, 2)
+
+        self.assertEqual(jane.patch(self.review_url(), {"rating": 2}, format="json").status_code, 200)
+        self.assertCounters(3, 2)
+
+        self.assertEqual(jane.delete(self.review_url()).status_code, 200)
+        self.assertCounters(1, 1)
+
+    def test_review_requires_purchase_and_is_unique(self) -> None:
+        """Only buyers may review, and only once."""
+        outsider = User.objects.create_user(username="eve", email="eve@example.com")
+        jane = self.client_for(self.jane)
+
+        self.assertEqual(
+            self.client_for(outsider).post(self.review_url(), {"rating": 5}, format="json").status_code,
+            406)
+        jane.post(self.review_url(), {"rating": 5}, format="json")
+        self.assertEqual(jane.post(self.review_url(), {"rating": 3}, format="json").status_code, 406)
+        self.assertCounters(5, 1)
+
+    def test_remove_uses_stored_rating(self) -> None:
+        """A stale instance uncounts the rating in the table, not its own."""
+        review = reviews.add_review(Review(course=self.course, user=self.jane, rating=5))
+        stale = Review.objects.get(id=review.id)
+        reviews.update_review(review, 2)
+
+        reviews.remove_review(stale)
+        reviews.remove_review(stale)
+
+        self.assertCounters(0, 0)
+
+    def test_stale_course_save_keeps_counters(self) -> None:
+        """Saving a course loaded before a review does not write old counters back."""
+        stale = Course.objects.get(id=self.course.id)
+        reviews.add_review(Review(course=self.course, user=self.bob, rating=5))
+
+        stale.name = "Django 5"
+        stale.save()
+
+        self.assertCounters(5, 1)
+        self.assertEqual(Course.objects.get(id=self.course.id).name, "Django 5")
+
+    def test_recompute_repairs_counters(self) -> None:
+        """The recompute command rebuilds the counters from the reviews."""
+        reviews.add_review(Review(course=self.course, user=self.jane, rating=4))
+        reviews.add_review(Review(course=self.course, user=self.bob, rating=5))
+        Course.objects.filter(id=self.course.id).update(rating_sum=2, rating_count=1, rating=2.0)
+
+        call_command("recompute_course_ratings", stdout=StringIO())
+
+        self.assertCounters(9, 2)
+
+    def test_reviews_are_exported(self) -> None:
+        """A user's personal data export lists their reviews."""
+        reviews.add_review(Review(course=self.course, user=self.jane, rating=4, comment="Clear"))
+
+        archive = zipfile.ZipFile(BytesIO(b"".join(stream_export("jane"))))
+        rows = [json.loads(line) for line in archive.read("reviews.jsonl").splitlines()]
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            {key: rows[0][key] for key in ("course_id", "course__name", "rating", "comment")},
+            {"course_id": self.course.id, "course__name": "Django", "rating": 4, "comment": "Clear"})
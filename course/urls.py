@@ -56,4 +56,16 @@ urlpatterns: list[path] = [
         views.StudySingleCourseView.as_view(),  # View for studying a course
         name="study-single-course",  # Name for reverse URL resolution
     ),
+    # URL for listing the reviews of a course
+    path(
+        "reviews/<str:course_id>/",
+        views.CourseReviewsView.as_view(),  # View for listing reviews
+        name="course-reviews",  # Name for reverse URL resolution
+    ),
+    # URL for the user's own review of a course
+    path(
+        "reviews/<str:course_id>/mine/",
+        views.MyCourseReviewView.as_view(),  # View for writing a review
+        name="my-course-review",  # Name for reverse URL resolution
+    ),
 ]
@@ -1,11 +1,13 @@
 from rest_framework import views, response, status, permissions
 from django.core.paginator import Paginator
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
-from . import serializers, models
+from . import serializers, models, reviews
 from authentication.models import Profile
 from server.decorators import catch_exception
 from server.message import Message
 from server.utils import pagination_next_url_builder
+from transactions.pricing import price_courses
 
 
 class CreateCourseView(views.APIView):
@@ -47,12 +49,18 @@ class ListCoursesView(views.APIView):
         paginator = Paginator(courses, 3)
         page = paginator.get_page(page_no)
 
+        # Price the whole page in one pass
+        page_courses: list = list(page)
+        prices = price_courses(page_courses)
+
         # Serialize data
         serializer = serializers.ListCoursesSerializer(
-            page,
+            page_courses,
             many=True,
             context={
-                "user": request.user if request.user.is_authenticated else None},
+                "user": request.user if request.user.is_authenticated else None,
+                "prices": prices,
+            },
         )
 
         # Prepare response data
@@ -197,7 +205,7 @@ class ToggleCourseStatusView(views.APIView):
 
         # Toggle status
         course.status = "published" if course.status == "draft" else "draft"
-        course.save()
+        course.save(update_fields=["status"])
 
         return Message.success("Course status updated successfully")
 
@@ -247,3 +255,104 @@ class DetailSingleCourseView(views.APIView):
         )
 
         return response.Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class CourseReviewsView(views.APIView):
+    """
+    API view to list the reviews of a course, newest first, with pagination.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    @catch_exception
+    def get(self, request: views.Request, course_id: str) -> response.Response:
+        """
+        Handle GET request to list a course's reviews.
+        """
+        page_no: int = int(request.GET.get("page", 1))
+        page_size: int = min(int(request.GET.get("page_size", 10)), 50)
+
+        # Served by the (course, created_at) index
+        course_reviews = (
+            models.Review.objects.filter(course_id=course_id)
+            .select_related("user")
+            .only("id", "user", "user__first_name", "user__last_name",
+                  "rating", "comment", "created_at")
+            .order_by("-created_at")
+        )
+        paginator = Paginator(course_reviews, page_size)
+        page = paginator.get_page(page_no)
+
+        # Serialize data
+        serializer = serializers.ReviewSerializer(page, many=True)
+
+        # Prepare response data
+        response_data = {
+            "results": serializer.data,
+            "count": paginator.count,
+            "next": pagination_next_url_builder(page, request.path),
+        }
+
+        return response.Response(response_data, status=status.HTTP_200_OK)
+
+
+class MyCourseReviewView(views.APIView):
+    """
+    API view for the signed-in user's own review of a course.
+    Only learners who purchased the course may review it, once.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_review(self, request: views.Request, course_id: str) -> models.Review:
+        """
+        Fetch the user's review of the course or raise 404.
+        """
+        return get_object_or_404(
+            models.Review, course_id=course_id, user=request.user)
+
+    @catch_exception
+    def post(self, request: views.Request, course_id: str) -> response.Response:
+        """
+        Handle POST request to review a purchased course.
+        """
+        course = get_object_or_404(models.Course.objects.only("id"), id=course_id)
+        if not reviews.has_purchased(request.user, course.id):
+            return Message.warn("You have not purchased this course")
+
+        serializer = serializers.ReviewSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Message.error(serializer.errors)
+
+        try:
+            review = reviews.add_review(models.Review(
+                course=course, user=request.user, **serializer.validated_data))
+        except IntegrityError:
+            return Message.warn("You have already reviewed this course")
+
+        return response.Response(
+            serializers.ReviewSerializer(review).data, status=status.HTTP_201_CREATED)
+
+    @catch_exception
+    def patch(self, request: views.Request, course_id: str) -> response.Response:
+        """
+        Handle PATCH request to edit the user's review.
+        """
+        review = self.get_review(request, course_id)
+        serializer = serializers.ReviewSerializer(
+            review, data=request.data, partial=True)
+        if not serializer.is_valid():
+            return Message.error(serializer.errors)
+
+        review.comment = serializer.validated_data.get("comment", review.comment)
+        reviews.update_review(
+            review, serializer.validated_data.get("rating", review.rating))
+
+        return response.Response(
+            serializers.ReviewSerializer(review).data, status=status.HTTP_200_OK)
+
+    @catch_exception
+    def delete(self, request: views.Request, course_id: str) -> response.Response:
+        """
+        Handle DELETE request to remove the user's review.
+        """
+        reviews.remove_review(self.get_review(request, course_id))
+        return Message.success("Review deleted successfully")
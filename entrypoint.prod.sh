@@ -14,5 +14,43 @@ python manage.py collectstatic --noinput
 # echo "Creating superuser..."
 # python manage.py createsuperuser --noinput
 
+# Keep a background command running, restarting it whenever it exits
+run_forever() {
+    while true; do
+        "$@" || echo "$* exited with status $?"
+        sleep 5
+    done
+}
+
+# Run the periodic purges every MAINTENANCE_INTERVAL_SECONDS (hourly by
+# default): expired verification codes, expired refresh sessions, and audit
+# events older than AUDIT_RETENTION_DAYS. Each deletes in bounded batches.
+run_maintenance() {
+    while true; do
+        python manage.py purge_expired_codes || echo "purge_expired_codes failed"
+        python manage.py purge_refresh_sessions || echo "purge_refresh_sessions failed"
+        python manage.py purge_audit_events || echo "purge_audit_events failed"
+        sleep "${MAINTENANCE_INTERVAL_SECONDS:-3600}"
+    done
+}
+
+# Background workers claim their rows with SKIP LOCKED, so several containers
+# may run them; set RUN_WORKERS=False to run only the web server here.
+# Export archives are written to DATA_EXPORT_ROOT, which every web container
+# serving downloads must share.
+if [ "${RUN_WORKERS:-True}" = "True" ]; then
+    echo "Starting background workers..."
+    run_forever python manage.py send_queued_emails --loop &
+    run_forever python manage.py process_account_deletions --loop &
+    run_forever python manage.py process_data_exports --loop &
+    run_maintenance &
+fi
+
 echo "Starting Gunicorn server..."
-exec gunicorn --bind 0.0.0.0:8000 server.wsgi:application
+# Threaded workers: a login waiting on the password hashing pool holds one
+# thread, not the whole process (see PASSWORD_HASH_* in server/settings.py)
+exec gunicorn --bind 0.0.0.0:8000 \
+    --worker-class gthread \
+    --workers "${GUNICORN_WORKERS:-2}" \
+    --threads "${GUNICORN_THREADS:-8}" \
+    server.wsgi:application
@@ -1,5 +1,5 @@
 from django.contrib import admin  # Importing Django admin module
-from .models import Feedback  # Importing the Feedback model
+from .models import Feedback, FeedbackRollup  # Importing the feedback models
 
 # Register your models here.
 
@@ -14,3 +14,14 @@ class FeedbackAdmin(admin.ModelAdmin):
     list_display: list[str] = ["user", "feedback", "rating", "created_at"]
 
     # Additional configurations or methods can be added here if needed
+
+
+@admin.register(FeedbackRollup)
+class FeedbackRollupAdmin(admin.ModelAdmin):
+    """
+    Admin class for inspecting the weekly feedback rollups.
+    """
+
+    # List of fields to display in the admin panel
+    list_display: list[str] = ["week", "rating", "count"]
+    ordering: list[str] = ["-week", "rating"]
@@ -0,0 +1,41 @@
+"""
+Management command to rebuild the FeedbackRollup table from feedback history.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncWeek
+from feedback.models import Feedback, FeedbackRollup
+
+
+class Command(BaseCommand):
+    """
+    Aggregate every feedback into weekly per-rating rollups in one GROUP BY
+    pass, and swap the rollup rows in a single transaction.
+    """
+    help = "Recompute the weekly feedback rating rollups from scratch."
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the recompute.
+        """
+        grouped = (
+            Feedback.objects.annotate(week=TruncWeek("created_at"))
+            .values("week", "rating")
+            .annotate(total=Count("id"))
+            .order_by()
+        )
+
+        rollups: list[FeedbackRollup] = [
+            FeedbackRollup(week=row["week"], rating=row["rating"], count=row["total"])
+            for row in grouped
+        ]
+
+        with transaction.atomic():
+            FeedbackRollup.objects.all().delete()
+            FeedbackRollup.objects.bulk_create(rollups)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {len(rollups)} rollup rows from "
+            f"{sum(rollup.count for rollup in rollups)} feedbacks."))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedbackRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField(help_text='Monday of the week the feedback was created')),
+                ('rating', models.IntegerField(help_text='Rating from 0 to 5')),
+                ('count', models.IntegerField(default=0, help_text='Number of feedbacks with this rating in the week')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('week', 'rating'), name='unique_feedback_rollup_per_week')],
+            },
+        ),
+    ]
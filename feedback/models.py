@@ -67,3 +67,34 @@ class Feedback(models.Model):
         except Exception as e:
             # Log or handle the exception as needed
             raise RuntimeError(f"An error occurred while saving Feedback: {e}")
+
+
+class FeedbackRollup(models.Model):
+    """
+    Weekly feedback counters per rating.
+    Maintained incrementally as feedback is created and deleted, and rebuilt
+    from history by the `recompute_feedback_rollups` management command.
+    """
+    week: str = models.DateField(
+        help_text="Monday of the week the feedback was created"  # Adds clarity
+    )
+    rating: int = models.IntegerField(
+        help_text="Rating from 0 to 5"  # Adds clarity
+    )
+    count: int = models.IntegerField(
+        default=0,
+        help_text="Number of feedbacks with this rating in the week"  # Adds clarity
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["week", "rating"], name="unique_feedback_rollup_per_week"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the rollup row.
+        """
+        return f"{self.week} rating {self.rating}: {self.count}"
@@ -0,0 +1,54 @@
+"""
+Incremental maintenance of the FeedbackRollup table.
+
+Counters are bumped with F() expressions so concurrent submissions in the
+same week never lose updates. Callers pass the feedbacks that were created
+or deleted, inside the transaction that wrote them, and the deltas are
+grouped per (week, rating) before touching the database.
+"""
+
+from collections import Counter
+from datetime import date, timedelta
+from typing import Iterable, Tuple
+from django.db import transaction
+from django.db.models import F
+from .models import Feedback, FeedbackRollup
+
+# Key identifying a single rollup row
+RollupKey = Tuple[date, int]
+
+
+def week_of(day: date) -> date:
+    """
+    Return the Monday starting the week of `day`.
+    """
+    return day - timedelta(days=day.weekday())
+
+
+def _apply(feedbacks: Iterable[Feedback], sign: int) -> None:
+    """
+    Add `sign` per feedback to the matching rollup rows, creating rows as needed.
+    """
+    increments: Counter = Counter(
+        (week_of(feedback.created_at), feedback.rating) for feedback in feedbacks)
+
+    with transaction.atomic():
+        for (week, rating), count in increments.items():
+            # Make sure the row exists before incrementing it
+            FeedbackRollup.objects.get_or_create(week=week, rating=rating)
+            FeedbackRollup.objects.filter(week=week, rating=rating).update(
+                count=F("count") + sign * count)
+
+
+def record_created(feedbacks: Iterable[Feedback]) -> None:
+    """
+    Count newly created feedbacks.
+    """
+    _apply(feedbacks, 1)
+
+
+def record_deleted(feedbacks: Iterable[Feedback]) -> None:
+    """
+    Uncount deleted feedbacks.
+    """
+    _apply(feedbacks, -1)
@@ -8,4 +8,6 @@ urlpatterns: list[path] = [
     path("list/", views.ListFeedback.as_view()),  # URL for listing feedback
     # URL for deleting feedback by ID
     path("delete/<str:id>/", views.DeleteFeedback.as_view()),
+    # URL for the rating statistics read from the rollups
+    path("stats/", views.FeedbackStatsView.as_view()),
 ]
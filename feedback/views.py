@@ -1,9 +1,14 @@
+from datetime import date, timedelta
 from rest_framework import views, response, status, permissions
 from django.core.paginator import Paginator, Page
 from django.shortcuts import get_object_or_404
-from . import serializers, models
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+from . import serializers, models, rollups
 from server.decorators import catch_exception
 from server.message import Message
+from server.permissions import IsSuperUser
 from server.utils import pagination_next_url_builder
 
 
@@ -26,8 +31,10 @@ class CreateFeedback(views.APIView):
         )
         # Validate the serialized data
         serializer.is_valid(raise_exception=True)
-        # Save the feedback instance
-        serializer.save()
+        # Save the feedback instance and count it in the same transaction
+        with transaction.atomic():
+            feedback: models.Feedback = serializer.save()
+            rollups.record_created([feedback])
 
         # Return success message
         return Message.success("Your feedback has been recorded.")
@@ -97,8 +104,71 @@ class DeleteFeedback(views.APIView):
         # Fetch the feedback object or return 404 if not found
         feedback: models.Feedback = get_object_or_404(models.Feedback, id=id)
 
-        # Delete the feedback instance
-        feedback.delete()
+        # Delete the feedback instance and uncount it in the same transaction
+        with transaction.atomic():
+            feedback.delete()
+            rollups.record_deleted([feedback])
 
         # Return success message
         return Message.success("Feedback deleted successfully.")
+
+
+class FeedbackStatsView(views.APIView):
+    """
+    View to report the average rating, the rating histogram and weekly trends.
+    Reads only the precomputed feedback rollups. Only accessible by superusers.
+    """
+    permission_classes = [IsSuperUser]
+
+    @staticmethod
+    def summarise(count: int, rating_sum: int) -> dict:
+        """
+        Build the count and average of a group of rollup rows.
+        """
+        return {
+            "count": count,
+            "average": round(rating_sum / count, 2) if count else None,
+        }
+
+    @catch_exception
+    def get(self, request) -> response.Response:
+        """
+        Retrieve all-time figures and weekly trends for a date range.
+        """
+        # Extract the date range of the weekly series (defaults to the last 12 weeks)
+        end: date = date.fromisoformat(
+            request.GET.get("end", timezone.localdate().isoformat()))
+        start: date = date.fromisoformat(
+            request.GET.get("start", (end - timedelta(weeks=11)).isoformat()))
+
+        # A handful of rows per week: one per rating given that week
+        counters = models.FeedbackRollup.objects.filter(count__gt=0)
+        totals: dict = {"total": Sum("count"), "rating_sum": Sum(F("count") * F("rating"))}
+
+        # Histogram of every rating from 0 to 5, including unused ones
+        histogram: dict = dict.fromkeys(range(6), 0)
+        for row in counters.values("rating").annotate(total=Sum("count")).order_by():
+            histogram[row["rating"]] = row["total"]
+
+        overall: dict = counters.aggregate(**totals)
+
+        # Weekly series over the selected range
+        weekly: list[dict] = [
+            {"week": row["week"], **self.summarise(row["total"], row["rating_sum"])}
+            for row in counters.filter(
+                week__range=(rollups.week_of(start), rollups.week_of(end)))
+            .values("week")
+            .annotate(**totals)
+            .order_by("week")
+        ]
+
+        # Prepare the response data
+        response_data: dict = {
+            "summary": self.summarise(overall["total"] or 0, overall["rating_sum"] or 0),
+            "histogram": histogram,
+            "start": start,
+            "end": end,
+            "weekly": weekly,
+        }
+
+        return response.Response(response_data, status=status.HTTP_200_OK)
@@ -0,0 +1,19 @@
+"""
+Permissions shared by the apps' API views.
+
+User.is_staff defaults to True, so DRF's IsAdminUser lets every account
+through; views exposing other users' data check is_superuser instead.
+"""
+
+from rest_framework.permissions import BasePermission
+from rest_framework.request import Request
+
+
+class IsSuperUser(BasePermission):
+    """
+    Allows access only to authenticated superusers.
+    """
+
+    def has_permission(self, request: Request, view: object) -> bool:
+        user = request.user
+        return bool(user and user.is_authenticated and user.is_superuser)
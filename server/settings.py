@@ -9,6 +9,7 @@ email setup, and third-party integrations.
 from datetime import timedelta
 from pathlib import Path
 import os
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 from dotenv import load_dotenv
 
@@ -45,6 +46,7 @@ INSTALLED_APPS: list[str] = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Custom apps
     "authentication",
     "course",
@@ -98,22 +100,45 @@ DATABASES: dict[str, dict[str, str]] = {
 
 # Template configuration
 TEMPLATE_DIRS: list[Path] = [BASE_DIR / "templates"]
+TEMPLATE_OPTIONS: dict = {
+    "context_processors": [
+        "django.template.context_processors.debug",
+        "django.template.context_processors.request",
+        "django.contrib.auth.context_processors.auth",
+        "django.contrib.messages.context_processors.messages",
+    ],
+}
+if not DEVELOPMENT:
+    # Compile each template once per process instead of on every render
+    TEMPLATE_OPTIONS["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
 TEMPLATES: list[dict] = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": TEMPLATE_DIRS,
-        "APP_DIRS": True,
-        "OPTIONS": {
-            "context_processors": [
-                "django.template.context_processors.debug",
-                "django.template.context_processors.request",
-                "django.contrib.auth.context_processors.auth",
-                "django.contrib.messages.context_processors.messages",
-            ],
-        },
+        # APP_DIRS cannot be combined with explicit loaders
+        "APP_DIRS": DEVELOPMENT,
+        "OPTIONS": TEMPLATE_OPTIONS,
     },
 ]
 
+# Cache configuration (local memory by default, point at a shared backend in production)
+CACHES: dict[str, dict[str, str]] = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
 # Custom user model
 AUTH_USER_MODEL: str = "authentication.User"
 
@@ -144,10 +169,25 @@ DEFAULT_AUTO_FIELD: str = "django.db.models.BigAutoField"
 # Django REST Framework configuration
 REST_FRAMEWORK: dict = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    )
+        "authentication.backends.ClaimsJWTAuthentication",
+    ),
+    # Only views that set `throttle_scope` are rate limited
+    "DEFAULT_THROTTLE_CLASSES": (
+        "server.throttling.SlidingWindowThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.getenv("THROTTLE_RATE_LOGIN", "10/min"),
+        "otp": os.getenv("THROTTLE_RATE_OTP", "5/min"),
+        "activation": os.getenv("THROTTLE_RATE_ACTIVATION", "5/min"),
+        "email_check": os.getenv("THROTTLE_RATE_EMAIL_CHECK", "30/min"),
+        "coupon": os.getenv("THROTTLE_RATE_COUPON", "20/min"),
+        "data_export": os.getenv("THROTTLE_RATE_DATA_EXPORT", "5/hour"),
+    },
 }
 
+# Cache alias holding the rate limit counters; must be shared by all workers
+THROTTLE_CACHE: str = os.getenv("THROTTLE_CACHE", "default")
+
 # Cors configuration
 CORS_ALLOW_ALL_ORIGINS: bool = DEVELOPMENT
 CORS_ALLOWED_ORIGINS: list[str] = os.getenv(
@@ -156,8 +196,38 @@ CORS_ALLOWED_ORIGINS: list[str] = os.getenv(
 # Authentication configuration
 AUTH_CONFIG: dict = {"LOGIN_FIELD": "username"}
 
+# Password hashing: PASSWORD_HASHER picks the algorithm for new passwords;
+# the others stay listed so existing hashes verify and are upgraded on login
+PASSWORD_HASHER_CHOICES: dict[str, str] = {
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "scrypt": "django.contrib.auth.hashers.ScryptPasswordHasher",
+}
+PASSWORD_HASHER: str = os.getenv("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS: list[str] = [PASSWORD_HASHER_CHOICES[PASSWORD_HASHER]] + [
+    hasher for name, hasher in PASSWORD_HASHER_CHOICES.items()
+    if name != PASSWORD_HASHER
+] + ["django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher"]
+
+# Gunicorn runs GUNICORN_WORKERS processes of GUNICORN_THREADS request threads
+# each (gthread worker class, see entrypoint.prod.sh)
+GUNICORN_WORKERS: int = int(os.getenv("GUNICORN_WORKERS", "2"))
+GUNICORN_THREADS: int = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# Password verification runs on a bounded per-process pool: the hashing
+# threads share the cores between the processes, and at most half of the
+# request threads may wait on a hash, so a login storm leaves the others free
+PASSWORD_HASH_WORKERS: int = int(os.getenv(
+    "PASSWORD_HASH_WORKERS",
+    str(max((os.cpu_count() or 1) // max(GUNICORN_WORKERS, 1), 1))))
+PASSWORD_HASH_MAX_PENDING: int = int(os.getenv(
+    "PASSWORD_HASH_MAX_PENDING", str(max(GUNICORN_THREADS // 2, 1))))
+PASSWORD_HASH_TIMEOUT_SECONDS: float = float(
+    os.getenv("PASSWORD_HASH_TIMEOUT_SECONDS", "10"))
+
 # Email setup
-EMAIL_BACKEND: str = "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_BACKEND: str = os.getenv(
+    "EMAIL_BACKEND", "django.core.mail.backends.smtp.EmailBackend")
+EMAIL_FILE_PATH: str = os.getenv("EMAIL_FILE_PATH", str(BASE_DIR / "sent_emails"))
 EMAIL_HOST: str = "smtp.gmail.com"
 EMAIL_USE_TLS: bool = True
 EMAIL_PORT: int = 587
@@ -165,6 +235,13 @@ EMAIL_HOST_USER: str = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD: str = os.getenv("EMAIL_HOST_PASSWORD", "")
 COMPANY_NAME: str = "CourseHunt"
 
+# Outbound email queue (delivered by the send_queued_emails worker, which
+# entrypoint.prod.sh runs next to gunicorn)
+EMAIL_USE_QUEUE: bool = os.getenv("EMAIL_USE_QUEUE", "True") == "True"
+EMAIL_QUEUE_MAX_ATTEMPTS: int = 5
+EMAIL_QUEUE_RETRY_SECONDS: int = 60  # Doubled after every failed attempt
+EMAIL_QUEUE_LEASE_SECONDS: int = 300  # Claimed emails are retried after this
+
 # Process configuration
 SEND_ACTIVATION_EMAIL: bool = True
 SEND_RESET_PASSWORD_CONFIRMATION_EMAIL: bool = True
@@ -184,6 +261,36 @@ SIMPLE_JWT: dict = {
     "USER_ID_CLAIM": "username",
 }
 
+# Seconds user claims stay cached for token refresh
+CLAIMS_CACHE_TIMEOUT: int = int(os.getenv("CLAIMS_CACHE_TIMEOUT", "300"))
+
+# Cache alias holding the claims versions; must be shared by all workers
+CLAIMS_CACHE: str = os.getenv("CLAIMS_CACHE", "default")
+
+# Seconds a worker trusts its cached revocation lookup of a user
+JWT_REVOCATION_REFRESH_SECONDS: int = int(
+    os.getenv("JWT_REVOCATION_REFRESH_SECONDS", "30"))
+
+# Cache alias holding the access token revocation list; must be shared by all workers
+REVOCATION_CACHE: str = os.getenv("REVOCATION_CACHE", "default")
+
+# Cache backends private to each worker process
+WORKER_LOCAL_CACHE_BACKENDS: tuple[str, ...] = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# Cache aliases whose entries every worker must see
+SHARED_CACHE_ALIASES: list[str] = [THROTTLE_CACHE, CLAIMS_CACHE, REVOCATION_CACHE]
+if not DEVELOPMENT:
+    for alias in SHARED_CACHE_ALIASES:
+        backend = CACHES.get(alias, {}).get("BACKEND")
+        if backend is None or backend in WORKER_LOCAL_CACHE_BACKENDS:
+            raise ImproperlyConfigured(
+                f"The '{alias}' cache must be shared by all workers; point "
+                "CACHE_BACKEND and CACHE_LOCATION at Redis or Memcached."
+            )
+
 # Frontend and backend URLs
 BASE_APP_URL: str = os.getenv("BASE_APP_URL", "")
 BASE_API_URL: str = os.getenv("BASE_API_URL", "")
@@ -198,6 +305,47 @@ GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
 GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
 GOOGLE_REDIRECT_URI: str = os.getenv("GOOGLE_REDIRECT_URI", "")
 
+# OAuth provider clients (authentication.oauth.StubOAuthClient for offline runs)
+OAUTH_CLIENTS: dict[str, str] = {
+    "github": os.getenv("OAUTH_GITHUB_CLIENT", "authentication.oauth.GithubClient"),
+    "google": os.getenv("OAUTH_GOOGLE_CLIENT", "authentication.oauth.GoogleClient"),
+}
+OAUTH_POOL_SIZE: int = int(os.getenv("OAUTH_POOL_SIZE", "10"))  # Connections kept per provider
+OAUTH_RETRIES: int = int(os.getenv("OAUTH_RETRIES", "2"))
+OAUTH_CONNECT_TIMEOUT: float = 3.05
+OAUTH_READ_TIMEOUT: float = 10.0
+
+# Users handled per transaction by the admin bulk user endpoint
+BULK_USER_BATCH_SIZE: int = int(os.getenv("BULK_USER_BATCH_SIZE", "1000"))
+
+# Audit log: events are buffered in-process and written in batches
+AUDIT_BUFFERED: bool = os.getenv("AUDIT_BUFFERED", "True") == "True"
+AUDIT_FLUSH_EVENTS: int = int(os.getenv("AUDIT_FLUSH_EVENTS", "100"))
+AUDIT_FLUSH_INTERVAL_MS: int = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "500"))
+AUDIT_BUFFER_MAX: int = 10000  # Oldest events are dropped beyond this
+AUDIT_RETENTION_DAYS: int = int(os.getenv("AUDIT_RETENTION_DAYS", "90"))
+
+# Personal data exports: small ones stream straight to the client, larger
+# ones are written by the process_data_exports worker and downloaded later
+DATA_EXPORT_INLINE_MAX_ROWS: int = int(os.getenv("DATA_EXPORT_INLINE_MAX_ROWS", "5000"))
+DATA_EXPORT_CHUNK_SIZE: int = 2000  # Rows fetched per server-side cursor round trip
+DATA_EXPORT_ROOT: str = os.getenv("DATA_EXPORT_ROOT", str(BASE_DIR / "exports"))
+DATA_EXPORT_TTL_HOURS: int = int(os.getenv("DATA_EXPORT_TTL_HOURS", "72"))
+# Running jobs not finished after this are taken over by another worker
+DATA_EXPORT_TIMEOUT_MINUTES: int = int(os.getenv("DATA_EXPORT_TIMEOUT_MINUTES", "60"))
+DATA_EXPORT_MAX_ATTEMPTS: int = 3
+
 # Razorpay configuration
 RAZORPAY_API_KEY: str = os.getenv("RAZORPAY_API_KEY", "")
 RAZORPAY_SECRET_KEY: str = os.getenv("RAZORPAY_SECRET_KEY", "")
+
+# Gateway used by background payment jobs (transactions.gateway.FakeGateway for local runs)
+PAYMENT_GATEWAY: str = os.getenv(
+    "PAYMENT_GATEWAY", "transactions.gateway.RazorpayGateway")
+
+# Seconds a course's price breakdown stays cached
+PRICING_CACHE_TIMEOUT: int = 60 * 60
+
+# Unpaid purchases older than this many days are removed by reap_unpaid_purchases
+UNPAID_PURCHASE_MAX_AGE_DAYS: int = int(
+    os.getenv("UNPAID_PURCHASE_MAX_AGE_DAYS", "2"))
@@ -0,0 +1,118 @@
+"""
+Sliding-window rate limiting for abuse-prone endpoints.
+
+Each view names a throttle scope and the request attributes it is keyed on:
+"ip", "user", or any request body field such as "email". Every key gets two
+fixed-size counters in the shared cache (the current and the previous
+window), and the previous one is weighted by how much of it still overlaps
+the sliding window. Checking a request costs a couple of cache round trips
+and no database work, and it runs in APIView.initial(), before the handler.
+"""
+
+from typing import List, Optional, Tuple
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+# Seconds per unit of rate strings, keyed by the unit's first letter
+RATE_PERIODS: dict[str, int] = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate: str) -> Tuple[int, int]:
+    """
+    Parse a rate such as "5/min" or "100/hour" into (requests, window seconds).
+    """
+    num, period = rate.split("/")
+    return int(num), RATE_PERIODS[period[0]]
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Per-view sliding-window throttle.
+
+    Views opt in with `throttle_scope` (a key of DEFAULT_THROTTLE_RATES) and
+    `throttle_keys` (defaults to ("ip",)). A request is rejected when any of
+    its keys is over the limit. Rejected requests are counted too, so a
+    client that keeps hammering the endpoint stays blocked.
+    """
+
+    cache = caches[settings.THROTTLE_CACHE]
+
+    def __init__(self) -> None:
+        self.retry_after: Optional[float] = None
+
+    def get_idents(self, request: Request, view) -> List[str]:
+        """
+        Collect the identifiers the view is keyed on, skipping missing ones.
+        """
+        idents: List[str] = []
+        for key in getattr(view, "throttle_keys", ("ip",)):
+            if key == "ip":
+                value = self.get_ident(request)
+            elif key == "user":
+                value = request.user.pk if request.user.is_authenticated else None
+            else:
+                value = request.data.get(key) if hasattr(request.data, "get") else None
+                value = str(value).strip().lower() if value else None
+            if value:
+                idents.append(f"{key}:{value}")
+        return idents
+
+    def allow_request(self, request: Request, view) -> bool:
+        """
+        Count the request against each key and reject it if any is over the limit.
+        """
+        scope: Optional[str] = getattr(view, "throttle_scope", None)
+        rate: Optional[str] = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        if rate is None:
+            return True
+        limit, window = parse_rate(rate)
+
+        now: float = time.time()
+        current: int = int(now // window)
+        # Share of the previous window still inside the sliding window
+        elapsed: float = now - current * window
+        weight: float = 1 - elapsed / window
+
+        prefix: str = f"throttle:{scope}"
+        idents: List[str] = self.get_idents(request, view)
+        previous_counts: dict = self.cache.get_many(
+            [f"{prefix}:{ident}:{current - 1}" for ident in idents])
+
+        for ident in idents:
+            key: str = f"{prefix}:{ident}:{current}"
+            # Create the counter so incr() is atomic on shared backends
+            self.cache.add(key, 0, timeout=window * 2)
+            try:
+                count: int = self.cache.incr(key)
+            except ValueError:
+                # The counter was evicted between add() and incr()
+                self.cache.set(key, 1, timeout=window * 2)
+                count = 1
+            previous: int = previous_counts.get(f"{prefix}:{ident}:{current - 1}", 0)
+
+            if previous * weight + count > limit:
+                self.retry_after = self._retry_after(limit, window, elapsed, count, previous)
+                return False
+
+        return True
+
+    @staticmethod
+    def _retry_after(limit: int, window: int, elapsed: float, count: int, previous: int) -> float:
+        """
+        Seconds until the weighted count drops back to the limit.
+        """
+        if count >= limit or not previous:
+            # Only the start of the next window frees capacity
+            return window - elapsed
+        # Wait until previous * (1 - t / window) + count <= limit
+        return max(window * (1 - (limit - count) / previous) - elapsed, 0)
+
+    def wait(self) -> Optional[float]:
+        """
+        Seconds the client should wait, sent as the Retry-After header.
+        """
+        return self.retry_after
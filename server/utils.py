@@ -1,7 +1,12 @@
 from django.conf import settings  # Import Django settings for configuration
 # Import Literal for type hints and Optional for nullable types
-from typing import Literal, Optional
+from typing import Any, Iterable, Iterator, Literal, Optional, Sequence
 from django.core.paginator import Page  # Import Page for pagination handling
+from django.http import QueryDict  # Import QueryDict for query string handling
+# Import the JSON encoder that understands dates and decimals
+from django.core.serializers.json import DjangoJSONEncoder
+import csv  # Import csv for streaming CSV rows
+import json  # Import json for streaming JSON Lines rows
 
 # Base API URL fetched from Django settings
 BASE_API_URL: str = settings.BASE_API_URL
@@ -27,6 +32,25 @@ def pagination_next_url_builder(page: Page, url: str) -> Optional[str]:
     return None  # Return None if no next page exists
 
 
+def keyset_next_url_builder(url: str, query: QueryDict, last_key: Optional[str]) -> Optional[str]:
+    """
+    Builds the next page URL for keyset pagination, keeping the current filters.
+
+    Args:
+        url (str): The base URL of the listing.
+        query (QueryDict): The query parameters of the current request.
+        last_key (Optional[str]): Sort key of the last row on the page, or None if it was the last page.
+
+    Returns:
+        Optional[str]: The next page URL if a next page exists, otherwise None.
+    """
+    if last_key is None:
+        return None
+    params: QueryDict = query.copy()  # Copy to make the parameters mutable
+    params["after"] = last_key  # Continue after the last row returned
+    return f"{BASE_API_URL}{url}?{params.urlencode()}"
+
+
 def redirect_uri_builder(purpose: Literal["github", "google"]) -> str:
     """
     Builds the redirect URI for OAuth purposes based on the provider.
@@ -52,3 +76,48 @@ def redirect_uri_builder(purpose: Literal["github", "google"]) -> str:
     else:
         # Raise error for invalid input
         raise ValueError("Invalid purpose provided. Use 'github' or 'google'.")
+
+
+class EchoBuffer:
+    """
+    File-like object that returns what is written instead of storing it.
+    Lets csv.writer format one row at a time for a streaming response.
+    """
+
+    def write(self, value: str) -> str:
+        """
+        Return the written value unchanged.
+        """
+        return value
+
+
+def stream_csv(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """
+    Lazily format rows as CSV lines, starting with a header line.
+
+    Args:
+        header (Sequence[str]): Column names written as the first line.
+        rows (Iterable[Sequence[Any]]): Row values, consumed one at a time.
+
+    Returns:
+        Iterator[str]: CSV formatted lines.
+    """
+    writer = csv.writer(EchoBuffer())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_jsonl(header: Sequence[str], rows: Iterable[Sequence[Any]]) -> Iterator[str]:
+    """
+    Lazily format rows as JSON Lines, one object per row keyed by the header.
+
+    Args:
+        header (Sequence[str]): Keys of each JSON object.
+        rows (Iterable[Sequence[Any]]): Row values, consumed one at a time.
+
+    Returns:
+        Iterator[str]: JSON formatted lines.
+    """
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + "\n"
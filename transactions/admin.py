@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Purchase, CouponCode  # Import only required models
+from .models import Purchase, CouponCode, SalesRollup, AbandonedPurchase  # Import only required models
 
 
 @admin.register(Purchase)
@@ -33,3 +33,37 @@ class CouponCodeAdmin(admin.ModelAdmin):
         "is_unlimited",  # Whether the coupon has unlimited usage
         "is_active",     # Whether the coupon is currently active
     )
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the SalesRollup model.
+    Displays relevant fields in the admin panel.
+    """
+    # Fields to display in the admin list view
+    list_display: tuple[str, ...] = (
+        "date",           # Day the purchases were created
+        "course",         # Course the counters belong to
+        "orders",         # Checkouts initiated
+        "paid_orders",    # Checkouts paid
+        "revenue",        # Revenue from paid checkouts
+        "coupon_orders",  # Paid checkouts that used a coupon
+    )
+    list_filter: tuple[str, ...] = ("date",)
+
+
+@admin.register(AbandonedPurchase)
+class AbandonedPurchaseAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the AbandonedPurchase model.
+    Displays relevant fields in the admin panel.
+    """
+    # Fields to display in the admin list view
+    list_display: tuple[str, ...] = (
+        "course_id",    # Course the checkout was for
+        "user_id",      # User who abandoned the checkout
+        "amount",       # Amount of the abandoned order
+        "created_at",   # Day the checkout was initiated
+        "archived_at",  # When the reaper archived it
+    )
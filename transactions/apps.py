@@ -11,3 +11,9 @@ class TransactionsConfig(AppConfig):
 
     # Defining the name of the application
     name = 'transactions'
+
+    def ready(self) -> None:
+        """
+        Register the app's signal handlers.
+        """
+        from . import signals  # noqa: F401
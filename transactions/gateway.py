@@ -0,0 +1,73 @@
+"""
+Payment gateway clients used outside the request cycle.
+
+Jobs talk to the gateway through a small interface (`fetch_payment`) so they
+can run against Razorpay in production and against FakeGateway locally.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+import time
+from django.conf import settings
+from django.utils.module_loading import import_string
+import razorpay
+
+
+@dataclass(frozen=True)
+class PaymentStatus:
+    """
+    Payment state of a single gateway order.
+    """
+    order_id: str
+    paid: bool
+    payment_id: Optional[str] = None
+
+
+class RazorpayGateway:
+    """
+    Looks up order payments through the Razorpay API.
+    """
+
+    def __init__(self, client: Optional[razorpay.Client] = None) -> None:
+        self.client = client or razorpay.Client(
+            auth=(settings.RAZORPAY_API_KEY, settings.RAZORPAY_SECRET_KEY))
+
+    def fetch_payment(self, order_id: str) -> PaymentStatus:
+        """
+        Return whether any payment against the order was captured.
+        """
+        payments: dict = self.client.order.payments(order_id)
+        for payment in payments.get("items", []):
+            if payment.get("status") == "captured":
+                return PaymentStatus(order_id=order_id, paid=True, payment_id=payment["id"])
+        return PaymentStatus(order_id=order_id, paid=False)
+
+
+class FakeGateway:
+    """
+    In-memory gateway for local runs and tests.
+
+    Args:
+        paid_orders: Mapping of order ID to the payment ID that captured it.
+        latency: Seconds each lookup sleeps, to mimic network round trips.
+    """
+
+    def __init__(self, paid_orders: Optional[Dict[str, str]] = None, latency: float = 0.0) -> None:
+        self.paid_orders: Dict[str, str] = dict(paid_orders or {})
+        self.latency: float = latency
+
+    def fetch_payment(self, order_id: str) -> PaymentStatus:
+        """
+        Return the configured payment state of the order.
+        """
+        if self.latency:
+            time.sleep(self.latency)
+        payment_id: Optional[str] = self.paid_orders.get(order_id)
+        return PaymentStatus(order_id=order_id, paid=payment_id is not None, payment_id=payment_id)
+
+
+def get_gateway(path: Optional[str] = None):
+    """
+    Instantiate the gateway class configured in PAYMENT_GATEWAY (or the given dotted path).
+    """
+    return import_string(path or settings.PAYMENT_GATEWAY)()
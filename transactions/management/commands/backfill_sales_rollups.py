@@ -0,0 +1,93 @@
+"""
+Management command to rebuild the SalesRollup table from purchase history.
+"""
+
+from datetime import date, timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Min, Max, Q, Sum
+from transactions.models import Purchase, SalesRollup
+
+
+class Command(BaseCommand):
+    """
+    Aggregate purchases into daily per-course rollups.
+    History is processed in date windows so each GROUP BY pass, and the
+    transaction replacing its rollup rows, stays small.
+    """
+    help = "Rebuild sales rollups from purchase history in chunked passes."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--start", type=date.fromisoformat,
+            help="First day to rebuild (YYYY-MM-DD). Defaults to the oldest purchase.")
+        parser.add_argument(
+            "--end", type=date.fromisoformat,
+            help="Last day to rebuild (YYYY-MM-DD). Defaults to the newest purchase.")
+        parser.add_argument(
+            "--chunk-days", type=int, default=31,
+            help="Number of days aggregated per pass.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the backfill.
+        """
+        bounds: dict = Purchase.objects.aggregate(
+            first=Min("created_at"), last=Max("created_at"))
+        start: date | None = options["start"] or bounds["first"]
+        end: date | None = options["end"] or bounds["last"]
+        if start is None or end is None:
+            self.stdout.write("No purchases to aggregate.")
+            return
+
+        chunk: timedelta = timedelta(days=max(options["chunk_days"], 1))
+        window_start: date = start
+        total_rows: int = 0
+
+        while window_start <= end:
+            window_end: date = min(window_start + chunk - timedelta(days=1), end)
+            total_rows += self.rebuild_window(window_start, window_end)
+            window_start = window_end + timedelta(days=1)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {total_rows} rollup rows from {start} to {end}."))
+
+    @staticmethod
+    def rebuild_window(start: date, end: date) -> int:
+        """
+        Replace the rollup rows for one date window with freshly aggregated ones.
+        """
+        paid = Q(is_paid=True)
+        grouped = (
+            Purchase.objects.filter(created_at__range=(start, end))
+            .values("created_at", "course_id")
+            .annotate(
+                total_orders=Count("id"),
+                total_paid_orders=Count("id", filter=paid),
+                total_revenue=Sum("amount", filter=paid),
+                total_coupon_orders=Count(
+                    "id", filter=paid & Q(coupon__isnull=False)),
+            )
+            .order_by()
+        )
+
+        rollups: list[SalesRollup] = [
+            SalesRollup(
+                date=row["created_at"],
+                course_id=row["course_id"],
+                orders=row["total_orders"],
+                paid_orders=row["total_paid_orders"],
+                revenue=row["total_revenue"] or 0,
+                coupon_orders=row["total_coupon_orders"],
+            )
+            for row in grouped
+        ]
+
+        with transaction.atomic():
+            SalesRollup.objects.filter(date__range=(start, end)).delete()
+            SalesRollup.objects.bulk_create(rollups)
+
+        return len(rollups)
@@ -0,0 +1,97 @@
+"""
+Management command to remove abandoned unpaid purchases.
+"""
+
+import time
+from datetime import date, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from transactions import rollups
+from transactions.models import AbandonedPurchase, Purchase
+
+
+class Command(BaseCommand):
+    """
+    Delete, or archive then delete, unpaid purchases older than a cutoff.
+    Rows are processed in small batches, each in its own short transaction,
+    and rows locked by an in-flight payment verification are skipped. The
+    removed checkouts are uncounted from the sales rollups.
+    """
+    help = "Remove unpaid purchases older than the configured age in bounded batches."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--older-than-days", type=int, default=settings.UNPAID_PURCHASE_MAX_AGE_DAYS,
+            help="Remove unpaid purchases created more than this many days ago.")
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Number of rows removed per transaction.")
+        parser.add_argument(
+            "--archive", action="store_true",
+            help="Copy rows into AbandonedPurchase before deleting them.")
+        parser.add_argument(
+            "--sleep", type=float, default=0.0,
+            help="Seconds to pause between batches.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the reaper until no stale rows are left.
+        """
+        cutoff: date = timezone.localdate() - timedelta(days=options["older_than_days"])
+        batch_size: int = max(options["batch_size"], 1)
+        removed: int = 0
+
+        while True:
+            batch_removed, batch_seen = self.reap_batch(
+                cutoff, batch_size, options["archive"])
+            removed += batch_removed
+            if batch_seen < batch_size:
+                break
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        action: str = "Archived and removed" if options["archive"] else "Removed"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {removed} unpaid purchases created before {cutoff}."))
+
+    @staticmethod
+    def reap_batch(cutoff: date, batch_size: int, archive: bool) -> tuple[int, int]:
+        """
+        Remove one batch of stale unpaid purchases.
+
+        Returns:
+            tuple[int, int]: Rows removed and rows selected for the batch.
+        """
+        with transaction.atomic():
+            # Served by the partial index on unpaid rows
+            ids: list[str] = list(
+                Purchase.objects.filter(is_paid=False, created_at__lt=cutoff)
+                .select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                return 0, 0
+
+            stale = Purchase.objects.filter(id__in=ids, is_paid=False)
+            if archive:
+                AbandonedPurchase.objects.bulk_create(
+                    [
+                        AbandonedPurchase(**row)
+                        for row in stale.values(
+                            "id", "course_id", "user_id", "amount",
+                            "razorpay_order_id", "created_at",
+                        )
+                    ],
+                    ignore_conflicts=True,
+                )
+
+            # Keep the rollup order counts in step with the remaining rows
+            rollups.forget_orders(stale.only("id", "course_id", "created_at"))
+            removed, _ = stale.delete()
+
+        return removed, len(ids)
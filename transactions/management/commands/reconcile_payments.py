@@ -0,0 +1,49 @@
+"""
+Management command to settle purchases whose payment was never verified.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from transactions.gateway import get_gateway
+from transactions.reconciliation import ReconciliationResult, reconcile_unpaid_purchases
+
+
+class Command(BaseCommand):
+    """
+    Ask the payment gateway about every unpaid purchase with an order ID and
+    mark the captured ones as paid, granting the course to the buyer.
+    """
+    help = "Reconcile unpaid purchases against the payment gateway."
+
+    def add_arguments(self, parser) -> None:
+        """
+        Register command line options.
+        """
+        parser.add_argument(
+            "--batch-size", type=int, default=100,
+            help="Number of purchases checked and updated per transaction.")
+        parser.add_argument(
+            "--workers", type=int, default=8,
+            help="Maximum number of concurrent gateway requests.")
+        parser.add_argument(
+            "--gateway", default=settings.PAYMENT_GATEWAY,
+            help="Dotted path of the gateway class to use.")
+
+    def handle(self, *args, **options) -> None:
+        """
+        Run the reconciliation.
+        """
+        # call_command() may pass a ready gateway instance, e.g. a FakeGateway
+        gateway = options["gateway"]
+        if isinstance(gateway, str):
+            gateway = get_gateway(gateway)
+
+        result: ReconciliationResult = reconcile_unpaid_purchases(
+            gateway,
+            batch_size=max(options["batch_size"], 1),
+            workers=options["workers"],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Checked {result.checked} unpaid purchases: "
+            f"{result.paid} marked as paid, {result.failed} lookups failed."))
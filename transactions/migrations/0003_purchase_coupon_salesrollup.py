@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0001_initial'),
+        ('transactions', '0002_couponcode_delete_cuponecode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purchase',
+            name='coupon',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='purchases', to='transactions.couponcode'),
+        ),
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Day the purchases were created')),
+                ('orders', models.IntegerField(default=0, help_text='Number of checkouts initiated')),
+                ('paid_orders', models.IntegerField(default=0, help_text='Number of checkouts that were paid')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('coupon_orders', models.IntegerField(default=0, help_text='Number of paid checkouts that used a coupon')),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='course.course')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='sales_rollup_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('course', 'date'), name='unique_sales_rollup_per_day')],
+            },
+        ),
+    ]
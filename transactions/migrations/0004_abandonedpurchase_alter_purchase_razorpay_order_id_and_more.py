@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course', '0001_initial'),
+        ('transactions', '0003_purchase_coupon_salesrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AbandonedPurchase',
+            fields=[
+                ('id', models.CharField(editable=False, max_length=120, primary_key=True, serialize=False, unique=True)),
+                ('course_id', models.CharField(max_length=120)),
+                ('user_id', models.CharField(max_length=1000)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('razorpay_order_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateField(help_text='Day the checkout was initiated')),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='purchase',
+            name='razorpay_order_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='purchase',
+            index=models.Index(condition=models.Q(('is_paid', False)), fields=['created_at'], name='purchase_unpaid_created_idx'),
+        ),
+    ]
@@ -30,7 +30,8 @@ class Purchase(models.Model):
     razorpay_order_id: str | None = models.CharField(
         max_length=100,  # Maximum length of the field
         blank=True,  # Allows the field to be blank
-        null=True  # Allows the field to be null
+        null=True,  # Allows the field to be null
+        db_index=True  # Payment callbacks look purchases up by order ID
     )
     razorpay_payment_id: str | None = models.CharField(
         max_length=100,
@@ -45,10 +46,27 @@ class Purchase(models.Model):
     is_paid: bool = models.BooleanField(
         default=False  # Default value is False
     )
+    coupon: "CouponCode | None" = models.ForeignKey(
+        "CouponCode",  # Links to the coupon applied at checkout
+        on_delete=models.SET_NULL,  # Keeps the purchase if the coupon is deleted
+        related_name="purchases",
+        blank=True,
+        null=True
+    )
     created_at: str = models.DateField(
         auto_now_add=True  # Automatically sets the field to now when created
     )
 
+    class Meta:
+        indexes = [
+            # Covers only abandoned checkouts, so it stays small as paid rows grow
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_paid=False),
+                name="purchase_unpaid_created_idx",
+            ),
+        ]
+
     def save(self, *args, **kwargs):
         """
         Overrides the save method to generate a unique ID if not already set.
@@ -58,6 +76,40 @@ class Purchase(models.Model):
         super().save(*args, **kwargs)  # Call the parent class's save method
 
 
+class AbandonedPurchase(models.Model):
+    """
+    Archived copy of an unpaid purchase removed by the reaper.
+    Keeps abandoned checkouts available for analysis outside the hot table.
+    """
+    id: str = models.CharField(
+        primary_key=True,
+        unique=True,
+        max_length=120,
+        editable=False
+    )
+    course_id: str = models.CharField(
+        max_length=120  # Plain copy of the course ID, the course may be gone
+    )
+    user_id: str = models.CharField(
+        max_length=1000  # Plain copy of the username, the user may be gone
+    )
+    amount: float = models.DecimalField(
+        max_digits=10,
+        decimal_places=2
+    )
+    razorpay_order_id: str | None = models.CharField(
+        max_length=100,
+        blank=True,
+        null=True
+    )
+    created_at: str = models.DateField(
+        help_text="Day the checkout was initiated"  # Adds clarity
+    )
+    archived_at: str = models.DateTimeField(
+        auto_now_add=True  # Automatically sets the field to now when archived
+    )
+
+
 class CouponCode(models.Model):
     """
     Represents a coupon code for discounts on purchases.
@@ -113,3 +165,52 @@ class CouponCode(models.Model):
         if not self.id:  # Check if ID is not set
             self.id = str(uuid.uuid4())  # Generate a unique UUID
         super().save(*args, **kwargs)  # Call the parent class's save method
+
+
+class SalesRollup(models.Model):
+    """
+    Daily sales counters for a single course.
+    Maintained incrementally as purchases are created and paid, and rebuilt
+    from history by the `backfill_sales_rollups` management command.
+    """
+    date: str = models.DateField(
+        help_text="Day the purchases were created"  # Adds clarity
+    )
+    course: Course = models.ForeignKey(
+        Course,  # Links to the Course model
+        on_delete=models.CASCADE,  # Deletes the rollup if the course is deleted
+        related_name="sales_rollups"
+    )
+    orders: int = models.IntegerField(
+        default=0,
+        help_text="Number of checkouts initiated"  # Adds clarity
+    )
+    paid_orders: int = models.IntegerField(
+        default=0,
+        help_text="Number of checkouts that were paid"  # Adds clarity
+    )
+    revenue = models.DecimalField(
+        max_digits=14,  # Maximum number of digits
+        decimal_places=2,  # Number of decimal places
+        default=0
+    )
+    coupon_orders: int = models.IntegerField(
+        default=0,
+        help_text="Number of paid checkouts that used a coupon"  # Adds clarity
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "date"], name="unique_sales_rollup_per_day"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["date"], name="sales_rollup_date_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the rollup.
+        """
+        return f"{self.course_id} @ {self.date}"
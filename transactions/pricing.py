@@ -0,0 +1,144 @@
+"""
+Course pricing in Decimal arithmetic.
+
+Every amount is rounded to paisa with ROUND_HALF_UP at each step, so the
+checkout page, the Razorpay order and the stored Purchase.amount always agree.
+Breakdowns are cached per course and invalidated when the course changes.
+"""
+
+from dataclasses import dataclass, replace
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, Tuple
+from django.conf import settings
+from django.core.cache import cache
+from course.models import Course
+
+# 18% GST applied on the listed price
+TAX_RATE: Decimal = Decimal("0.18")
+
+# Smallest currency unit (one paisa)
+PAISA: Decimal = Decimal("0.01")
+
+# Prefix of the per-course cache keys
+CACHE_KEY_PREFIX: str = "pricing:course:"
+
+
+def to_paisa(value: Decimal) -> Decimal:
+    """
+    Round an amount to paisa.
+    """
+    return value.quantize(PAISA, rounding=ROUND_HALF_UP)
+
+
+@dataclass(frozen=True)
+class PriceBreakdown:
+    """
+    Itemised price of a course, optionally with a coupon applied.
+    """
+    price: Decimal
+    tax: Decimal
+    offer: Decimal
+    offer_discount: Decimal
+    coupon_discount: Decimal
+    total: Decimal
+
+    @property
+    def amount_in_paisa(self) -> int:
+        """
+        Total expressed in paisa, as expected by Razorpay.
+        """
+        return int(self.total * 100)
+
+    def with_coupon(self, discount: float | int | Decimal) -> "PriceBreakdown":
+        """
+        Return a copy with a flat coupon discount taken off the total.
+        The total never goes below zero.
+        """
+        before_coupon: Decimal = self.total + self.coupon_discount
+        coupon_discount: Decimal = min(
+            to_paisa(Decimal(str(discount))), before_coupon)
+        return replace(
+            self,
+            coupon_discount=coupon_discount,
+            total=before_coupon - coupon_discount,
+        )
+
+
+def calculate_breakdown(price: int, offer: float) -> PriceBreakdown:
+    """
+    Compute the tax and offer breakdown for a listed price and offer percentage.
+    """
+    listed: Decimal = to_paisa(Decimal(price))
+    offer_percent: Decimal = Decimal(str(offer))
+
+    tax: Decimal = to_paisa(listed * TAX_RATE)
+    subtotal: Decimal = listed + tax
+    offer_discount: Decimal = to_paisa(subtotal * offer_percent / 100)
+
+    return PriceBreakdown(
+        price=listed,
+        tax=tax,
+        offer=offer_percent,
+        offer_discount=offer_discount,
+        coupon_discount=Decimal("0.00"),
+        total=subtotal - offer_discount,
+    )
+
+
+def cache_key(course_id: str) -> str:
+    """
+    Build the cache key holding a course's breakdown.
+    """
+    return f"{CACHE_KEY_PREFIX}{course_id}"
+
+
+def _fingerprint(course: Course) -> Tuple[int, str]:
+    """
+    Values the cached breakdown was computed from.
+    """
+    return course.price, str(course.offer)
+
+
+def price_courses(courses: Iterable[Course]) -> Dict[str, PriceBreakdown]:
+    """
+    Price a batch of courses with one cache round trip.
+
+    Cached entries are reused only if the course's price and offer still
+    match; everything else is recomputed and written back in one call.
+
+    Returns:
+        Dict[str, PriceBreakdown]: Breakdown keyed by course ID.
+    """
+    courses = list(courses)
+    cached: dict = cache.get_many([cache_key(course.id) for course in courses])
+
+    prices: Dict[str, PriceBreakdown] = {}
+    missing: dict = {}
+    for course in courses:
+        entry = cached.get(cache_key(course.id))
+        if entry is not None and entry[0] == _fingerprint(course):
+            prices[course.id] = entry[1]
+            continue
+
+        breakdown: PriceBreakdown = calculate_breakdown(course.price, course.offer)
+        prices[course.id] = breakdown
+        missing[cache_key(course.id)] = (_fingerprint(course), breakdown)
+
+    if missing:
+        cache.set_many(missing, timeout=settings.PRICING_CACHE_TIMEOUT)
+
+    return prices
+
+
+def price_course(course: Course) -> PriceBreakdown:
+    """
+    Price a single course, using the cache when possible.
+    """
+    return price_courses([course])[course.id]
+
+
+def invalidate_course_price(course_id: str) -> None:
+    """
+    Drop the cached breakdown of a course.
+    """
+    cache.delete(cache_key(course_id))
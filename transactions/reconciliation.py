@@ -0,0 +1,136 @@
+"""
+Reconciliation of unpaid purchases against the payment gateway.
+
+Recovers purchases whose payment was captured but never verified, for
+example because the client died before calling VerifyPaymentView.
+"""
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from logging import getLogger
+from django.db import transaction
+from django.db.models import F
+from authentication.models import Profile
+from .gateway import PaymentStatus
+from .models import CouponCode, Purchase
+from . import rollups
+
+# Initialize logger for reconciliation runs
+logger = getLogger(__name__)
+
+
+@dataclass
+class ReconciliationResult:
+    """
+    Counters reported at the end of a run.
+    """
+    checked: int = 0
+    paid: int = 0
+    failed: int = 0
+
+
+def _fetch(gateway, order_id: str) -> Optional[PaymentStatus]:
+    """
+    Query the gateway for one order, logging instead of raising on failure.
+    """
+    try:
+        return gateway.fetch_payment(order_id)
+    except Exception as e:
+        logger.error(f"Failed to fetch payment for order {order_id}: {str(e)}")
+        return None
+
+
+def apply_payments(statuses: Dict[str, PaymentStatus]) -> int:
+    """
+    Mark the purchases of captured orders as paid and grant their courses.
+
+    Runs in one transaction. Rows already paid, or locked by a concurrent
+    VerifyPaymentView, are skipped so nothing is counted twice.
+
+    Returns:
+        int: Number of purchases marked as paid.
+    """
+    with transaction.atomic():
+        purchases: List[Purchase] = list(
+            Purchase.objects.select_for_update(skip_locked=True)
+            .filter(is_paid=False, razorpay_order_id__in=statuses)
+        )
+        if not purchases:
+            return 0
+
+        for purchase in purchases:
+            purchase.is_paid = True
+            purchase.razorpay_payment_id = statuses[purchase.razorpay_order_id].payment_id
+        Purchase.objects.bulk_update(purchases, ["is_paid", "razorpay_payment_id"])
+
+        # Grant the courses through the many-to-many table in one insert
+        profile_ids: Dict[str, int] = dict(
+            Profile.objects.filter(
+                user_id__in={purchase.user_id for purchase in purchases}
+            ).values_list("user_id", "id")
+        )
+        Grant = Profile.purchased_courses.through
+        Grant.objects.bulk_create(
+            [
+                Grant(profile_id=profile_ids[purchase.user_id], course_id=purchase.course_id)
+                for purchase in purchases
+                if purchase.user_id in profile_ids
+            ],
+            ignore_conflicts=True,
+        )
+
+        # Count coupon usage
+        coupon_uses: Counter = Counter(
+            purchase.coupon_id for purchase in purchases if purchase.coupon_id)
+        for coupon_id, uses in coupon_uses.items():
+            CouponCode.objects.filter(id=coupon_id).update(used=F("used") + uses)
+
+        rollups.record_payments(purchases)
+
+    return len(purchases)
+
+
+def reconcile_unpaid_purchases(gateway, batch_size: int = 100, workers: int = 8) -> ReconciliationResult:
+    """
+    Walk unpaid purchases with an order ID and settle those the gateway reports as paid.
+
+    Purchases are read in primary key order with keyset pagination, and each
+    batch is looked up concurrently on a bounded thread pool.
+
+    Args:
+        gateway: Object exposing fetch_payment(order_id) -> PaymentStatus.
+        batch_size: Number of purchases checked per batch.
+        workers: Maximum number of concurrent gateway lookups.
+
+    Returns:
+        ReconciliationResult: Counters for the run.
+    """
+    result = ReconciliationResult()
+    last_id: str = ""
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        while True:
+            batch: List[Tuple[str, str]] = list(
+                Purchase.objects.filter(
+                    is_paid=False, razorpay_order_id__isnull=False, id__gt=last_id
+                )
+                .order_by("id")
+                .values_list("id", "razorpay_order_id")[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            order_ids: List[str] = [order_id for _, order_id in batch]
+            statuses: List[Optional[PaymentStatus]] = list(
+                pool.map(lambda order_id: _fetch(gateway, order_id), order_ids))
+
+            result.checked += len(batch)
+            result.failed += sum(1 for status in statuses if status is None)
+            result.paid += apply_payments({
+                status.order_id: status for status in statuses if status and status.paid
+            })
+
+    return result
@@ -0,0 +1,17 @@
+"""
+Signal handlers for the transactions app.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from course.models import Course
+from .pricing import invalidate_course_price
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+def invalidate_course_pricing(sender, instance: Course, **kwargs) -> None:
+    """
+    Drop the cached price breakdown whenever a course is edited or deleted.
+    """
+    invalidate_course_price(instance.id)
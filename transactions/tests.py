@@ -1,3 +1,114 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from authentication.models import Profile, User
+from course.models import Course
+from .gateway import FakeGateway
+from .models import CouponCode, Purchase, SalesRollup
+from .reconciliation import reconcile_unpaid_purchases
+from . import rollups, views
 
-# Create your tests here.
+
+class PaymentFlowTests(TestCase):
+    """Reconciliation and client verification settle each purchase once."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="jane", email="jane@example.com")
+        self.course = Course.objects.create(name="Django", price=100, created_by=self.user)
+        self.coupon = CouponCode.objects.create(
+            code="SAVE10", discount=10, expiry=date.today() + timedelta(days=1))
+        self.purchase = Purchase.objects.create(
+            course=self.course, user=self.user, amount=90,
+            razorpay_order_id="order_1", coupon=self.coupon)
+
+    def verify(self):
+        """Report the order as paid from the client, as after checkout."""
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with mock.patch.object(views.razorpay_client.utility, "verify_payment_signature"):
+            return client.post(
+                reverse("verify-payment"),
+                {
+                    "razorpay_order_id": "order_1",
+                    "razorpay_payment_id": "pay_1",
+                    "razorpay_signature": "sig",
+                    "course_id": self.course.id,
+                    "is_discount": True,
+                    "coupon_code": self.coupon.id,
+                },
+                format="json",
+            )
+
+    def test_reconcile_marks_paid_and_grants_course(self) -> None:
+        """Captured orders are paid, granted and counted against the coupon."""
+        Purchase.objects.create(
+            course=self.course, user=self.user, amount=100, razorpay_order_id="order_2")
+
+        result = reconcile_unpaid_purchases(FakeGateway({"order_1": "pay_1"}), batch_size=1)
+
+        self.assertEqual((result.checked, result.paid, result.failed), (2, 1, 0))
+        self.purchase.refresh_from_db()
+        self.assertTrue(self.purchase.is_paid)
+        self.assertEqual(self.purchase.razorpay_payment_id, "pay_1")
+        self.assertFalse(Purchase.objects.get(razorpay_order_id="order_2").is_paid)
+        self.assertTrue(
+            Profile.objects.get(user=self.user).purchased_courses.filter(id=self.course.id).exists())
+        self.coupon.refresh_from_db()
+        self.assertEqual(self.coupon.used, 1)
+
+    def test_verify_after_reconcile_counts_coupon_once(self) -> None:
+        """A late client verification does not count the coupon again."""
+        reconcile_unpaid_purchases(FakeGateway({"order_1": "pay_1"}))
+
+        resp = self.verify()
+
+        self.assertEqual(resp.status_code, 200)
+        self.coupon.refresh_from_db()
+        self.assertEqual(self.coupon.used, 1)
+
+    def test_verify_counts_coupon_once(self) -> None:
+        """Repeated verifications count the purchase's coupon once."""
+        self.verify()
+        self.verify()
+
+        self.coupon.refresh_from_db()
+        self.assertEqual(self.coupon.used, 1)
+        self.assertEqual(reconcile_unpaid_purchases(FakeGateway({"order_1": "pay_1"})).paid, 0)
+
+
+class SalesRollupTests(TestCase):
+    """The incremental counters agree with a backfill from purchase history."""
+
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(username="jane", email="jane@example.com")
+        self.course = Course.objects.create(name="Django", price=100, created_by=self.user)
+
+    def counters(self) -> list:
+        """Rollup counters for every day and course, oldest first."""
+        return list(SalesRollup.objects.order_by("date", "course_id").values_list(
+            "date", "course_id", "orders", "paid_orders", "revenue", "coupon_orders"))
+
+    def test_reaper_uncounts_removed_orders(self) -> None:
+        """Reaping abandoned checkouts leaves the counters a backfill would build."""
+        old = date.today() - timedelta(days=10)
+        purchases = [
+            Purchase.objects.create(
+                course=self.course, user=self.user, amount=100, razorpay_order_id=f"order_{n}")
+            for n in range(3)
+        ]
+        Purchase.objects.filter(id__in=[p.id for p in purchases]).update(created_at=old)
+        purchases = list(Purchase.objects.filter(id__in=[p.id for p in purchases]))
+        rollups.record_orders(purchases)
+        Purchase.objects.filter(id=purchases[0].id).update(is_paid=True)
+        rollups.record_payments(purchases[:1])
+
+        call_command("reap_unpaid_purchases", "--archive", stdout=StringIO())
+        incremental = self.counters()
+        call_command("backfill_sales_rollups", stdout=StringIO())
+
+        self.assertEqual(incremental[0][2:4], (1, 1))
+        self.assertEqual(incremental, self.counters())
@@ -64,6 +64,12 @@ urlpatterns: list[path] = [
         views.ListTransactionsView.as_view(),  # View to handle listing of transactions
         name="list-transactions",  # Name of the URL pattern
     ),
+    # URL for exporting transactions
+    path(
+        "export-transactions/",  # URL pattern for exporting transactions
+        views.ExportTransactionsView.as_view(),  # View to stream the export
+        name="export-transactions",  # Name of the URL pattern
+    ),
     # URL for listing self transactions
     path(
         "list-self-transactions/",  # URL pattern for listing self transactions
@@ -71,4 +77,10 @@ urlpatterns: list[path] = [
         views.ListSelfTransactionsView.as_view(),
         name="list-self-transactions",  # Name of the URL pattern
     ),
+    # URL for sales analytics
+    path(
+        "analytics/sales/",  # URL pattern for the sales dashboard
+        views.SalesAnalyticsView.as_view(),  # View to report sales rollups
+        name="sales-analytics",  # Name of the URL pattern
+    ),
 ]
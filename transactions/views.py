@@ -7,13 +7,17 @@ payment initiation, payment verification, coupon management, and transaction lis
 from rest_framework import views, response, status, permissions
 from django.core.paginator import Paginator
 from django.conf import settings
+from django.db.models import F, QuerySet, Sum
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from authentication.models import Profile
 from server.message import Message
 from server.decorators import catch_exception
-from server.utils import pagination_next_url_builder
-from . import serializers, models
+from server.permissions import IsSuperUser
+from server.utils import pagination_next_url_builder, stream_csv, stream_jsonl
+from . import serializers, models, pricing, rollups
+from datetime import date, timedelta
 import razorpay
 
 # Initialize Razorpay client with API keys
@@ -21,14 +25,42 @@ razorpay_client = razorpay.Client(
     auth=(settings.RAZORPAY_API_KEY, settings.RAZORPAY_SECRET_KEY))
 
 
-def calculate_course_price(price: int, offer: float) -> float:
+# Columns rendered by ListTransactionSerializer, fetched with a single join
+TRANSACTION_LIST_FIELDS: tuple[str, ...] = (
+    "id",
+    "course__name",
+    "user",
+    "amount",
+    "razorpay_order_id",
+    "is_paid",
+    "created_at",
+)
+
+# Columns written by the transaction export, in output order
+TRANSACTION_EXPORT_FIELDS: dict[str, str] = {
+    "id": "id",
+    "created_at": "created_at",
+    "course_id": "course_id",
+    "course_name": "course__name",
+    "user": "user_id",
+    "email": "user__email",
+    "amount": "amount",
+    "coupon_code": "coupon__code",
+    "razorpay_order_id": "razorpay_order_id",
+    "razorpay_payment_id": "razorpay_payment_id",
+    "is_paid": "is_paid",
+}
+
+# Number of rows fetched per round trip by the export's server-side cursor
+EXPORT_CHUNK_SIZE: int = 2000
+
+
+def list_transactions(purchases: QuerySet) -> QuerySet:
     """
-    Calculate the total course price after applying tax and offer.
+    Restrict a purchase queryset to the columns shown in transaction listings,
+    joining the course so serializing a page does not query once per row.
     """
-    tax: float = 0.18 * price  # 18% tax
-    total: float = price + tax
-    total -= (offer / 100 * total)  # Apply offer discount
-    return total
+    return purchases.select_related("course").only(*TRANSACTION_LIST_FIELDS)
 
 
 class CourseCheckoutView(views.APIView):
@@ -54,16 +86,15 @@ class CourseCheckoutView(views.APIView):
         profile: Profile = user.profile
 
         # Calculate pricing details
-        price: int = course.price
-        total: float = calculate_course_price(price, course.offer)
-        tax: float = 0.18 * price
+        breakdown: pricing.PriceBreakdown = pricing.price_course(course)
 
         # Prepare response data
         response_data: dict = {
-            "price": price,
-            "tax": tax,
+            "price": breakdown.price,
+            "tax": breakdown.tax,
             "offer": course.offer,
-            "total": total,
+            "offer_discount": breakdown.offer_discount,
+            "total": breakdown.total,
             "name": f"{user.first_name} {user.last_name}",
             "email": user.email,
             "country": profile.country,
@@ -102,25 +133,22 @@ class InitiatePaymentView(views.APIView):
             return Message.error("You have already purchased this course")
 
         # Calculate total price
-        total: float = calculate_course_price(course.price, course.offer)
+        breakdown: pricing.PriceBreakdown = pricing.price_course(course)
 
         # Handle discount if applicable
         is_discount: bool = request.data.get("is_discount", False)
-        discount: float = 0.0
+        coupon: models.CouponCode | None = None
         if is_discount:
             coupon_code_id: int = request.data.get("coupon_code")
             coupon_exists: bool = models.CouponCode.objects.filter(
                 id=coupon_code_id).exists()
             if coupon_exists:
-                coupon: models.CouponCode = models.CouponCode.objects.get(
-                    id=coupon_code_id)
-                discount = coupon.discount
-
-        # Adjust total price after discount
-        total = max(total - discount, 0)
+                coupon = models.CouponCode.objects.get(id=coupon_code_id)
+                # Adjust total price after discount
+                breakdown = breakdown.with_coupon(coupon.discount)
 
         # Convert total to paisa for Razorpay
-        amount: int = int(total * 100)
+        amount: int = breakdown.amount_in_paisa
 
         # Create a Razorpay order
         razorpay_order: dict = razorpay_client.order.create(
@@ -132,12 +160,14 @@ class InitiatePaymentView(views.APIView):
             razorpay_order_id=razorpay_order["id"], course=course, user=user
         ).exists()
         if not purchase_exists:
-            models.Purchase.objects.create(
+            purchase: models.Purchase = models.Purchase.objects.create(
                 course=course,
                 user=user,
-                amount=total,
+                amount=breakdown.total,
                 razorpay_order_id=razorpay_order["id"],
+                coupon=coupon,
             )
+            rollups.record_orders([purchase])
 
         # Prepare response data
         response_data: dict = {
@@ -176,23 +206,21 @@ class VerifyPaymentView(views.APIView):
             # Verify Razorpay payment signature
             razorpay_client.utility.verify_payment_signature(data)
 
-            # Update purchase details
-            purchase.is_paid = True
-            purchase.razorpay_payment_id = data["razorpay_payment_id"]
-            purchase.razorpay_signature = data["razorpay_signature"]
-            purchase.save()
-
-            # Handle coupon usage if applicable
-            is_discount: bool = request.data.get("is_discount", False)
-            if is_discount:
-                coupon_code_id: int = request.data.get("coupon_code")
-                coupon_exists: bool = models.CouponCode.objects.filter(
-                    id=coupon_code_id).exists()
-                if coupon_exists:
-                    coupon: models.CouponCode = models.CouponCode.objects.get(
-                        id=coupon_code_id)
-                    coupon.used += 1
-                    coupon.save()
+            # Update purchase details, counting it only on the unpaid -> paid transition
+            marked_paid: int = models.Purchase.objects.filter(
+                pk=purchase.pk, is_paid=False
+            ).update(
+                is_paid=True,
+                razorpay_payment_id=data["razorpay_payment_id"],
+                razorpay_signature=data["razorpay_signature"],
+            )
+            if marked_paid:
+                rollups.record_payments([purchase])
+
+                # Count the coupon applied at checkout, once per paid purchase
+                if purchase.coupon_id:
+                    models.CouponCode.objects.filter(id=purchase.coupon_id).update(
+                        used=F("used") + 1)
 
             # Add course to user's purchased courses
             course: models.Course = models.Course.objects.get(
@@ -349,6 +377,10 @@ class ApplyCouponView(views.APIView):
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    # Rate limit per user and per client IP to stop coupon guessing
+    throttle_scope: str = "coupon"
+    throttle_keys: tuple = ("user", "ip")
+
     @catch_exception
     def post(self, request, course_id: int):
         """
@@ -380,15 +412,13 @@ class ApplyCouponView(views.APIView):
             return Message.error("Coupon is out of stock")
 
         # Calculate the discounted price
-        discount: float = coupon.discount
-        price: int = course.price
-        total: float = calculate_course_price(price, course.offer)
-        total = max(total - discount, 0)
+        breakdown: pricing.PriceBreakdown = pricing.price_course(
+            course).with_coupon(coupon.discount)
 
         return response.Response(
             {
-                "discount": discount,
-                "total": total,
+                "discount": breakdown.coupon_discount,
+                "total": breakdown.total,
                 "coupon_code_id": coupon.id,
             },
             status=status.HTTP_200_OK,
@@ -411,7 +441,8 @@ class ListTransactionsView(views.APIView):
         page_size: int = int(request.GET.get("page_size", 2))
 
         # Fetch and paginate the transactions
-        purchases = models.Purchase.objects.all().order_by("-id")
+        purchases = list_transactions(
+            models.Purchase.objects.all()).order_by("-id")
         paginator = Paginator(purchases, page_size)
         page = paginator.page(page_no)
 
@@ -428,6 +459,73 @@ class ListTransactionsView(views.APIView):
         return response.Response(response_data, status=status.HTTP_200_OK)
 
 
+class ExportTransactionsView(views.APIView):
+    """
+    View to export transactions as CSV or JSON Lines. Only accessible by superusers.
+    Rows are read through a server-side cursor and streamed, so memory use
+    stays constant however many transactions match.
+    """
+    permission_classes = [IsSuperUser]
+
+    # Supported output formats and their content types
+    content_types: dict[str, str] = {
+        "csv": "text/csv",
+        "jsonl": "application/x-ndjson",
+    }
+
+    @staticmethod
+    def filter_purchases(request) -> QuerySet:
+        """
+        Apply the date range, payment status and course filters from the query string.
+        """
+        purchases = models.Purchase.objects.all()
+
+        start: str | None = request.GET.get("start")
+        end: str | None = request.GET.get("end")
+        is_paid: str | None = request.GET.get("is_paid")
+        course_id: str | None = request.GET.get("course")
+
+        if start:
+            purchases = purchases.filter(
+                created_at__gte=date.fromisoformat(start))
+        if end:
+            purchases = purchases.filter(created_at__lte=date.fromisoformat(end))
+        if is_paid is not None:
+            purchases = purchases.filter(
+                is_paid=is_paid.lower() in ("1", "true", "yes"))
+        if course_id:
+            purchases = purchases.filter(course_id=course_id)
+
+        return purchases
+
+    @catch_exception
+    def get(self, request):
+        """
+        Stream the filtered transactions in the requested format.
+        """
+        # "format" is reserved by DRF for renderer selection
+        export_format: str = request.GET.get("export_format", "csv")
+        if export_format not in self.content_types:
+            return Message.error("Unsupported export format")
+
+        # Project only the exported columns and iterate in chunks
+        rows = (
+            self.filter_purchases(request)
+            .order_by("created_at", "id")
+            .values_list(*TRANSACTION_EXPORT_FIELDS.values())
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        header: list[str] = list(TRANSACTION_EXPORT_FIELDS)
+        stream = stream_csv(header, rows) if export_format == "csv" else stream_jsonl(
+            header, rows)
+
+        export = StreamingHttpResponse(
+            stream, content_type=self.content_types[export_format])
+        export["Content-Disposition"] = (
+            f'attachment; filename="transactions.{export_format}"')
+        return export
+
+
 class ListSelfTransactionsView(views.APIView):
     """
     View to list a user's transactions with pagination. Only accessible by authenticated users.
@@ -444,8 +542,8 @@ class ListSelfTransactionsView(views.APIView):
         page_size: int = int(request.GET.get("page_size", 2))
 
         # Fetch and paginate the user's transactions
-        purchases = models.Purchase.objects.filter(
-            user=request.user).order_by("-id")
+        purchases = list_transactions(
+            models.Purchase.objects.filter(user=request.user)).order_by("-id")
         paginator = Paginator(purchases, page_size)
         page = paginator.get_page(page_no)
 
@@ -460,3 +558,82 @@ class ListSelfTransactionsView(views.APIView):
         }
 
         return response.Response(response_data, status=status.HTTP_200_OK)
+
+
+class SalesAnalyticsView(views.APIView):
+    """
+    View to report revenue, order counts, conversion and coupon usage.
+    Reads only the precomputed sales rollups. Only accessible by superusers.
+    """
+    permission_classes = [IsSuperUser]
+
+    # Aggregates over the rollup counters, aliased to avoid clashing with field names
+    aggregates: dict = {
+        "total_orders": Sum("orders"),
+        "total_paid_orders": Sum("paid_orders"),
+        "total_revenue": Sum("revenue"),
+        "total_coupon_orders": Sum("coupon_orders"),
+    }
+
+    @staticmethod
+    def summarise(row: dict) -> dict:
+        """
+        Convert an aggregated rollup row into the response shape.
+        """
+        orders: int = row.pop("total_orders") or 0
+        paid_orders: int = row.pop("total_paid_orders") or 0
+        revenue = row.pop("total_revenue") or 0
+        coupon_orders: int = row.pop("total_coupon_orders") or 0
+        return {
+            **row,
+            "orders": orders,
+            "paid_orders": paid_orders,
+            "unpaid_orders": orders - paid_orders,
+            "conversion_rate": round(paid_orders / orders, 4) if orders else 0.0,
+            "revenue": revenue,
+            "coupon_orders": coupon_orders,
+        }
+
+    @catch_exception
+    def get(self, request):
+        """
+        Retrieve daily and per-course sales figures for a date range.
+        """
+        # Extract the date range (defaults to the last 30 days) and course filter
+        end: date = date.fromisoformat(
+            request.GET.get("end", timezone.localdate().isoformat()))
+        start: date = date.fromisoformat(
+            request.GET.get("start", (end - timedelta(days=29)).isoformat()))
+        course_id: str | None = request.GET.get("course")
+
+        rollups_in_range = models.SalesRollup.objects.filter(
+            date__range=(start, end))
+        if course_id:
+            rollups_in_range = rollups_in_range.filter(course_id=course_id)
+
+        # Daily series across the selected courses
+        daily: list[dict] = [
+            self.summarise(row)
+            for row in rollups_in_range.values("date")
+            .annotate(**self.aggregates)
+            .order_by("date")
+        ]
+
+        # Per-course totals over the whole range
+        courses: list[dict] = [
+            self.summarise(row)
+            for row in rollups_in_range.values("course", course_name=F("course__name"))
+            .annotate(**self.aggregates)
+            .order_by("-total_revenue")
+        ]
+
+        # Prepare the response data
+        response_data: dict = {
+            "start": start,
+            "end": end,
+            "summary": self.summarise(rollups_in_range.aggregate(**self.aggregates)),
+            "daily": daily,
+            "courses": courses,
+        }
+
+        return response.Response(response_data, status=status.HTTP_200_OK)